@@ -1,9 +1,11 @@
-from flask import Flask, request, render_template, flash, redirect, url_for
+from flask import Flask, Response, request, render_template, flash, redirect, url_for, jsonify, stream_with_context
 import os
+import json
+import threading
 from werkzeug.utils import secure_filename
 from src.resume_parser import UltimateResumeParser
-from src.job_matcher import JobMatcher
-from src.career_advisor import CareerAdvisor
+from src.parse_cache import ParseCache, content_key
+from src.advice_jobs import AdviceJobs, AdviceQueueFull
 import logging
 from dotenv import load_dotenv
 
@@ -11,7 +13,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
-app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-123')
 
@@ -19,45 +20,140 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-123')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize AI components
+# Parsing is cheap to set up, so one parser and its result cache are shared by all requests.
+# PDF_WORKERS > 0 fans long PDFs out over a process pool; PARSE_CACHE_DIR adds a disk tier.
+# Cached parses hold resume PII: disk entries expire after PARSE_CACHE_DISK_TTL seconds
+# (default 7 days) and at most PARSE_CACHE_DISK_MAX entries are kept.
+resume_parser = UltimateResumeParser(pdf_workers=int(os.getenv('PDF_WORKERS', '0')))
+parse_cache = ParseCache(maxsize=int(os.getenv('PARSE_CACHE_SIZE', '512')),
+                         disk_path=os.getenv('PARSE_CACHE_DIR') or None,
+                         disk_max_entries=int(os.getenv('PARSE_CACHE_DISK_MAX', '10000')),
+                         disk_ttl=float(os.getenv('PARSE_CACHE_DISK_TTL', str(7 * 24 * 3600))))
+
+# AI components are created on first use (or by warm_up) so importing this
+# module stays cheap; the heavy imports (torch, openai) happen there too
 openai_key = os.getenv('OPENAI_API_KEY')
-career_advisor = CareerAdvisor(openai_key)
-job_matcher = JobMatcher()
+_components_lock = threading.Lock()
+_job_matcher = None
+_career_advisor = None
+_warmup_error = None
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+def get_job_matcher():
+    """Return the shared JobMatcher, loading the model and index on first call"""
+    global _job_matcher
+    if _job_matcher is None:
+        with _components_lock:
+            if _job_matcher is None:
+                from src.job_matcher import JobMatcher
+                # Workers attach to a published shared index when SHARED_INDEX_PATH is set
+                # JOBS_PATH may be a CSV, Parquet file/directory or Arrow file
+                _job_matcher = JobMatcher(os.getenv('JOBS_PATH', 'data/jobs_clean.csv'),
+                                          shared_index_path=os.getenv('SHARED_INDEX_PATH'))
+    return _job_matcher
+
+def get_career_advisor():
+    """Return the shared CareerAdvisor, creating it on first call"""
+    global _career_advisor
+    if _career_advisor is None:
+        with _components_lock:
+            if _career_advisor is None:
+                from src.career_advisor import CareerAdvisor
+                from src.advice_cache import AdviceCache
+                # Near-identical profiles reuse advice; similarity uses the matcher's sentence model
+                cache = AdviceCache(maxsize=int(os.getenv('ADVICE_CACHE_SIZE', '4096')),
+                                    ttl=float(os.getenv('ADVICE_CACHE_TTL', '86400')),
+                                    embed_fn=lambda texts: get_job_matcher().embed(texts),
+                                    threshold=float(os.getenv('ADVICE_SIMILARITY_THRESHOLD', '0.95')))
+                llm_options = {
+                    'max_connections': int(os.getenv('LLM_MAX_CONNECTIONS', '16')),
+                    'max_concurrency': int(os.getenv('LLM_MAX_CONCURRENCY', '8')),
+                    'rate_per_second': float(os.getenv('LLM_RATE_PER_SECOND', '5')),
+                    'read_timeout': float(os.getenv('LLM_TIMEOUT', '30')),
+                    'max_retries': int(os.getenv('LLM_MAX_RETRIES', '3')),
+                }
+                # OPENAI_BASE_URL points at any OpenAI-compatible server, e.g. a local stub
+                _career_advisor = CareerAdvisor(openai_key, base_url=os.getenv('OPENAI_BASE_URL'), cache=cache,
+                                                llm_options=llm_options)
+    return _career_advisor
+
+# Career advice is generated on a bounded pool and streamed to the results page.
+# With several worker processes ADVICE_STORE_PATH must be set (gunicorn.conf.py
+# does), so the worker serving the poll/stream requests can read the job.
+advice_jobs = AdviceJobs(get_career_advisor,
+                         max_workers=int(os.getenv('ADVICE_WORKERS', '4')),
+                         max_pending=int(os.getenv('ADVICE_MAX_PENDING', '32')),
+                         store_path=os.getenv('ADVICE_STORE_PATH') or None)
+
+def warm_up(background: bool = False):
+    """Load the heavy components now, optionally on a daemon thread (started once)"""
+    global _warmup_thread
+    def _load():
+        global _warmup_error
+        try:
+            get_career_advisor()
+            get_job_matcher()
+            _warmup_error = None
+            logger.info("Warm-up finished, matcher ready")
+        except Exception as e:
+            _warmup_error = str(e)
+            logger.error(f"Warm-up failed: {e}")
+    
+    if not background:
+        _load()
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_load, name='warm-up', daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+# MODEL_WARMUP=eager loads at import and background loads on a thread started at
+# import. post_fork leaves it to the server's worker hook (gunicorn.conf.py), so
+# torch is never imported in a master that forks. Anything else loads on first
+# use; /readyz stays 503 until the index is loaded either way.
+_warmup_mode = os.getenv('MODEL_WARMUP', 'lazy').lower()
+if _warmup_mode == 'eager':
+    warm_up()
+elif _warmup_mode == 'background':
+    warm_up(background=True)
 
 def allowed_file(filename: str) -> bool:
     """Check if the file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in {'pdf', 'docx', 'txt'}
 
+def parse_upload(file) -> dict:
+    """Parse an uploaded resume, reusing the cached result for bytes seen before"""
+    filename = secure_filename(file.filename)
+    # Werkzeug keeps small uploads in memory (larger ones spill to a temp
+    # file); the stream is hashed and parsed in place, never saved to uploads/
+    cache_key = content_key(file.stream, resume_parser.version)
+    resume_data = parse_cache.get(cache_key)
+
+    if resume_data is not None:
+        # Same bytes as an earlier upload: skip extraction entirely
+        resume_data['file'] = filename
+        logger.info(f"Parse cache hit for {filename}")
+    else:
+        # Parse resume with better error handling
+        resume_data = resume_parser.parse(file.stream, filename=filename)
+        parse_cache.set(cache_key, resume_data)
+    return resume_data
+
 @app.route('/', methods=['GET', 'POST'])
 def home():
     if request.method == 'POST':
         resume_data = {}
         file_uploaded = False
-        filepath = None
         
         # Handle file upload
         if 'resume' in request.files:
             file = request.files['resume']
             if file and file.filename != '' and allowed_file(file.filename):
                 try:
-                    filename = secure_filename(file.filename)
-                    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-                    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    
-                    # Save the file
-                    file.save(filepath)
-                    logger.info(f"Saved resume to: {filepath}")
-                    
-                    # Parse resume with better error handling
-                    parser = UltimateResumeParser()
-                    resume_data = parser.parse(filepath)
-                    
-                    # Clean up file
-                    try:
-                        os.remove(filepath)
-                    except Exception as e:
-                        logger.warning(f"Could not remove file {filepath}: {e}")
+                    resume_data = parse_upload(file)
                     
                     if 'error' in resume_data:
                         flash(f'Resume parsing error: {resume_data["error"]}', 'error')
@@ -68,13 +164,6 @@ def home():
                     
                 except Exception as e:
                     logger.error(f"Resume processing error: {str(e)}")
-                    # Clean up file if it exists
-                    try:
-                        if filepath and os.path.exists(filepath):
-                            os.remove(filepath)
-                    except Exception as cleanup_error:
-                        logger.warning(f"Could not clean up file: {cleanup_error}")
-                    
                     flash('Error processing resume file. Please try a different file or format.', 'error')
                     return redirect(url_for('home'))
         
@@ -98,40 +187,43 @@ def home():
             
             logger.info(f"Using manual input data: {resume_data}")
         
+        # Optional filters, applied before any job is scored
+        filters = {
+            'remote': True if request.form.get('remote_only') else None,
+            'location': request.form.get('location_filter', '').strip(),
+            'source': request.form.get('source', '').strip(),
+            'days': request.form.get('posted_within', '').strip(),
+        }
+        
         # Get job matches and AI advice
         try:
             # AI Job Matching
-            matches = job_matcher.match(resume_data)
+            matches = get_job_matcher().match(resume_data, filters=filters)
             logger.info(f"Found {len(matches)} job matches")
             
-            # AI Career Advice (only show for file uploads with sufficient data)
+            # AI Career Advice (only show for file uploads with sufficient data);
+            # queued in the background, the page fetches it from /advice/<id>
             ai_advice = None
+            advice_job_id = None
             if file_uploaded and resume_data.get('skills'):
                 try:
-                    ai_advice = career_advisor.get_career_suggestions(resume_data)
-                    logger.info("Successfully generated AI career advice")
-                except Exception as e:
-                    logger.error(f"AI advice generation failed: {str(e)}")
+                    advice_job_id = advice_jobs.submit(resume_data)
+                    logger.info(f"Queued AI career advice job {advice_job_id}")
+                except AdviceQueueFull as e:
+                    logger.warning(f"AI advice not queued: {str(e)}")
                     ai_advice = "Could not generate AI advice at this time."
             else:
                 logger.info("Skipping AI advice for manual input")
             
             # Convert matches to list of dicts for template
-            jobs_list = []
-            for _, row in matches.iterrows():
-                job = {
-                    'title': row.get('title', 'N/A'),
-                    'company': row.get('company', 'N/A'),
-                    'location': row.get('location', 'N/A'),
-                    'link': row.get('link', '#'),
-                    'match_score': float(row.get('match_score', 0))
-                }
-                jobs_list.append(job)
+            defaults = {'title': 'N/A', 'company': 'N/A', 'location': 'N/A', 'link': '#', 'match_score': 0.0}
+            jobs_list = matches.reindex(columns=list(defaults)).fillna(defaults).to_dict('records')
             
             return render_template('result.html',
                                resume=resume_data,
                                jobs=jobs_list,
-                               ai_advice=ai_advice)
+                               ai_advice=ai_advice,
+                               advice_job_id=advice_job_id)
                                
         except Exception as e:
             logger.error(f"Error in matching/advice generation: {str(e)}")
@@ -141,9 +233,211 @@ def home():
     # GET request - show the form
     return render_template('form.html')
 
+# JSON API for service-to-service callers
+API_MAX_TOP_N = int(os.getenv('API_MAX_TOP_N', '100'))
+API_MAX_BATCH = int(os.getenv('API_MAX_BATCH', '256'))
+# Deep pages cost a (batch, offset + top_n) top-k per request, so paging stops here
+API_MAX_OFFSET = int(os.getenv('API_MAX_OFFSET', '1000'))
+API_FILTER_FIELDS = ('remote', 'location', 'source', 'days', 'since')
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+@app.errorhandler(ApiError)
+def api_error(e):
+    return jsonify(error=e.message), e.status
+
+def _api_body() -> dict:
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            raise ApiError('Request body must be a JSON object')
+        return body
+    return {}
+
+def _api_param(body: dict, name: str, default=None):
+    """A parameter from the JSON body, form fields or query string, in that order"""
+    if name in body:
+        return body[name]
+    return request.form.get(name, request.args.get(name, default))
+
+def _api_int(body: dict, name: str, default: int, minimum: int, maximum: int = None) -> int:
+    value = _api_param(body, name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ApiError(f"'{name}' must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ApiError(f"'{name}' must be between {minimum} and {maximum if maximum is not None else 'any'}")
+    return value
+
+def _api_filters(body: dict) -> dict:
+    """Filters from a JSON object (``filters``) or from individual form/query fields"""
+    filters = _api_param(body, 'filters')
+    if isinstance(filters, str):
+        try:
+            filters = json.loads(filters)
+        except ValueError:
+            raise ApiError("'filters' must be a JSON object")
+    if filters is None:
+        filters = {name: _api_param(body, name) for name in API_FILTER_FIELDS}
+    if not isinstance(filters, dict):
+        raise ApiError("'filters' must be a JSON object")
+    from src.filters import FilterIndex
+    try:
+        return FilterIndex().normalize(filters)
+    except (ValueError, TypeError) as e:
+        raise ApiError(f"Invalid filters: {e}")
+
+def _api_resume(item) -> dict:
+    """A resume from JSON: profile fields, or raw resume text to parse"""
+    if isinstance(item, str):
+        item = {'text': item}
+    if not isinstance(item, dict):
+        raise ApiError('Each resume must be an object or a string of resume text')
+    if item.get('text'):
+        if not isinstance(item['text'], str):
+            raise ApiError("'text' must be a string")
+        data = item['text'].encode('utf-8')
+        cache_key = content_key(data, resume_parser.version)
+        resume_data = parse_cache.get(cache_key)
+        if resume_data is None:
+            resume_data = resume_parser.parse(data)
+            parse_cache.set(cache_key, resume_data)
+        if 'error' in resume_data:
+            raise ApiError(resume_data['error'], 422)
+        return resume_data
+    skills = item.get('skills') or []
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(',') if s.strip()]
+    if not isinstance(skills, list) or not all(isinstance(s, str) for s in skills):
+        raise ApiError("'skills' must be a list of strings or a comma-separated string")
+    if not skills and not item.get('experience') and not item.get('education'):
+        raise ApiError('A resume needs text, skills, experience or education')
+    return {'skills': skills, 'experience': item.get('experience') or '', 'education': item.get('education') or ''}
+
+def _api_upload(file) -> dict:
+    if not file or file.filename == '' or not allowed_file(file.filename):
+        raise ApiError('Upload a PDF, DOCX or TXT resume')
+    resume_data = parse_upload(file)
+    if 'error' in resume_data:
+        raise ApiError(resume_data['error'], 422)
+    return resume_data
+
+def _api_match(resumes: list, body: dict) -> dict:
+    """Match resumes and build the response straight from the top-k arrays"""
+    top_n = _api_int(body, 'top_n', 5, 1, API_MAX_TOP_N)
+    offset = _api_int(body, 'offset', 0, 0, API_MAX_OFFSET)
+    filters = _api_filters(body)
+    matcher = get_job_matcher()
+    records = matcher.match_many(resumes, top_n=top_n, filters=filters, offset=offset, as_records=True)
+    results = [{'matches': matches,
+                'next_offset': (offset + len(matches)
+                                if len(matches) == top_n and offset + len(matches) <= API_MAX_OFFSET else None)}
+               for matches in records]
+    return {'results': results, 'top_n': top_n, 'offset': offset, 'filters': filters,
+            'index_version': matcher.version}
+
+@app.route('/api/v1/match', methods=['POST'])
+def api_match():
+    """Match one resume: a JSON ``resume`` (profile fields or ``text``) or a multipart ``resume`` file"""
+    body = _api_body()
+    if 'resume' in request.files:
+        resume_data = _api_upload(request.files['resume'])
+    else:
+        resume_data = _api_resume(body.get('resume', body))
+    response = _api_match([resume_data], body)
+    result = response.pop('results')[0]
+    response.update(result, skills=resume_data.get('skills', []))
+    return jsonify(response)
+
+@app.route('/api/v1/match/batch', methods=['POST'])
+def api_match_batch():
+    """Match many resumes in one call: a JSON ``resumes`` list or multipart ``resumes`` files"""
+    body = _api_body()
+    if request.files:
+        resumes = [_api_upload(file) for file in request.files.getlist('resumes')]
+    else:
+        items = body.get('resumes')
+        if not isinstance(items, list):
+            raise ApiError("'resumes' must be a list")
+        resumes = [_api_resume(item) for item in items]
+    if not resumes:
+        raise ApiError('No resumes given')
+    if len(resumes) > API_MAX_BATCH:
+        raise ApiError(f"At most {API_MAX_BATCH} resumes per batch", 413)
+    return jsonify(_api_match(resumes, body))
+
+@app.route('/advice/<job_id>')
+def advice_status(job_id):
+    """Poll a career advice job: status plus the advice generated so far"""
+    job = advice_jobs.get(job_id)
+    if job is None:
+        return jsonify(error='Unknown or expired advice job'), 404
+    return jsonify(job.to_dict())
+
+@app.route('/advice/<job_id>/stream')
+def advice_stream(job_id):
+    """Server-sent events: one ``data`` event per advice chunk, then a ``done`` event"""
+    job = advice_jobs.get(job_id)
+    if job is None:
+        return jsonify(error='Unknown or expired advice job'), 404
+
+    def events():
+        sent = 0
+        while True:
+            chunks, done = job.wait_for_chunks(sent, timeout=15)
+            for chunk in chunks:
+                yield f"data: {json.dumps({'text': chunk})}\n\n"
+            sent += len(chunks)
+            if done:
+                yield f"event: done\ndata: {json.dumps({'status': job.status, 'error': job.error})}\n\n"
+                return
+            if not chunks:
+                yield ": keep-alive\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify(status='ok')
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: the job index is loaded and matches can be served.
+
+    Until then (or after a failed warm-up) this is 503. Without a warm-up
+    mode the first probe starts loading in the background, so lazy
+    processes become ready without waiting for a user request.
+    """
+    if _warmup_error:
+        return jsonify(status='error', error=_warmup_error), 503
+    matcher = _job_matcher
+    if matcher is None:
+        warm_up(background=True)
+        return jsonify(status='loading'), 503
+    return jsonify(status='ready', jobs=len(matcher.jobs_df), index_version=matcher.version)
+
+@app.route('/metrics')
+def metrics():
+    """Cache hit rates for monitoring"""
+    stats = {'parse_cache': parse_cache.stats(), 'advice_jobs': advice_jobs.stats()}
+    if _job_matcher is not None:
+        stats['matcher'] = _job_matcher.cache_stats()
+    if _career_advisor is not None:
+        stats['advice_cache'] = _career_advisor.cache_stats()
+    return jsonify(stats)
+
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error"""
+    if request.path.startswith('/api/'):
+        return jsonify(error='Request too large. Uploads must be smaller than 16MB.'), 413
     flash('File too large. Please upload a file smaller than 16MB.', 'error')
     return redirect(url_for('home'))
 
@@ -159,9 +453,6 @@ def internal_error(e):
     return render_template('error.html', error='Internal server error'), 500
 
 if __name__ == '__main__':
-    # Create upload directory if it doesn't exist
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    
     # Create data directory for jobs if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
@@ -178,5 +469,8 @@ if __name__ == '__main__':
         default_jobs.to_csv(default_jobs_path, index=False)
         logger.info(f"Created default jobs file at {default_jobs_path}")
     
+    if _warmup_mode != 'eager':
+        warm_up(background=True)
+    
     logger.info("Starting Flask application...")
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,29 @@
+# Gunicorn settings: gunicorn -c gunicorn.conf.py wsgi:app
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+# Import the app in the master so workers fork with the plain-Python state
+# (resume parser, skill taxonomy) already in copy-on-write memory. The
+# sentence model and job index are not loaded there: torch's OpenMP pool and
+# the tokenizers' threads do not survive fork(), so each worker warms up in
+# post_fork instead. Job vectors are memory-mapped (and SHARED_INDEX_PATH
+# attaches a published index), so the workers still share those pages.
+# Set PRELOAD_MODELS=0 to import the app per worker as well.
+preload_app = os.getenv('PRELOAD_MODELS', '1') == '1'
+os.environ.setdefault('MODEL_WARMUP', 'post_fork')
+
+
+def post_fork(server, worker):
+    """Load the model and job index in the new worker, off its request threads"""
+    if os.environ['MODEL_WARMUP'] == 'post_fork':
+        from app import warm_up
+        warm_up(background=True)
+
+# Advice jobs run in the worker that rendered the results page, but its
+# poll/stream requests can reach any worker: share job state through SQLite
+if workers > 1:
+    os.environ.setdefault('ADVICE_STORE_PATH', 'data/advice_jobs.db')
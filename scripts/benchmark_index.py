@@ -0,0 +1,75 @@
+"""Recall@k, latency and memory of index backends against exact float32 search.
+
+Usage:
+    python scripts/benchmark_index.py --embeddings data/job_embeddings --n-lists 1024 --n-probe 8 16 32
+    python scripts/benchmark_index.py --precisions float32 float16 int8 --k 5 50
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.vector_index import PRECISIONS, BruteForceIndex, IVFIndex, recall_report
+
+
+def load_vectors(args) -> np.ndarray:
+    """Job vectors from the embedding store, or a synthetic clustered catalog"""
+    if args.embeddings:
+        return np.load(f"{args.embeddings}.npy", mmap_mode='r')
+
+    rng = np.random.default_rng(args.seed)
+    centers = rng.normal(size=(max(args.size // 200, 1), args.dim))
+    labels = rng.integers(0, len(centers), args.size)
+    return (centers[labels] + 0.5 * rng.normal(size=(args.size, args.dim))).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--embeddings', help="embedding store prefix (defaults to a synthetic catalog)")
+    parser.add_argument('--size', type=int, default=200000, help="synthetic catalog size")
+    parser.add_argument('--dim', type=int, default=384, help="synthetic vector dimension")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--n-lists', type=int, default=None)
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[4, 8, 16, 32])
+    parser.add_argument('--k', type=int, nargs='+', default=[1, 5, 10, 50])
+    parser.add_argument('--precisions', nargs='+', choices=PRECISIONS, default=list(PRECISIONS),
+                        help="storage precisions for the exact backend")
+    parser.add_argument('--ivf-precision', choices=PRECISIONS, default='float32')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    vectors = load_vectors(args)
+    rng = np.random.default_rng(args.seed + 1)
+    # Perturbed catalog rows stand in for resume queries
+    queries = vectors[rng.integers(0, len(vectors), args.queries)]
+    queries = queries + 0.3 * rng.normal(size=queries.shape).astype(np.float32)
+
+    print(f"Catalog: {len(vectors)} x {vectors.shape[1]}, {args.queries} queries")
+
+    for precision in args.precisions:
+        exact = BruteForceIndex(precision=precision).build(vectors)
+        report = recall_report(exact, vectors, queries, args.k)
+        print(f"exact {precision:<7} memory {exact.nbytes / 2 ** 20:8.1f} MiB  "
+              f"latency {report['latency_ms']:8.3f} ms  {format_recalls(report)}")
+
+    start = time.perf_counter()
+    ivf = IVFIndex(n_lists=args.n_lists, seed=args.seed, precision=args.ivf_precision).build(vectors)
+    print(f"ivf build    {time.perf_counter() - start:.1f} s, {len(ivf.centroids)} lists")
+
+    for n_probe in args.n_probe:
+        ivf.n_probe = n_probe
+        report = recall_report(ivf, vectors, queries, args.k)
+        print(f"ivf probe={n_probe:<3} memory {ivf.nbytes / 2 ** 20:8.1f} MiB  "
+              f"latency {report['latency_ms']:8.3f} ms  {format_recalls(report)}")
+
+
+def format_recalls(report) -> str:
+    return "  ".join(f"{name} {value:.3f}" for name, value in report.items() if name.startswith('recall'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Local stand-in for the OpenAI chat completions API, for development and load tests.
+
+Usage:
+    python scripts/llm_stub_server.py --port 8001 --delay 0.05
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8001/v1 python app.py
+
+Answers POST /v1/chat/completions with canned advice built from the prompt's
+"Skills:" line, streamed word by word when the request sets ``stream``.
+"""
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def build_advice(prompt: str) -> str:
+    skills = next((line.split(':', 1)[1].strip() for line in prompt.splitlines()
+                   if line.strip().startswith('Skills:')), '') or 'your current skills'
+    return (f"🎯 **Career Path**: Roles that build on {skills}\n\n"
+            "📚 **Skills to Learn**: Cloud platforms, system design\n\n"
+            "💡 **Certifications**: One vendor certification in your main stack\n\n"
+            "🚀 **Next Steps**: Ship a portfolio project and write it up")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = 0.0          # seconds per streamed word (or for the whole reply when not streaming)
+    fail_every = 0       # answer every n-th request with a 429, to exercise retries
+    _count = 0
+    _count_lock = threading.Lock()
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self._json(404, {'error': {'message': 'not found'}})
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+        with StubHandler._count_lock:
+            StubHandler._count += 1
+            count = StubHandler._count
+        if self.fail_every and count % self.fail_every == 0:
+            return self._json(429, {'error': {'message': 'rate limited', 'type': 'rate_limit'}})
+
+        prompt = ''.join(m.get('content', '') for m in body.get('messages', []))
+        advice = build_advice(prompt)
+        model = body.get('model', 'stub')
+        if not body.get('stream'):
+            time.sleep(self.delay)
+            return self._json(200, {
+                'id': f'chatcmpl-stub-{count}', 'object': 'chat.completion', 'created': int(time.time()),
+                'model': model, 'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': advice}}],
+            })
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        words = advice.split(' ')
+        for i, word in enumerate(words):
+            time.sleep(self.delay)
+            delta = {'content': word + (' ' if i < len(words) - 1 else '')}
+            self._event({'id': f'chatcmpl-stub-{count}', 'object': 'chat.completion.chunk',
+                         'created': int(time.time()), 'model': model,
+                         'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]})
+        self._event({'id': f'chatcmpl-stub-{count}', 'object': 'chat.completion.chunk',
+                     'created': int(time.time()), 'model': model,
+                     'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _event(self, payload):
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def _json(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = 8001, delay: float = 0.0, fail_every: int = 0) -> ThreadingHTTPServer:
+    """Start the stub on a daemon thread and return the server (``server.shutdown()`` stops it)"""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {'delay': delay, 'fail_every': fail_every})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--delay', type=float, default=0.05, help="seconds per streamed word")
+    parser.add_argument('--fail-every', type=int, default=0, help="return 429 on every n-th request")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.delay, args.fail_every)
+    print(f"LLM stub listening on http://127.0.0.1:{server.server_port}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Local job board stub for end-to-end scraper runs.
+
+Usage:
+    python -m src.scraper --record-dir recordings/ ...             # record real responses once
+    python scripts/scraper_stub_server.py --pages-dir recordings/ --port 8002
+    python scripts/scraper_stub_server.py --synthetic 120 --port 8002
+    python -m src.scraper --linkedin-url http://127.0.0.1:8002 --remoteok-url http://127.0.0.1:8002
+
+With --pages-dir, each request is answered with the recorded body for its
+path and query string (404 if none). With --synthetic N, LinkedIn search
+pages hold N cards per query/location (paged 25 at a time) and RemoteOK
+returns N jobs per tag. --throttle-every N answers every N-th request with
+a 429 carrying Retry-After, to exercise the crawler's retries.
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scraper.http import recorded_name
+
+LINKEDIN_CARD = """<li><div class="base-card">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{slug}-{n}?trk=stub"></a>
+  <h3 class="base-search-card__title">{title}</h3>
+  <h4 class="base-search-card__subtitle">Company {company}</h4>
+  <span class="job-search-card__location">{location}</span>
+</div></li>"""
+
+
+def synthetic_name(*parts) -> str:
+    """Stable pseudo-word, so synthetic jobs differ by more than a number and survive de-duplication"""
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def synthetic_linkedin(query: str, location: str, start: int, total: int) -> bytes:
+    cards = [LINKEDIN_CARD.format(slug=query.replace(' ', '-'), n=n,
+                                  title=f"{query.title()} Engineer {synthetic_name(query, n)}",
+                                  company=synthetic_name(n % 17), location=location or 'Remote')
+             for n in range(start, min(start + 25, total))]
+    return "\n".join(cards).encode('utf-8')
+
+
+def synthetic_remoteok(tag: str, total: int) -> bytes:
+    jobs = [{'legal': 'stub'}] + [{'position': f"{tag.title()} Developer {synthetic_name(tag, n)}",
+                                   'company': f"Remote Co {synthetic_name(n % 9)}",
+                                   'location': 'Worldwide', 'url': f"https://remoteok.com/remote-jobs/{tag}-{n}"}
+                                  for n in range(total)]
+    return json.dumps(jobs).encode('utf-8')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    pages_dir = None
+    synthetic = 0
+    throttle_every = 0   # answer every n-th request with a 429
+    retry_after = 1      # seconds sent in the 429's Retry-After header
+    _count = 0
+    _count_lock = threading.Lock()
+
+    def do_GET(self):
+        with self._count_lock:
+            type(self)._count += 1
+            count = self._count
+        if self.throttle_every and count % self.throttle_every == 0:
+            return self._send(429, b'slow down', 'text/plain', {'Retry-After': str(self.retry_after)})
+
+        if self.pages_dir:
+            path = os.path.join(self.pages_dir, recorded_name(self.path))
+            if not os.path.exists(path):
+                return self._send(404, b'not recorded', 'text/plain')
+            with open(path, 'rb') as f:
+                body = f.read()
+            return self._send(200, body, 'application/json' if body[:1] in (b'[', b'{') else 'text/html')
+
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path.endswith('/seeMoreJobPostings/search'):
+            body = synthetic_linkedin(params.get('keywords', ''), params.get('location', ''),
+                                      int(params.get('start', 0)), self.synthetic)
+            return self._send(200, body, 'text/html')
+        if url.path.rstrip('/') == '/api':
+            return self._send(200, synthetic_remoteok(params.get('tags', 'all'), self.synthetic), 'application/json')
+        return self._send(404, b'not found', 'text/plain')
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = 8002, pages_dir: str = None, synthetic: int = 0, throttle_every: int = 0,
+          retry_after: float = 1) -> ThreadingHTTPServer:
+    """Start the stub on a daemon thread and return the server (``server.shutdown()`` stops it)"""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {
+        'pages_dir': pages_dir, 'synthetic': synthetic, 'throttle_every': throttle_every,
+        'retry_after': retry_after, '_count': 0, '_count_lock': threading.Lock()})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8002)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--pages-dir', help="directory of responses recorded with --record-dir")
+    source.add_argument('--synthetic', type=int, help="generate this many jobs per search")
+    parser.add_argument('--throttle-every', type=int, default=0, help="answer every n-th request with a 429")
+    parser.add_argument('--retry-after', type=float, default=1, help="Retry-After seconds sent with those 429s")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.pages_dir, args.synthetic or 0, args.throttle_every, args.retry_after)
+    print(f"Job board stub listening on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
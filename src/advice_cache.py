@@ -0,0 +1,166 @@
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_key(prompt: str) -> str:
+    """Exact-cache key: the prompt with case and whitespace normalized"""
+    return hashlib.sha256(" ".join(prompt.lower().split()).encode('utf-8')).hexdigest()
+
+
+class SemanticCache:
+    """Nearest-neighbour cache: a lookup hits when a stored vector is within ``threshold``.
+
+    Vectors are unit length, so similarity is a dot product. Entries are
+    scanned brute force, which is cheap at the sizes a response cache holds
+    (a few thousand rows); ``maxsize`` and ``ttl`` bound it like LRUCache.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: Optional[float] = None, threshold: float = 0.95):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._data = OrderedDict()   # key -> (vector, value, expires_at)
+        self._matrix = None          # stacked vectors of _data, rebuilt after changes
+        self._keys: List[str] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, vector: np.ndarray, default: Any = None) -> Any:
+        """Value of the most similar entry if it clears the threshold, else ``default``"""
+        with self._lock:
+            self._expire()
+            if self._data:
+                if self._matrix is None:
+                    self._keys = list(self._data)
+                    self._matrix = np.stack([self._data[key][0] for key in self._keys])
+                scores = self._matrix @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    key = self._keys[best]
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return self._data[key][1]
+            self.misses += 1
+            return default
+
+    def set(self, key: str, vector: np.ndarray, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (np.asarray(vector, dtype=np.float32), value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            self._matrix = None
+
+    def _expire(self) -> None:
+        if self.ttl is None:
+            return
+        now = time.monotonic()
+        expired = [key for key, (_, _, expires_at) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        if expired:
+            self.expirations += len(expired)
+            self._matrix = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class AdviceCache:
+    """Two-level response cache in front of the advice LLM.
+
+    The exact level is keyed by the normalized prompt. The semantic level
+    embeds the candidate profile with ``embed_fn`` (texts -> unit vectors)
+    and reuses advice written for a profile at least ``threshold`` similar;
+    it is skipped when no ``embed_fn`` is given.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = 86400,
+                 embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 semantic_maxsize: int = 2048, threshold: float = 0.95):
+        self.exact = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.semantic = SemanticCache(maxsize=semantic_maxsize, ttl=ttl, threshold=threshold) if embed_fn else None
+        self.embed_fn = embed_fn
+        # A miss embeds the profile on get and again on set; remember recent vectors
+        self._vectors = LRUCache(maxsize=256)
+
+    def get(self, prompt: str, profile_text: str) -> Optional[str]:
+        key = prompt_key(prompt)
+        advice = self.exact.get(key)
+        if advice is not None or self.semantic is None:
+            return advice
+        vector = self._embed(profile_text)
+        if vector is None:
+            return None
+        advice = self.semantic.get(vector)
+        if advice is not None:
+            # Promote so the next identical prompt skips the embedding
+            self.exact.set(key, advice)
+        return advice
+
+    def set(self, prompt: str, profile_text: str, advice: str) -> None:
+        key = prompt_key(prompt)
+        self.exact.set(key, advice)
+        if self.semantic is not None:
+            vector = self._embed(profile_text)
+            if vector is not None:
+                self.semantic.set(key, vector, advice)
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        vector = self._vectors.get(text)
+        if vector is not None:
+            return vector
+        try:
+            vector = np.asarray(self.embed_fn([text]), dtype=np.float32)[0]
+        except Exception as e:
+            logger.warning(f"Advice cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        vector = vector / norm
+        self._vectors.set(text, vector)
+        return vector
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {'exact': self.exact.stats()}
+        if self.semantic is not None:
+            stats['semantic'] = self.semantic.stats()
+        return stats
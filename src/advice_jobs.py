@@ -0,0 +1,249 @@
+import os
+import time
+import uuid
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+FINISHED = ('done', 'error')
+
+
+class AdviceQueueFull(Exception):
+    """Raised when every advice worker is busy and the queue is at its limit"""
+
+
+class AdviceJob:
+    """Career advice being generated in the background, readable while it streams in"""
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = 'queued'
+        self.chunks: List[str] = []
+        self.error = None
+        self.created_at = time.time()
+        self._changed = threading.Condition()
+
+    def append(self, chunk: str) -> None:
+        with self._changed:
+            self.status = 'running'
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    def finish(self, error: Optional[str] = None) -> None:
+        with self._changed:
+            self.status = 'error' if error else 'done'
+            self.error = error
+            self._changed.notify_all()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def wait_for_chunks(self, start: int, timeout: float) -> Tuple[List[str], bool]:
+        """Chunks after the first ``start``, waiting up to ``timeout`` for new ones; plus whether the job is done"""
+        with self._changed:
+            if len(self.chunks) <= start and not self.done:
+                self._changed.wait(timeout)
+            return self.chunks[start:], self.done
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._changed:
+            return {'id': self.id, 'status': self.status, 'done': self.done,
+                    'advice': ''.join(self.chunks), 'error': self.error}
+
+
+class AdviceJobStore:
+    """Advice job state and chunks in SQLite, readable by every worker process.
+
+    Gunicorn runs several workers, and the results page's poll/stream requests
+    can land on a worker other than the one generating the advice. The
+    generating worker writes each chunk here; the others read it back.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS advice_jobs (
+        id TEXT PRIMARY KEY, status TEXT NOT NULL, error TEXT, created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS advice_jobs_created ON advice_jobs (created_at);
+    CREATE TABLE IF NOT EXISTS advice_chunks (
+        job_id TEXT NOT NULL, seq INTEGER NOT NULL, text TEXT NOT NULL, PRIMARY KEY (job_id, seq)
+    );
+    """
+
+    def __init__(self, path: str, ttl: float = 600):
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        # The store is often created in the gunicorn master; its setup connection is
+        # closed here so none is inherited across fork()
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread and process, opened on first use: SQLite connections
+        # must not be used after fork(), so one the thread inherited is left alone.
+        # WAL lets readers in other processes run alongside the writer
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def create(self, job: AdviceJob) -> None:
+        with self._conn() as conn:
+            cutoff = time.time() - self.ttl
+            conn.execute('DELETE FROM advice_chunks WHERE job_id IN '
+                         '(SELECT id FROM advice_jobs WHERE created_at < ?)', (cutoff,))
+            conn.execute('DELETE FROM advice_jobs WHERE created_at < ?', (cutoff,))
+            conn.execute('INSERT INTO advice_jobs (id, status, error, created_at) VALUES (?, ?, ?, ?)',
+                         (job.id, job.status, job.error, job.created_at))
+
+    def append(self, job_id: str, seq: int, chunk: str) -> None:
+        with self._conn() as conn:
+            conn.execute('INSERT INTO advice_chunks (job_id, seq, text) VALUES (?, ?, ?)', (job_id, seq, chunk))
+            conn.execute("UPDATE advice_jobs SET status = 'running' WHERE id = ?", (job_id,))
+
+    def finish(self, job_id: str, status: str, error: Optional[str]) -> None:
+        with self._conn() as conn:
+            conn.execute('UPDATE advice_jobs SET status = ?, error = ? WHERE id = ?', (status, error, job_id))
+
+    def state(self, job_id: str) -> Optional[Tuple[str, Optional[str]]]:
+        row = self._conn().execute('SELECT status, error FROM advice_jobs WHERE id = ? AND created_at >= ?',
+                                   (job_id, time.time() - self.ttl)).fetchone()
+        return tuple(row) if row else None
+
+    def chunks(self, job_id: str, start: int = 0) -> List[str]:
+        return [row[0] for row in self._conn().execute(
+            'SELECT text FROM advice_chunks WHERE job_id = ? AND seq >= ? ORDER BY seq', (job_id, start))]
+
+
+class StoredAdviceJob:
+    """Read-only view of an advice job another worker is generating (same interface as AdviceJob)"""
+
+    poll_interval = 0.2
+
+    def __init__(self, store: AdviceJobStore, job_id: str, status: str, error: Optional[str]):
+        self.store = store
+        self.id = job_id
+        self.status = status
+        self.error = error
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def _refresh(self) -> None:
+        state = self.store.state(self.id)
+        if state is None:
+            # Expired while being followed
+            self.status, self.error = 'error', 'Advice job expired'
+        else:
+            self.status, self.error = state
+
+    def wait_for_chunks(self, start: int, timeout: float) -> Tuple[List[str], bool]:
+        deadline = time.monotonic() + timeout
+        while True:
+            # Status first: chunks written before a job finished are then always seen with it
+            self._refresh()
+            chunks = self.store.chunks(self.id, start)
+            if chunks or self.done or time.monotonic() >= deadline:
+                return chunks, self.done
+            time.sleep(self.poll_interval)
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._refresh()
+        return {'id': self.id, 'status': self.status, 'done': self.done,
+                'advice': ''.join(self.store.chunks(self.id)), 'error': self.error}
+
+
+class AdviceJobs:
+    """Bounded worker pool that generates career advice off the request path.
+
+    ``submit`` returns a job id at once; the advice is read back by polling
+    ``get(job_id)`` or by following the job's chunks as they stream in. At most
+    ``max_workers`` LLM calls run at a time and at most ``max_pending`` jobs
+    wait or run; past that ``submit`` raises AdviceQueueFull instead of piling
+    up work. Jobs live for ``ttl`` seconds after submission, in this process
+    and, with ``store_path``, in a SQLite store every worker process can read.
+    """
+
+    def __init__(self, advisor_factory: Callable[[], Any], max_workers: int = 4,
+                 max_pending: int = 32, ttl: float = 600, store_path: Optional[str] = None):
+        self.advisor_factory = advisor_factory
+        self.store = AdviceJobStore(store_path, ttl) if store_path else None
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='advice')
+        self._jobs = LRUCache(maxsize=max(max_pending * 32, 256), ttl=ttl)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    def submit(self, resume_data: Dict) -> str:
+        """Queue advice for ``resume_data`` and return the job id"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise AdviceQueueFull(f"{self._pending} advice jobs already pending")
+            self._pending += 1
+
+        job = AdviceJob(uuid.uuid4().hex)
+        try:
+            if self.store is not None:
+                self.store.create(job)
+            self._jobs.set(job.id, job)
+            self._executor.submit(self._run, job, dict(resume_data))
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return job.id
+
+    def get(self, job_id: str):
+        """The job (AdviceJob, or a StoredAdviceJob if another worker runs it) or None"""
+        job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            state = self.store.state(job_id)
+            if state is not None:
+                job = StoredAdviceJob(self.store, job_id, *state)
+        return job
+
+    def _run(self, job: AdviceJob, resume_data: Dict) -> None:
+        try:
+            for chunk in self.advisor_factory().stream_career_suggestions(resume_data):
+                if self.store is not None:
+                    self.store.append(job.id, len(job.chunks), chunk)
+                job.append(chunk)
+            self._finish(job)
+        except Exception as e:
+            logger.error(f"Advice job {job.id} failed: {e}")
+            self._finish(job, "Could not generate AI advice at this time.")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _finish(self, job: AdviceJob, error: Optional[str] = None) -> None:
+        if self.store is not None:
+            try:
+                self.store.finish(job.id, 'error' if error else 'done', error)
+            except sqlite3.Error as e:
+                logger.error(f"Could not record advice job {job.id} as finished: {e}")
+        job.finish(error)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'pending': self._pending, 'max_pending': self.max_pending,
+                    'rejected': self.rejected, 'jobs': len(self._jobs)}
@@ -0,0 +1,244 @@
+"""Parse a directory or archive of resumes across a process pool.
+
+Usage:
+    python -m src.bulk_parse resumes/ --output parsed.jsonl --workers 8 --timeout 30
+    python -m src.bulk_parse dump.zip --output parsed_parquet --format parquet
+
+Results are streamed as they finish. Progress is checkpointed next to the
+output (``<output>.checkpoint``), so re-running the same command after an
+interruption skips the files that were already written.
+"""
+import os
+import json
+import signal
+import logging
+import tarfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for --format parquet
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+ARCHIVE_SEPARATOR = '!'   # source key of an archive member: "<archive>!<member>"
+
+_parser = None
+
+
+class ParseTimeout(BaseException):
+    """Raised by the alarm in a worker. A BaseException, so the parser's own
+    ``except Exception`` fallbacks cannot swallow it and return a half-parsed result"""
+
+
+def iter_sources(path: str) -> Iterator[Tuple[str, Optional[str], Optional[bytes]]]:
+    """Yield (source key, file path, member bytes) for every resume under ``path``.
+
+    Files on disk are passed by path; archive members are read in the main
+    process (tar streams cannot be seeked from the workers) and passed as bytes.
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    file_path = os.path.join(root, name)
+                    yield file_path, file_path, None
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS):
+                    yield f"{path}{ARCHIVE_SEPARATOR}{info.filename}", None, archive.read(info)
+    elif tarfile.is_tarfile(path):
+        # Stream mode reads the archive front to back once, even when compressed
+        with tarfile.open(path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(RESUME_EXTENSIONS):
+                    data = archive.extractfile(member).read()
+                    yield f"{path}{ARCHIVE_SEPARATOR}{member.name}", None, data
+    elif path.lower().endswith(RESUME_EXTENSIONS):
+        yield path, path, None
+    else:
+        raise ValueError(f"{path} is not a directory, archive or resume file")
+
+
+def _init_worker(parser_kwargs: Dict[str, Any]) -> None:
+    global _parser
+    from src.resume_parser import UltimateResumeParser
+    _parser = UltimateResumeParser(**parser_kwargs)
+
+
+def _on_timeout(signum, frame):
+    raise ParseTimeout()
+
+
+def _parse_one(source: str, file_path: Optional[str], data: Optional[bytes], timeout: float) -> Dict[str, Any]:
+    """Parse one resume in a worker, giving up after ``timeout`` seconds"""
+    use_alarm = timeout and hasattr(signal, 'setitimer')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if file_path is None:
+            # Archive members are parsed straight from memory
+            result = _parser.parse(data, filename=os.path.basename(source.split(ARCHIVE_SEPARATOR, 1)[-1]))
+        else:
+            result = _parser.parse(file_path)
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except ParseTimeout:
+        result = {"error": f"Timed out after {timeout}s"}
+    except Exception as e:
+        result = {"error": f"Failed to process resume: {e}"}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result["source"] = source
+    return result
+
+
+class Checkpoint:
+    """Append-only list of finished source keys, flushed after their results are written"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.done = {line.rstrip('\n') for line in f if line.strip()}
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def mark(self, sources) -> None:
+        for source in sources:
+            self._file.write(source + '\n')
+            self.done.add(source)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlWriter:
+    def __init__(self, path: str, append: bool = True):
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, records) -> None:
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes each batch as a new part file in the output directory, so resumed runs only add parts"""
+
+    def __init__(self, path: str, append: bool = True):
+        if pq is None:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if not append:
+            for name in os.listdir(path):
+                if name.startswith('part-') and name.endswith('.parquet'):
+                    os.remove(os.path.join(path, name))
+        self._part = len([name for name in os.listdir(path) if name.endswith('.parquet')])
+
+    def write(self, records) -> None:
+        if not records:
+            return
+        rows = [{**record, 'sections': json.dumps(record.get('sections') or {}, ensure_ascii=False)}
+                for record in records]
+        table = pa.Table.from_pylist(rows)
+        tmp_path = os.path.join(self.path, f".part-{self._part:05d}.parquet.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, os.path.join(self.path, f"part-{self._part:05d}.parquet"))
+        self._part += 1
+
+    def close(self) -> None:
+        pass
+
+
+def bulk_parse(input_path: str, output_path: str, output_format: str = 'jsonl', workers: int = None,
+               timeout: float = 60, batch_size: int = 500, resume: bool = True,
+               parser_kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """Parse every resume under ``input_path`` into ``output_path``; returns counts"""
+    checkpoint_path = f"{output_path.rstrip(os.sep)}.checkpoint"
+    if not resume and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = Checkpoint(checkpoint_path)
+    writer_cls = ParquetWriter if output_format == 'parquet' else JsonlWriter
+    writer = writer_cls(output_path, append=resume)
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 4  # bounds the archive bytes held in memory
+    counts = {'parsed': 0, 'failed': 0, 'skipped': 0}
+    batch = []
+
+    def flush():
+        writer.write(batch)
+        checkpoint.mark(record['source'] for record in batch)
+        batch.clear()
+
+    def collect(futures):
+        for future in futures:
+            record = future.result()
+            counts['failed' if 'error' in record else 'parsed'] += 1
+            batch.append(record)
+        if len(batch) >= batch_size:
+            flush()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(parser_kwargs or {},)) as pool:
+            pending = set()
+            for source, file_path, data in iter_sources(input_path):
+                if source in checkpoint.done:
+                    counts['skipped'] += 1
+                    continue
+                pending.add(pool.submit(_parse_one, source, file_path, data, timeout))
+                if len(pending) >= max_pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+            collect(pending)
+        flush()
+    finally:
+        writer.close()
+        checkpoint.close()
+
+    logger.info(f"Bulk parse finished: {counts}")
+    return counts
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="directory, .zip/.tar(.gz) archive or single resume")
+    parser.add_argument('--output', required=True, help="JSONL file or Parquet directory")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default=None,
+                        help="output format (default: from the output name)")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument('--timeout', type=float, default=60, help="seconds allowed per file")
+    parser.add_argument('--batch-size', type=int, default=500, help="records per write/checkpoint")
+    parser.add_argument('--max-pages', type=int, default=None, help="PDF pages read per resume")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and start over")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    output_format = args.format or ('parquet' if args.output.rstrip(os.sep).endswith('parquet') else 'jsonl')
+    parser_kwargs = {'max_pages': args.max_pages} if args.max_pages else {}
+    counts = bulk_parse(args.input, args.output, output_format, workers=args.workers, timeout=args.timeout,
+                        batch_size=args.batch_size, resume=not args.restart, parser_kwargs=parser_kwargs)
+    print(f"Parsed {counts['parsed']}, failed {counts['failed']}, skipped {counts['skipped']} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,49 @@
 import openai
-from typing import Dict, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Union
 import logging
 import json
 
+from src.advice_cache import AdviceCache
+from src.llm_client import LLMClient, LLMUnavailable
+
 logger = logging.getLogger(__name__)
 
+# Failures that fall back to the rule-based advice; anything else is a bug and is raised
+ADVICE_ERRORS = (openai.OpenAIError, LLMUnavailable)
+
+# Words of each resume section sent to the LLM; the parser keeps the full sections
+PROMPT_SECTION_WORDS = 300
+
+
+def excerpt(text: Any, max_words: int = PROMPT_SECTION_WORDS) -> str:
+    """First ``max_words`` words of ``text`` with whitespace collapsed, "..." marking a cut"""
+    words = str(text or '').split()
+    if len(words) <= max_words:
+        return " ".join(words)
+    return " ".join(words[:max_words]) + " ..."
+
 class CareerAdvisor:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, base_url: str = None, model: str = "gpt-3.5-turbo",
+                 cache: AdviceCache = None, llm_options: Dict[str, Any] = None):
         """
         Initialize with optional API key
         If no API key, uses free alternative approach
+        base_url points the client at any OpenAI-compatible endpoint,
+        e.g. scripts/llm_stub_server.py in tests
+        cache reuses LLM advice for identical or near-identical profiles
+        llm_options are passed to LLMClient (pool size, timeouts, rate limit, retries)
         """
         self.api_key = api_key
+        self.model = model
+        self.cache = cache
+        self.llm = None
         if api_key:
             try:
-                openai.api_key = api_key
-                self.client = openai.OpenAI(api_key=api_key)
-                self.has_openai = True
-            except:
-                self.has_openai = False
-        else:
-            self.has_openai = False
+                self.llm = LLMClient(api_key, base_url=base_url, **(llm_options or {}))
+            except openai.OpenAIError as e:
+                logger.error(f"OpenAI client setup failed, using rule-based advice: {str(e)}")
+        self.has_openai = self.llm is not None
             
         logger.info(f"Career Advisor initialized. OpenAI: {self.has_openai}")
 
@@ -31,24 +54,83 @@ class CareerAdvisor:
         else:
             return self._get_free_advice(resume_data)
 
+    def get_career_suggestions_many(self, resumes: List[Dict], max_workers: int = None) -> List[str]:
+        """Advice for several resumes, in order; identical profiles are asked once and
+        the rest run concurrently up to the client's concurrency cap"""
+        if not self.has_openai:
+            return [self._get_free_advice(resume_data) for resume_data in resumes]
+
+        prompts = [self._build_prompt(resume_data) for resume_data in resumes]
+        first = {}
+        for i, prompt in enumerate(prompts):
+            first.setdefault(prompt, i)
+        workers = min(max_workers or self.llm.max_concurrency, len(first)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='advice-batch') as pool:
+            futures = {prompt: pool.submit(self._get_openai_advice, resumes[i]) for prompt, i in first.items()}
+            return [futures[prompt].result() for prompt in prompts]
+
+    def stream_career_suggestions(self, resume_data: Dict) -> Iterator[str]:
+        """Yield the advice in chunks as the model produces them"""
+        if not self.has_openai:
+            yield self._get_free_advice(resume_data)
+            return
+
+        cached = self._cached_advice(resume_data)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        try:
+            for chunk in self.llm.stream(self._completion_params(resume_data)):
+                chunks.append(chunk)
+                yield chunk
+        except ADVICE_ERRORS as e:
+            logger.error(f"OpenAI advice stream failed: {str(e)}")
+            if not chunks:
+                yield self._get_free_advice(resume_data)
+            return
+        self._cache_advice(resume_data, "".join(chunks))
+
     def _get_openai_advice(self, resume_data: Dict) -> str:
         """Get advice using OpenAI GPT"""
+        cached = self._cached_advice(resume_data)
+        if cached is not None:
+            return cached
+
         try:
-            prompt = self._build_prompt(resume_data)
-            
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=500
-            )
+            advice = self.llm.complete(self._completion_params(resume_data))
+            self._cache_advice(resume_data, advice)
+            return advice
             
-            return response.choices[0].message.content
-            
-        except Exception as e:
+        except ADVICE_ERRORS as e:
             logger.error(f"OpenAI advice failed: {str(e)}")
             return self._get_free_advice(resume_data)
 
+    def _cached_advice(self, resume_data: Dict) -> Union[str, None]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self._build_prompt(resume_data), self._profile_text(resume_data))
+
+    def _cache_advice(self, resume_data: Dict, advice: str) -> None:
+        if self.cache is not None and advice:
+            self.cache.set(self._build_prompt(resume_data), self._profile_text(resume_data), advice)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the response cache and the LLM client"""
+        stats = self.cache.stats() if self.cache is not None else {}
+        if self.llm is not None:
+            stats['llm'] = self.llm.stats()
+        return stats
+
+    def _completion_params(self, resume_data: Dict) -> Dict:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": self._build_prompt(resume_data)}],
+            "temperature": 0.7,
+            "max_tokens": 500,
+        }
+
     def _get_free_advice(self, resume_data: Dict) -> str:
         """Free alternative using rule-based advice"""
         skills = resume_data.get('skills', [])
@@ -83,11 +165,25 @@ class CareerAdvisor:
         
         return "\n\n".join(advice)
 
+    def _profile_text(self, resume_data: Dict) -> str:
+        """The parts of a profile the advice depends on, for similarity lookups"""
+        return "\n".join([
+            "Skills: " + ", ".join(self._normalized_skills(resume_data)),
+            "Experience: " + excerpt(resume_data.get('experience')),
+            "Education: " + excerpt(resume_data.get('education')),
+        ])
+
+    def _normalized_skills(self, resume_data: Dict) -> List[str]:
+        # Order and case of skills do not change the advice, so they do not change the prompt
+        unique = {skill.strip().lower(): skill.strip() for skill in resume_data.get('skills', []) if skill.strip()}
+        return [unique[key] for key in sorted(unique)]
+
     def _build_prompt(self, resume_data: Dict) -> str:
         """Build prompt for OpenAI"""
-        skills = ", ".join(resume_data.get('skills', []))
-        experience = resume_data.get('experience', 'Not specified')
-        education = resume_data.get('education', 'Not specified')
+        skills = ", ".join(self._normalized_skills(resume_data))
+        # Sections can run to pages; the opening words carry what the advice needs
+        experience = excerpt(resume_data.get('experience')) or 'Not specified'
+        education = excerpt(resume_data.get('education')) or 'Not specified'
         
         return f"""
         As a career advisor, analyze this resume and provide specific advice:
@@ -0,0 +1,417 @@
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pandas as pd
+
+from src.filters import flag_values, parse_bool
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # optional: CSV catalogs load without it
+    pa = feather = pq = None
+
+logger = logging.getLogger(__name__)
+
+# Columns stored per posting, in the order live_jobs() returns them
+CATALOG_COLUMNS = ['title', 'company', 'location', 'link', 'source', 'is_remote']
+
+# Few distinct values across many rows: held as pandas categoricals (Arrow dictionaries)
+CATEGORICAL_COLUMNS = ('company', 'location', 'source', 'date_scraped')
+
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+# Query parameters that only track how a posting was reached, not which posting it is
+TRACKING_PARAMS = ('trk', 'trackingid', 'refid', 'position', 'pagenum', 'ref', 'src', 'source',
+                   'originalsubdomain', 'currentjobid', 'eboid')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT, company TEXT, location TEXT, link TEXT, source TEXT, is_remote INTEGER,
+    content_hash TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (deleted, last_seen);
+CREATE TABLE IF NOT EXISTS changes (
+    version INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    op TEXT NOT NULL,
+    PRIMARY KEY (version, job_id)
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """Catalog key for a posting link: lowercase scheme/host, no fragment, tracking or trailing slash.
+
+    Returns '' for links that cannot identify a posting ('#', 'N/A', relative paths).
+    """
+    parts = urlsplit(str(url).strip())
+    if parts.scheme.lower() not in ('http', 'https') or not parts.netloc:
+        return ''
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    params = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_'))
+    return urlunsplit(('https', host, parts.path.rstrip('/') or '/', urlencode(params), ''))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _columnar_format(path: str) -> Optional[str]:
+    if path.endswith('.parquet') or os.path.isdir(path):
+        return 'parquet'
+    if path.endswith(ARROW_EXTENSIONS):
+        return 'arrow'
+    return None
+
+
+def _string_dtype():
+    return pd.StringDtype('pyarrow') if pa is not None else object
+
+
+def encode_jobs(jobs_df: pd.DataFrame, categorical: Iterable[str] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """Compact in-memory layout: categoricals for repetitive columns, Arrow strings elsewhere, int8 flags.
+
+    Missing categorical values become '' so text preparation can keep using ``fillna('')``.
+    """
+    jobs_df = jobs_df.copy()
+    for col in jobs_df.columns:
+        values = jobs_df[col]
+        if col in categorical:
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            if values.isna().any():
+                if '' not in values.cat.categories:
+                    values = values.cat.add_categories([''])
+                values = values.fillna('')
+            jobs_df[col] = values
+        elif col == 'is_remote':
+            jobs_df[col] = flag_values(values)
+        elif values.dtype == object:
+            jobs_df[col] = values.astype(_string_dtype())
+    return jobs_df
+
+
+def load_jobs(path: str, columns: Optional[Iterable[str]] = None,
+              categorical: Iterable[str] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """Load a job catalog reading only ``columns`` (those present; None reads all).
+
+    Parquet files or directories (partitioned datasets) and Arrow IPC/Feather
+    files are read column-projected and memory-mapped, with the repetitive
+    columns decoded straight from dictionaries into categoricals. CSV falls
+    back to ``usecols`` and category dtypes.
+    """
+    wanted = None if columns is None else list(dict.fromkeys(columns))
+    categorical = tuple(categorical)
+    fmt = _columnar_format(path)
+    if fmt is None:
+        selector = None if wanted is None else (lambda col: col in wanted)
+        jobs_df = pd.read_csv(path, usecols=selector, dtype={col: 'category' for col in categorical})
+        return encode_jobs(jobs_df, categorical)
+
+    if pa is None:
+        raise ImportError(f"Reading {path} needs pyarrow (pip install pyarrow)")
+    if fmt == 'parquet':
+        available = pq.ParquetDataset(path).schema.names
+        table = pq.read_table(path, columns=None if wanted is None else [col for col in wanted if col in available],
+                              memory_map=True, read_dictionary=[col for col in categorical if col in available])
+    else:
+        with pa.memory_map(path) as source:
+            available = pa.ipc.open_file(source).schema.names
+        table = feather.read_table(path, memory_map=True,
+                                   columns=None if wanted is None else [col for col in wanted if col in available])
+
+    # Dictionary columns become categoricals; plain strings stay in Arrow buffers
+    strings = (pa.string(), pa.large_string())
+    jobs_df = table.to_pandas(types_mapper=lambda t: _string_dtype() if t in strings else None)
+    return encode_jobs(jobs_df, categorical)
+
+
+def save_jobs(jobs_df: pd.DataFrame, path: str, categorical: Iterable[str] = CATEGORICAL_COLUMNS) -> None:
+    """Write a job catalog as Parquet, Arrow IPC or CSV, chosen by the file extension"""
+    fmt = _columnar_format(path)
+    if fmt is None:
+        jobs_df.to_csv(path, index=False)
+        return
+    if pa is None:
+        raise ImportError(f"Writing {path} needs pyarrow (pip install pyarrow)")
+    jobs_df = encode_jobs(jobs_df, categorical)
+    table = pa.Table.from_pandas(jobs_df.reset_index(drop=True), preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if fmt == 'parquet':
+        pq.write_table(table, tmp_path, use_dictionary=[col for col in categorical if col in jobs_df.columns])
+    else:
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+
+def concat_jobs(jobs_df: pd.DataFrame, more: pd.DataFrame) -> pd.DataFrame:
+    """Append rows, keeping the columns that are categorical in ``jobs_df`` categorical"""
+    combined = pd.concat([jobs_df, more], ignore_index=True)
+    categorical = [col for col in jobs_df.columns if isinstance(jobs_df[col].dtype, pd.CategoricalDtype)]
+    for col in categorical:
+        categories = jobs_df[col].cat.categories
+        if col in more.columns:
+            categories = categories.append(pd.Index(more[col].dropna().unique()).difference(categories))
+        combined[col] = combined[col].astype(pd.CategoricalDtype(categories))
+    return encode_jobs(combined, categorical)
+
+
+class CatalogDelta:
+    """Net changes to the catalog between two versions, as job ids"""
+
+    __slots__ = ('since', 'version', 'inserted', 'updated', 'deleted')
+
+    def __init__(self, since: int, version: int, inserted: List[str], updated: List[str], deleted: List[str]):
+        self.since = since
+        self.version = version
+        self.inserted = inserted
+        self.updated = updated
+        self.deleted = deleted
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def __repr__(self) -> str:
+        return (f"CatalogDelta({self.since}->{self.version}: +{len(self.inserted)} "
+                f"~{len(self.updated)} -{len(self.deleted)})")
+
+
+class JobCatalog:
+    """Persistent job catalog in SQLite, keyed by normalized posting URL.
+
+    Every scrape is upserted: new postings are inserted, postings whose
+    content changed are updated, and unchanged ones only have ``last_seen``
+    bumped. Postings not seen for a while are expired (soft-deleted). Each
+    call that changes something gets a new catalog version and logs the
+    affected ids, so consumers can ask for ``changes_since(version)`` and
+    re-index only the delta (see :func:`sync_matcher`).
+    """
+
+    def __init__(self, path: str = 'data/jobs.db'):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    @property
+    def version(self) -> int:
+        return self._meta('version')
+
+    def _meta(self, key: str) -> int:
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else 0
+
+    @contextmanager
+    def _write(self):
+        """Transaction holding SQLite's write lock from the start.
+
+        BEGIN IMMEDIATE locks out writers in other processes before
+        meta.version is read, so two upserts can never claim the same version.
+        """
+        with self._lock, self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            yield self._conn
+
+    def _bump_version(self) -> int:
+        version = self._meta('version') + 1
+        self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('version', version))
+        return version
+
+    def upsert(self, jobs_df: pd.DataFrame, seen_at: Optional[str] = None) -> Dict[str, int]:
+        """Merge a batch of cleaned postings; returns inserted/updated/unchanged/skipped counts"""
+        seen_at = seen_at or _now()
+        rows = {}
+        skipped = 0
+        for job in jobs_df.reindex(columns=CATALOG_COLUMNS).to_dict('records'):
+            job_id = normalize_url(job['link'] if isinstance(job['link'], str) else '')
+            if not job_id or job_id in rows:
+                skipped += 1
+                continue
+            job['link'] = job_id
+            # Scrapes may spell the flag as text ("True", "no"); anything else counts as not remote
+            job['is_remote'] = int(bool(parse_bool(job['is_remote'])))
+            for col in ('title', 'company', 'location', 'source'):
+                job[col] = '' if pd.isna(job[col]) else str(job[col])
+            rows[job_id] = job
+
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': skipped}
+        if not rows:
+            return counts
+
+        with self._write():
+            existing = self._existing(list(rows))
+            version = self._meta('version') + 1
+            changes = []
+            for job_id, job in rows.items():
+                digest = self._content_hash(job)
+                values = [job[col] for col in CATALOG_COLUMNS]
+                previous = existing.get(job_id)
+                if previous is None:
+                    self._conn.execute(
+                        'INSERT INTO jobs (job_id, title, company, location, link, source, is_remote, '
+                        'content_hash, first_seen, last_seen, version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        [job_id, *values, digest, seen_at, seen_at, version])
+                    changes.append((version, job_id, 'insert'))
+                    counts['inserted'] += 1
+                elif previous['deleted'] or previous['content_hash'] != digest:
+                    # An expired posting that shows up again counts as new for consumers
+                    op = 'insert' if previous['deleted'] else 'update'
+                    self._conn.execute(
+                        'UPDATE jobs SET title = ?, company = ?, location = ?, link = ?, source = ?, is_remote = ?, '
+                        'content_hash = ?, last_seen = ?, version = ?, deleted = 0 WHERE job_id = ?',
+                        [*values, digest, seen_at, version, job_id])
+                    changes.append((version, job_id, op))
+                    counts['inserted' if op == 'insert' else 'updated'] += 1
+                else:
+                    self._conn.execute('UPDATE jobs SET last_seen = ? WHERE job_id = ?', (seen_at, job_id))
+                    counts['unchanged'] += 1
+            if changes:
+                self._conn.executemany('INSERT INTO changes (version, job_id, op) VALUES (?, ?, ?)', changes)
+                self._bump_version()
+
+        logger.info(f"Catalog upsert: {counts}")
+        return counts
+
+    def expire(self, max_age_days: float = 14, now: Optional[str] = None) -> int:
+        """Soft-delete postings not seen for ``max_age_days``; returns how many expired"""
+        now = datetime.fromisoformat(now) if now else datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=max_age_days)).isoformat(timespec='seconds')
+        with self._write():
+            stale = [row[0] for row in self._conn.execute(
+                'SELECT job_id FROM jobs WHERE deleted = 0 AND last_seen < ?', (cutoff,))]
+            if not stale:
+                return 0
+            version = self._bump_version()
+            self._conn.executemany('UPDATE jobs SET deleted = 1, version = ? WHERE job_id = ?',
+                                   [(version, job_id) for job_id in stale])
+            self._conn.executemany('INSERT INTO changes (version, job_id, op) VALUES (?, ?, ?)',
+                                   [(version, job_id, 'delete') for job_id in stale])
+        logger.info(f"Expired {len(stale)} postings not seen since {cutoff}")
+        return len(stale)
+
+    def changes_since(self, since: int) -> CatalogDelta:
+        """Ids inserted, updated and deleted after version ``since``, netted per id"""
+        with self._lock:
+            if since < self._meta('pruned_through'):
+                raise ValueError(f"Change log before version {self._meta('pruned_through')} was pruned; "
+                                 f"rebuild from live_jobs()")
+            version = self._meta('version')
+            rows = self._conn.execute('SELECT job_id, op FROM changes WHERE version > ? ORDER BY version',
+                                      (since,)).fetchall()
+
+        first_op, last_op = {}, {}
+        for job_id, op in rows:
+            first_op.setdefault(job_id, op)
+            last_op[job_id] = op
+        inserted, updated, deleted = [], [], []
+        for job_id, op in last_op.items():
+            existed = first_op[job_id] != 'insert'
+            exists = op != 'delete'
+            if exists:
+                (updated if existed else inserted).append(job_id)
+            elif existed:
+                deleted.append(job_id)
+        return CatalogDelta(since, version, inserted, updated, deleted)
+
+    def prune_changes(self, through: int) -> int:
+        """Drop change log entries up to version ``through``; older consumers must rebuild"""
+        with self._write():
+            removed = self._conn.execute('DELETE FROM changes WHERE version <= ?', (through,)).rowcount
+            pruned = max(through, self._meta('pruned_through'))
+            self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('pruned_through', pruned))
+        return removed
+
+    def live_jobs(self, ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Current (not expired) postings in the matcher's column layout, optionally just ``ids``.
+
+        ``date_scraped``, which the matcher's posted-within filters use, is the
+        day a posting was first seen: every crawl that still lists a posting
+        bumps ``last_seen``, which would make old postings look new.
+        """
+        columns = ', '.join(CATALOG_COLUMNS)
+        query = f'SELECT {columns}, first_seen, last_seen FROM jobs WHERE deleted = 0'
+        with self._lock:
+            if ids is None:
+                jobs_df = pd.read_sql_query(query + ' ORDER BY first_seen, job_id', self._conn)
+            else:
+                ids = list(ids)
+                # Stay under SQLite's bound-parameter limit
+                chunks = [pd.read_sql_query(f"{query} AND job_id IN ({', '.join('?' * len(chunk))})",
+                                            self._conn, params=chunk)
+                          for chunk in (ids[i:i + 500] for i in range(0, len(ids), 500))]
+                jobs_df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(
+                    columns=CATALOG_COLUMNS + ['first_seen', 'last_seen'])
+        jobs_df['date_scraped'] = jobs_df['first_seen'].str[:10]
+        return jobs_df
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            live, expired = self._conn.execute(
+                'SELECT COALESCE(SUM(deleted = 0), 0), COALESCE(SUM(deleted = 1), 0) FROM jobs').fetchone()
+            return {'version': self._meta('version'), 'live': live, 'expired': expired,
+                    'changes': self._conn.execute('SELECT COUNT(*) FROM changes').fetchone()[0]}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _existing(self, ids: List[str]) -> Dict[str, Dict]:
+        existing = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            for job_id, digest, deleted in self._conn.execute(
+                    f"SELECT job_id, content_hash, deleted FROM jobs WHERE job_id IN ({', '.join('?' * len(chunk))})",
+                    chunk):
+                existing[job_id] = {'content_hash': digest, 'deleted': deleted}
+        return existing
+
+    @staticmethod
+    def _content_hash(job: Dict) -> str:
+        text = '\x1f'.join(str(job[col]) for col in CATALOG_COLUMNS)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def sync_matcher(matcher, catalog: JobCatalog, since: int) -> int:
+    """Apply the catalog changes after version ``since`` to a JobMatcher; returns the version synced to.
+
+    The matcher must key jobs by ``link`` (its default), which the catalog
+    stores normalized. Only inserted and updated rows are read and encoded.
+    """
+    delta = catalog.changes_since(since)
+    if not delta:
+        return delta.version
+
+    known = set(matcher.jobs_df[matcher.id_column].astype(str))
+    upserts = catalog.live_jobs(delta.inserted + delta.updated)
+    # The matcher may already hold some "inserted" ids (e.g. built from an export), so route by membership
+    is_known = upserts['link'].isin(known)
+    columns = [col for col in upserts.columns if col in matcher.jobs_df.columns] or CATALOG_COLUMNS
+    if delta.deleted:
+        matcher.remove_jobs(delta.deleted)
+    if is_known.any():
+        matcher.update_jobs(upserts.loc[is_known, columns])
+    if (~is_known).any():
+        matcher.add_jobs(upserts.loc[~is_known, columns])
+    logger.info(f"Synced matcher with catalog {delta}")
+    return delta.version
@@ -0,0 +1,224 @@
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.filters import DATE_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# Fields a posting is compared on
+DEDUP_FIELDS = ['title', 'company', 'location']
+
+# Lowercased text is split on anything else, so reposts with different punctuation compare equal
+NON_WORD_PATTERN = r'[^a-z0-9+#]+'
+
+
+def job_texts(jobs_df: pd.DataFrame) -> List[str]:
+    """Normalized title + company + location per row"""
+    fields = []
+    for col in DEDUP_FIELDS:
+        if col not in jobs_df.columns:
+            fields.append(pd.Series('', index=jobs_df.index))
+            continue
+        values = jobs_df[col].astype(object).fillna('').astype(str).str.lower()
+        fields.append(values.str.replace(NON_WORD_PATTERN, ' ', regex=True).str.strip())
+    return (fields[0] + ' | ' + fields[1] + ' | ' + fields[2]).tolist()
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: packed k-grams are highly structured, and multiply-shift
+    alone then gives minima biased towards agreement"""
+    values = values ^ (values >> np.uint64(30))
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) whose S-curve (1/bands)^(1/rows) sits closest to ``threshold``"""
+    best = min(((bands, num_perm // bands) for bands in range(1, num_perm + 1)),
+               key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+    return best
+
+
+class MinHashDeduplicator:
+    """Clusters near-duplicate texts with MinHash signatures and LSH banding.
+
+    Each text becomes a set of byte ``shingle_size``-grams, hashed
+    ``num_perm`` times with multiply-shift hashing; the per-hash minima form
+    its signature. Signatures are cut into bands and rows that share any
+    band become candidates, so the work grows with the number of rows rather
+    than the number of pairs. A candidate joins a cluster only if the
+    signatures agree on at least ``threshold`` of their hashes (the
+    estimated Jaccard similarity) and, when given, ``confirm`` accepts it.
+
+    Within a bucket every row is compared with the ``bucket_window`` rows
+    before it, ordered so rows that also share the next band are adjacent:
+    small buckets get every pair, and the large buckets that shared company
+    and location text produces stay linear in their size.
+    """
+
+    def __init__(self, threshold: float = 0.75, num_perm: int = 128, shingle_size: int = 3, seed: int = 1,
+                 bucket_window: int = 8):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if not 1 <= shingle_size <= 8:
+            raise ValueError("shingle_size must be between 1 and 8 bytes")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bucket_window = bucket_window
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        # Odd multipliers keep multiply-shift hashing universal
+        self._a = rng.integers(0, 2 ** 64, num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 64, num_perm, dtype=np.uint64, endpoint=False)
+
+    def signatures(self, texts: List[str], batch_size: int = 512) -> np.ndarray:
+        """(len(texts), num_perm) uint32 MinHash signatures"""
+        k = self.shingle_size
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for start in range(0, len(texts), batch_size):
+            chunk = [text.encode('utf-8').ljust(k) for text in texts[start:start + batch_size]]
+            lengths = np.array([len(data) for data in chunk])
+            data = np.frombuffer(b''.join(chunk), dtype=np.uint8).astype(np.uint64)
+            # Byte k-grams packed into one integer each, starting at every position of the batch...
+            grams = np.zeros(len(data) - k + 1, dtype=np.uint64)
+            for i in range(k):
+                grams |= data[i:len(data) - k + 1 + i] << np.uint64(8 * (k - 1 - i))
+            # ...minus the k-1 that straddle two texts. Repeated grams are harmless for a minimum.
+            ends = np.cumsum(lengths)
+            straddling = (ends[:-1, None] - np.arange(1, k)[None, :]).ravel()
+            valid = np.ones(len(grams), dtype=bool)
+            valid[straddling] = False
+            offsets = np.r_[0, np.cumsum(lengths - k + 1)[:-1]]
+            grams = _mix64(grams[valid])
+            # (a * x + b) mod 2^64 per hash function, in place; the shift to the high
+            # 32 bits is monotonic, so it is applied to the minima only
+            hashed = np.multiply(self._a[:, None], grams[None, :])
+            hashed += self._b[:, None]
+            minima = np.minimum.reduceat(hashed, offsets, axis=1)
+            signatures[start:start + len(chunk)] = (minima >> np.uint64(32)).T
+        return signatures
+
+    def candidate_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        """(m, 2) row pairs that share an LSH band and agree on ``threshold`` of their hashes, each once"""
+        n = len(signatures)
+        mixers = np.random.default_rng(0).integers(1, 2 ** 63, self.rows, dtype=np.uint64) | np.uint64(1)
+        # One 64-bit key per row and band; a rare collision only adds a candidate that verification rejects
+        keys = np.stack([(signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64) * mixers)
+                         .sum(axis=1, dtype=np.uint64) for band in range(self.bands)])
+        found = []
+        for band in range(self.bands):
+            # Inside a bucket, rows that also share the next band sit next to each other
+            order = np.lexsort((keys[(band + 1) % self.bands], keys[band]))
+            sorted_keys = keys[band][order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            rank = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+            # Each row is compared with the bucket_window rows before it, not only with the
+            # bucket's first row: that one may be a near miss the others all differ from
+            positions = np.flatnonzero(rank > 0)
+            for distance in range(1, self.bucket_window + 1):
+                positions = positions[rank[positions] >= distance]
+                if not len(positions):
+                    break
+                pairs = np.sort(np.stack([order[positions - distance], order[positions]], axis=1), axis=1)
+                # Verified band by band, so only likely duplicates are held on to
+                found.append(pairs[self._similar(signatures, pairs)])
+        if not found:
+            return np.empty((0, 2), dtype=np.int64)
+        keys = np.unique(np.concatenate(found) @ np.array([n, 1], dtype=np.int64))
+        return np.stack([keys // n, keys % n], axis=1)
+
+    def _similar(self, signatures: np.ndarray, pairs: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+        """Whether each pair's estimated Jaccard similarity reaches ``threshold``"""
+        similar = np.empty(len(pairs), dtype=bool)
+        for start in range(0, len(pairs), batch_size):
+            left, right = pairs[start:start + batch_size].T
+            similar[start:start + batch_size] = (signatures[left] == signatures[right]).mean(axis=1) >= self.threshold
+        return similar
+
+    def clusters(self, texts: List[str],
+                 confirm: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        """Cluster label per text: the position of the first text in its cluster"""
+        n = len(texts)
+        parent = np.arange(n)
+        if n < 2:
+            return parent
+        signatures = self.signatures(texts)
+        pairs = self.candidate_pairs(signatures)
+        left, right = pairs[:, 0], pairs[:, 1]
+        if confirm is not None and len(left):
+            accepted = np.asarray(confirm(left, right), dtype=bool)
+            left, right = left[accepted], right[accepted]
+
+        parent = parent.tolist()
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in zip(left.tolist(), right.tolist()):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+        return np.array([find(i) for i in range(n)])
+
+
+def title_similarity(left: str, right: str) -> float:
+    """Jaccard similarity of two normalized titles' word sets"""
+    left, right = set(left.split()), set(right.split())
+    return len(left & right) / len(left | right) if left | right else 1.0
+
+
+def dedupe_jobs(jobs_df: pd.DataFrame, threshold: float = 0.75, title_threshold: float = 0.8,
+                embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None, min_cosine: float = 0.9,
+                deduplicator: Optional[MinHashDeduplicator] = None) -> pd.DataFrame:
+    """Keep one canonical posting per near-duplicate cluster (the most recently scraped).
+
+    Company and location make up most of the compared text, so MinHash alone
+    would merge "backend engineer" and "frontend engineer" at one office.
+    Candidates must therefore also have titles whose word sets overlap by at
+    least ``title_threshold``: reposts with reworded punctuation or the same
+    words reordered merge, "software engineer ii" / "iii" do not. With
+    ``embed_fn`` (e.g. ``JobMatcher.embed``), they must also have embedding
+    cosine similarity >= ``min_cosine``; only candidate rows get embedded.
+    """
+    if len(jobs_df) < 2:
+        return jobs_df
+    deduplicator = deduplicator or MinHashDeduplicator(threshold)
+    texts = job_texts(jobs_df)
+    titles = [text.split(' | ', 1)[0] for text in texts]
+
+    def confirm(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        accepted = np.array([title_similarity(titles[i], titles[j]) >= title_threshold
+                             for i, j in zip(left.tolist(), right.tolist())], dtype=bool)
+        if embed_fn is None or not accepted.any():
+            return accepted
+        rows = np.unique(np.concatenate([left[accepted], right[accepted]]))
+        vectors = np.asarray(embed_fn([texts[i] for i in rows]), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        position = {row: i for i, row in enumerate(rows.tolist())}
+        lv = vectors[[position[i] for i in left[accepted].tolist()]]
+        rv = vectors[[position[i] for i in right[accepted].tolist()]]
+        accepted[accepted] = (lv * rv).sum(axis=1) >= min_cosine
+        return accepted
+
+    labels = deduplicator.clusters(texts, confirm)
+
+    # Newest posting of each cluster is canonical; ties keep the earlier row
+    recency = (pd.to_datetime(jobs_df[DATE_COLUMN], errors='coerce') if DATE_COLUMN in jobs_df.columns
+               else pd.Series(pd.NaT, index=jobs_df.index))
+    ranked = pd.DataFrame({'cluster': labels, 'recency': recency.to_numpy(), 'row': np.arange(len(jobs_df))})
+    ranked = ranked.sort_values(['cluster', 'recency', 'row'], ascending=[True, False, True], na_position='last')
+    keep = np.sort(ranked.drop_duplicates('cluster')['row'].to_numpy())
+
+    dropped = len(jobs_df) - len(keep)
+    if dropped:
+        logger.info(f"Dropped {dropped} near-duplicate postings ({len(keep)} canonical of {len(jobs_df)})")
+    return jobs_df.iloc[keep].reset_index(drop=True)
@@ -0,0 +1,245 @@
+import os
+import json
+import struct
+import hashlib
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bytes reserved for the .npy header, so the row count can grow in place
+HEADER_BYTES = 128
+
+# Incremental operations logged before the sidecar is rewritten in full
+COMPACT_AFTER_OPS = 256
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of the text a job embedding was computed from"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def removal_order(size: int, rows) -> np.ndarray:
+    """Row order after deleting ``rows``: holes are filled with the last surviving rows.
+
+    Only ``len(rows)`` rows move, so a deletion costs as much as it removes.
+    """
+    removed = np.zeros(size, dtype=bool)
+    removed[np.asarray(rows, dtype=np.int64)] = True
+    remaining = size - int(removed.sum())
+    order = np.arange(remaining, dtype=np.int64)
+    order[np.flatnonzero(removed[:remaining])] = np.flatnonzero(~removed[remaining:]) + remaining
+    return order
+
+
+class EmbeddingStore:
+    """On-disk job embedding matrix with a row-id/content-hash sidecar.
+
+    The matrix is kept as a float32 ``.npy`` file and opened with
+    ``mmap_mode='r'`` so worker processes share the pages through the OS
+    page cache instead of each holding (and computing) a private copy.
+
+    ``append``, ``patch`` and ``remove`` change the file in place and
+    touch only the affected rows: the header leaves room for the row count
+    to grow, and each change is recorded in a ``<path>.log`` journal next to
+    the sidecar (folded into it every ``COMPACT_AFTER_OPS`` changes). A
+    change that did not finish makes ``load`` ignore the store, so the
+    vectors are recomputed rather than trusted. One process writes a store.
+    """
+
+    def __init__(self, path: str, model_name: str):
+        # ``path`` is a prefix: <path>.npy holds vectors, <path>.json the sidecar
+        self.path = path
+        self.model_name = model_name
+        self.matrix_path = f"{path}.npy"
+        self.meta_path = f"{path}.json"
+        self.log_path = f"{path}.log"
+
+    def load(self) -> Optional[Tuple[np.ndarray, List[str], List[str]]]:
+        """Memory-map the stored matrix, or return None if it is missing or stale"""
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.meta_path)):
+            return None
+
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            matrix = np.load(self.matrix_path, mmap_mode='r')
+            ids, hashes = self._replay(meta.get('ids', []), meta.get('hashes', []))
+        except Exception as e:
+            logger.warning(f"Could not read embedding store {self.path}: {e}")
+            return None
+
+        if meta.get('model') != self.model_name:
+            logger.info(f"Embedding store built with {meta.get('model')}, ignoring it")
+            return None
+
+        if ids is None or matrix.ndim != 2 or matrix.shape[0] != len(ids) or len(ids) != len(hashes):
+            logger.warning(f"Embedding store {self.path} is inconsistent, ignoring it")
+            return None
+
+        return matrix, ids, hashes
+
+    def save(self, matrix: np.ndarray, ids: List[str], hashes: List[str]) -> None:
+        """Atomically replace the stored matrix and sidecar"""
+        directory = os.path.dirname(self.matrix_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        suffix = f".{os.getpid()}.tmp"
+        tmp_matrix = self.matrix_path + suffix
+        tmp_meta = self.meta_path + suffix
+
+        matrix = np.asarray(matrix, dtype=np.float32)
+        with open(tmp_matrix, 'wb') as f:
+            _write_header(f, matrix.shape)
+            for start in range(0, len(matrix), 65536):
+                f.write(np.ascontiguousarray(matrix[start:start + 65536]).tobytes())
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump({'model': self.model_name, 'dim': int(matrix.shape[1]),
+                       'ids': list(ids), 'hashes': list(hashes)}, f)
+
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_meta, self.meta_path)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def append(self, vectors: np.ndarray, ids: List[str], hashes: List[str]) -> np.ndarray:
+        """Add rows at the end of the stored matrix; returns the new mapping"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        matrix = self._writable()
+        size, dim = matrix.shape
+        if not size:
+            self.save(vectors, ids, hashes)
+            return np.load(self.matrix_path, mmap_mode='r')
+        if dim != vectors.shape[1]:
+            raise ValueError(f"Cannot append {vectors.shape[1]}-d rows to a {dim}-d store")
+        self._log({'op': 'append', 'ids': list(ids), 'hashes': list(hashes)})
+        with open(self.matrix_path, 'r+b') as f:
+            f.seek(matrix.offset + size * dim * 4)
+            f.write(vectors.tobytes())
+            _write_header(f, (size + len(vectors), dim))
+        return self._done()
+
+    def patch(self, rows, vectors: np.ndarray, hashes: List[str]) -> np.ndarray:
+        """Overwrite ``rows`` (row positions) in place; returns the mapping"""
+        matrix = self._writable(mode='r+')
+        self._log({'op': 'patch', 'rows': [int(row) for row in rows], 'hashes': list(hashes)})
+        matrix[np.asarray(rows, dtype=np.int64)] = vectors
+        matrix.flush()
+        return self._done()
+
+    def remove(self, rows) -> Tuple[np.ndarray, np.ndarray]:
+        """Delete ``rows``, moving the last rows into their place; returns (mapping, removal_order)"""
+        matrix = self._writable(mode='r+')
+        size, dim = matrix.shape
+        order = removal_order(size, rows)
+        self._log({'op': 'remove', 'rows': [int(row) for row in rows]})
+        holes = np.flatnonzero(order != np.arange(len(order)))
+        matrix[holes] = matrix[order[holes]]
+        matrix.flush()
+        with open(self.matrix_path, 'r+b') as f:
+            # Rows past the new count stay in the file until the next full save
+            _write_header(f, (len(order), dim))
+        return self._done(), order
+
+    def sync(self, ids: List[str], texts: List[str],
+             encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Return embeddings for ``texts``, encoding only rows whose text changed"""
+        hashes = [content_hash(text) for text in texts]
+        stored = self.load()
+
+        if stored is not None:
+            matrix, stored_ids, stored_hashes = stored
+            if stored_ids == list(ids) and stored_hashes == hashes:
+                logger.info(f"Loaded {len(ids)} job embeddings from {self.matrix_path}")
+                return matrix
+            # Identical text gives an identical vector, so reuse rows by hash
+            reusable = {h: row for row, h in enumerate(stored_hashes)}
+        else:
+            matrix, reusable = None, {}
+
+        missing = [i for i, h in enumerate(hashes) if h not in reusable]
+        logger.info(f"Encoding {len(missing)} of {len(texts)} job texts")
+
+        new_vectors = None
+        if missing:
+            new_vectors = np.asarray(encode_fn([texts[i] for i in missing]), dtype=np.float32)
+
+        if new_vectors is not None:
+            dim = new_vectors.shape[1]
+        elif matrix is not None:
+            dim = matrix.shape[1]
+        else:
+            dim = 0
+
+        result = np.empty((len(texts), dim), dtype=np.float32)
+        if new_vectors is not None:
+            result[missing] = new_vectors
+        reused = [i for i, h in enumerate(hashes) if h in reusable]
+        if reused:
+            result[reused] = matrix[[reusable[hashes[i]] for i in reused]]
+
+        self.save(result, ids, hashes)
+        loaded = self.load()
+        return loaded[0] if loaded is not None else result
+
+    def _writable(self, mode: str = 'r') -> np.memmap:
+        """The stored matrix, rewritten once if its header has no room to grow"""
+        matrix = np.load(self.matrix_path, mmap_mode=mode)
+        if matrix.offset != HEADER_BYTES:
+            stored = self.load()
+            if stored is None:
+                raise ValueError(f"Embedding store {self.path} is inconsistent; sync it before updating")
+            self.save(*stored)
+            matrix = np.load(self.matrix_path, mmap_mode=mode)
+        return matrix
+
+    def _log(self, entry: dict) -> None:
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def _done(self) -> np.ndarray:
+        """Mark the logged change complete, compacting the journal when it gets long"""
+        self._log({'op': 'done'})
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            entries = sum(1 for _ in f) // 2
+        if entries >= COMPACT_AFTER_OPS:
+            stored = self.load()
+            if stored is not None:
+                self.save(*stored)
+        return np.load(self.matrix_path, mmap_mode='r')
+
+    def _replay(self, ids: List[str], hashes: List[str]) -> Tuple[Optional[List[str]], List[str]]:
+        """Apply the journal to the sidecar's ids and hashes; ids is None if a change did not finish"""
+        if not os.path.exists(self.log_path):
+            return ids, hashes
+        pending = None
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['op'] != 'done':
+                    pending = entry
+                    continue
+                if pending is None:
+                    continue
+                if pending['op'] == 'append':
+                    ids, hashes = ids + pending['ids'], hashes + pending['hashes']
+                elif pending['op'] == 'patch':
+                    hashes = list(hashes)
+                    for row, job_hash in zip(pending['rows'], pending['hashes']):
+                        hashes[row] = job_hash
+                elif pending['op'] == 'remove':
+                    order = removal_order(len(ids), pending['rows']).tolist()
+                    ids, hashes = [ids[i] for i in order], [hashes[i] for i in order]
+                pending = None
+        return (None if pending is not None else ids), hashes
+
+
+def _write_header(f, shape: Tuple[int, int]) -> None:
+    """Write a float32 .npy header for ``shape``, padded to HEADER_BYTES"""
+    header = repr({'descr': '<f4', 'fortran_order': False, 'shape': tuple(int(n) for n in shape)})
+    header = header.ljust(HEADER_BYTES - 10 - 1) + '\n'
+    f.seek(0)
+    f.write(np.lib.format.magic(1, 0) + struct.pack('<H', len(header)) + header.encode('latin1'))
@@ -0,0 +1,152 @@
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Facet name used in filters -> catalog column
+FACET_COLUMNS = {
+    'remote': 'is_remote',
+    'location': 'location',
+    'source': 'source',
+}
+DATE_COLUMN = 'date_scraped'
+FILTER_KEYS = set(FACET_COLUMNS) | {'days', 'since'}
+
+# Accepted spellings of the ``remote`` flag (form fields and query strings arrive as text)
+TRUE_STRINGS = {'1', 'true', 'yes', 'on'}
+FALSE_STRINGS = {'0', 'false', 'no', 'off'}
+
+# Facets matched by substring ("new york" matches "new york, ny") rather than equality
+SUBSTRING_FACETS = {'location'}
+
+
+def parse_bool(value: Any) -> Optional[bool]:
+    """The boolean ``value`` spells (True, 1, 'yes', 'off', ...), or None if it spells none"""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in TRUE_STRINGS | FALSE_STRINGS:
+        return value.strip().lower() in TRUE_STRINGS
+    return None
+
+
+def flag_values(values: pd.Series) -> np.ndarray:
+    """A flag column such as ``is_remote`` as int8 0/1; missing or unrecognized values are 0"""
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return pd.to_numeric(values, errors='coerce').fillna(0).astype(bool).to_numpy(dtype=np.int8)
+    return np.array([bool(parse_bool(value)) for value in values], dtype=np.int8)
+
+
+class FilterIndex:
+    """Precomputed row postings per facet value plus a date-sorted row order.
+
+    Filters are resolved to the surviving row positions before any scoring
+    happens, so a selective query ("remote only, last 7 days") only scores
+    the jobs it can actually return.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.facets = {}        # facet -> {normalized value: sorted row positions}
+        self.date_days = None   # days since epoch of each row in date order
+        self.date_rows = None   # row positions sorted by date
+
+    def build(self, jobs_df: pd.DataFrame) -> 'FilterIndex':
+        self.size = len(jobs_df)
+        self.facets = {}
+        for facet, column in FACET_COLUMNS.items():
+            if column not in jobs_df.columns:
+                continue
+            values = jobs_df[column]
+            if facet == 'remote':
+                codes, uniques = pd.factorize(flag_values(values).astype(bool))
+            elif isinstance(values.dtype, pd.CategoricalDtype):
+                # Normalize each category once instead of every row
+                normalized = pd.Series(values.cat.categories, dtype=object).astype(str).str.strip().str.lower()
+                category_codes, uniques = pd.factorize(pd.concat([normalized, pd.Series([''])], ignore_index=True))
+                codes = category_codes[values.cat.codes.to_numpy()]   # code -1 (missing) picks the trailing ''
+            else:
+                codes, uniques = pd.factorize(values.fillna('').astype(str).str.strip().str.lower())
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.facets[facet] = {value: order[bounds[i]:bounds[i + 1]]
+                                  for i, value in enumerate(uniques)}
+
+        self.date_days, self.date_rows = None, None
+        if DATE_COLUMN in jobs_df.columns:
+            dates = pd.to_datetime(jobs_df[DATE_COLUMN], errors='coerce')
+            known = np.flatnonzero(dates.notna().to_numpy())
+            days = (dates.iloc[known].to_numpy().astype('datetime64[D]')).astype(np.int64)
+            order = np.argsort(days, kind='stable')
+            self.date_days, self.date_rows = days[order], known[order]
+        return self
+
+    def normalize(self, filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate filters and resolve relative ones, e.g. ``days`` to a ``since`` date"""
+        if not filters:
+            return {}
+        unknown = set(filters) - FILTER_KEYS
+        if unknown:
+            raise ValueError(f"Unknown filters {sorted(unknown)}, expected some of {sorted(FILTER_KEYS)}")
+
+        normalized = {}
+        for key, value in filters.items():
+            if value is None or value == '' or value == []:
+                continue
+            if key == 'remote':
+                normalized[key] = self._parse_bool(key, value)
+            elif key == 'days':
+                since = pd.Timestamp.now().normalize() - pd.Timedelta(days=int(value))
+                normalized['since'] = max(since, pd.Timestamp(normalized.get('since', since))).strftime('%Y-%m-%d')
+            elif key == 'since':
+                since = pd.Timestamp(value).normalize()
+                normalized[key] = max(since, pd.Timestamp(normalized.get('since', since))).strftime('%Y-%m-%d')
+            else:
+                values = [value] if isinstance(value, str) else list(value)
+                normalized[key] = sorted(str(v).strip().lower() for v in values)
+        return normalized
+
+    @staticmethod
+    def _parse_bool(key: str, value: Any) -> bool:
+        parsed = parse_bool(value)
+        if parsed is not None:
+            return parsed
+        raise ValueError(f"'{key}' must be a boolean, got {value!r}")
+
+    def rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Sorted row positions passing all filters, or None when nothing is filtered"""
+        filters = self.normalize(filters)
+        if not filters:
+            return None
+
+        mask = np.ones(self.size, dtype=bool)
+        for key, value in filters.items():
+            if key == 'since':
+                mask &= self._since_mask(value)
+            else:
+                mask &= self._facet_mask(key, value if isinstance(value, list) else [value])
+        return np.flatnonzero(mask)
+
+    def _facet_mask(self, facet: str, wanted: Iterable[Any]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        postings = self.facets.get(facet, {})
+        for want in wanted:
+            if facet in SUBSTRING_FACETS:
+                matches = [rows for value, rows in postings.items() if want in value]
+            else:
+                matches = [postings.get(want, np.empty(0, dtype=np.int64))]
+            for rows in matches:
+                mask[rows] = True
+        return mask
+
+    def _since_mask(self, since: str) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        if self.date_days is None:
+            return mask
+        cutoff = np.datetime64(since, 'D').astype(np.int64)
+        mask[self.date_rows[np.searchsorted(self.date_days, cutoff, side='left'):]] = True
+        return mask
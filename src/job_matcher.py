@@ -1,65 +1,594 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 import pandas as pd
 import numpy as np
+import os
+import copy
+import json
+import hashlib
 import logging
-from typing import Dict 
+import time
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from src.cache import LRUCache
+from src.catalog import concat_jobs, encode_jobs, load_jobs
+from src.embedding_store import EmbeddingStore, content_hash, removal_order
+from src.filters import DATE_COLUMN, FACET_COLUMNS, FilterIndex
+from src.shared_index import SharedIndex
+from src.sparse_index import SPARSE_FIELDS, SparseIndex
+from src.vector_index import create_index, load_index, normalize_rows, read_meta, top_k
 
 logger = logging.getLogger(__name__)
 
+# Columns returned for each match
+MATCH_COLUMNS = ['title', 'company', 'location', 'link']
+
+RETRIEVAL_MODES = ('dense', 'hybrid')
+
+
+class CatalogSnapshot:
+    """Read-only view of the jobs a query is scored against.
+
+    Writers never modify a published snapshot; they build a new one and swap
+    it in with a single attribute assignment, so concurrent readers can
+    share a matcher without locks. With a quantized index ``embeddings`` is
+    memory-mapped or None: queries are scored from the index's own copy.
+    """
+
+    __slots__ = ('jobs_df', 'embeddings', 'index', 'sparse_index', 'filter_index',
+                 'hashes', 'id_to_row', 'version')
+
+    def __init__(self, jobs_df: pd.DataFrame, embeddings: np.ndarray, index, sparse_index: Optional[SparseIndex],
+                 filter_index: FilterIndex, hashes: List[str], id_to_row: Dict[str, int], version: int):
+        self.jobs_df = jobs_df
+        self.embeddings = embeddings
+        self.index = index
+        self.sparse_index = sparse_index
+        self.filter_index = filter_index
+        self.hashes = hashes
+        self.id_to_row = id_to_row
+        self.version = version
+
+
 class JobMatcher:
-    def __init__(self, jobs_data_path="data/jobs_clean.csv"):
+    def __init__(self, jobs_data_path="data/jobs_clean.csv",
+                 embeddings_path: Optional[str] = "data/job_embeddings",
+                 model_name: str = 'all-MiniLM-L6-v2', id_column: str = 'link',
+                 index_backend: str = 'exact', index_params: Optional[Dict] = None,
+                 index_path: Optional[str] = None,
+                 embedding_cache_size: int = 4096, result_cache_size: int = 1024,
+                 cache_ttl: Optional[float] = 3600, retrieval: str = 'dense',
+                 sparse_candidates: int = 200, fusion_weight: float = 0.7,
+                 shared_index_path: Optional[str] = None, refresh_interval: float = 1.0,
+                 extra_columns: Iterable[str] = (), model: Optional[Any] = None):
         try:
-            # Load data
-            self.jobs_df = pd.read_csv(jobs_data_path)
-            logger.info(f"Loaded {len(self.jobs_df)} jobs")
+            if retrieval not in RETRIEVAL_MODES:
+                raise ValueError(f"Unknown retrieval mode '{retrieval}', expected one of {RETRIEVAL_MODES}")
+            # Hybrid mode: keyword prefilter picks sparse_candidates jobs, SBERT reranks them
+            # with score = fusion_weight * dense + (1 - fusion_weight) * tf-idf
+            self.retrieval = retrieval
+            self.sparse_candidates = sparse_candidates
+            self.fusion_weight = fusion_weight
+            self.id_column = id_column
+            self.model_name = model_name
+            self.index_backend = index_backend
+            self.index_params = index_params or {}
+            self.index_path = index_path
+            # Only the columns serving needs are loaded; see serving_columns()
+            self.extra_columns = list(extra_columns)
+            self._snapshot = None
+            # Serializes writers only; readers go through the current snapshot
+            self._write_lock = threading.Lock()
+            
+            # Repeat queries skip the model (vectors) or the index too (results)
+            self.embedding_cache = LRUCache(embedding_cache_size, cache_ttl)
+            self.result_cache = LRUCache(result_cache_size, cache_ttl)
+            
+            # Workers can attach to an index published by a loader process
+            # instead of building their own; CURRENT is polled every refresh_interval
+            self.shared_index = SharedIndex(shared_index_path) if shared_index_path else None
+            self.refresh_interval = refresh_interval
+            self._shared_generation = 0
+            self._next_refresh = 0.0
             
-            # Initialize AI model (FREE)
-            self.sbert_model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Initialize AI model (FREE); an already loaded ``model`` (anything with
+            # encode(texts) -> vectors) can be shared instead, and skips the torch import
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(model_name)
+            self.sbert_model = model
             
-            # Precompute job embeddings
-            job_texts = (
-                self.jobs_df['title'] + " " +
-                self.jobs_df['company'] + " " +
-                self.jobs_df['location']
-            ).tolist()
+            if self.shared_index is not None:
+                self.embedding_store = None
+                self._attach_shared()
+                return
             
-            self.job_embeddings = self.sbert_model.encode(job_texts)
+            # Load data: a CSV/Parquet/Arrow path, or an already loaded frame such as JobCatalog.live_jobs()
+            columns = self.serving_columns()
+            if isinstance(jobs_data_path, pd.DataFrame):
+                jobs_df = encode_jobs(jobs_data_path[[col for col in columns if col in jobs_data_path.columns]]
+                                      .reset_index(drop=True))
+            else:
+                jobs_df = load_jobs(jobs_data_path, columns)
+            logger.info(f"Loaded {len(jobs_df)} jobs")
+            
+            # Precompute job embeddings, reusing the on-disk store when possible
+            job_texts = self._prepare_job_texts(jobs_df)
+            job_ids = self._job_ids(jobs_df)
+            job_hashes = [content_hash(text) for text in job_texts]
+            
+            if embeddings_path:
+                self.embedding_store = EmbeddingStore(embeddings_path, model_name)
+                job_embeddings = self.embedding_store.sync(job_ids, job_texts, self._encode_texts)
+            else:
+                self.embedding_store = None
+                job_embeddings = self._encode_texts(job_texts)
+            
+            # Nearest-neighbour index over the job embeddings
+            self._publish(jobs_df, job_embeddings, job_hashes, train=True)
             
         except Exception as e:
             logger.error(f"Initialization error: {str(e)}")
             raise ValueError(f"Failed to initialize JobMatcher: {str(e)}")
 
-    def match(self, resume_data: Dict, top_n: int = 5) -> pd.DataFrame:
-        """AI-powered matching using semantic similarity"""
+    def serving_columns(self) -> List[str]:
+        """Catalog columns the matcher keeps: match output, job id, filter facets, keyword fields and extras"""
+        columns = MATCH_COLUMNS + [self.id_column] + list(FACET_COLUMNS.values()) + [DATE_COLUMN]
+        if self.retrieval == 'hybrid':
+            # The keyword index also searches the description
+            columns += SPARSE_FIELDS
+        return list(dict.fromkeys(columns + self.extra_columns))
+
+    @property
+    def jobs_df(self) -> pd.DataFrame:
+        return self._snapshot.jobs_df
+
+    @property
+    def job_embeddings(self) -> np.ndarray:
+        return self._job_vectors(self._snapshot)
+
+    @property
+    def index(self):
+        return self._snapshot.index
+
+    @property
+    def version(self) -> int:
+        """Incremented every time the served job set changes"""
+        return self._snapshot.version
+
+    def publish_shared(self, root: str, keep: int = 3) -> int:
+        """Publish the current catalog as a new shared index generation for workers to attach"""
+        snapshot = self._snapshot
+        return SharedIndex(root).publish(
+            snapshot.jobs_df, self._job_vectors(snapshot), snapshot.hashes, self.model_name,
+            index=snapshot.index, fingerprint=self._index_fingerprint(snapshot.hashes), keep=keep)
+
+    def refresh_shared(self, force: bool = False) -> bool:
+        """Switch to a newer shared generation if one was published; True if switched"""
+        if self.shared_index is None:
+            return False
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return False
+        self._next_refresh = now + self.refresh_interval
+        
+        generation = self.shared_index.current_generation()
+        if generation == self._shared_generation:
+            return False
+        with self._write_lock:
+            if generation == self._shared_generation:
+                return False
+            self._attach_shared(generation)
+        return True
+
+    def _attach_shared(self, generation: Optional[int] = None) -> None:
+        """Serve a shared generation: vectors and metadata stay memory-mapped"""
+        generation, jobs_df, embeddings, meta = self.shared_index.attach(generation)
+        if meta.get('model') != self.model_name:
+            raise ValueError(f"Shared index was built with {meta.get('model')}, not {self.model_name}")
+        self._publish(jobs_df, embeddings, meta['hashes'], train=True,
+                      index_path=meta['index_path'])
+        self._shared_generation = generation
+
+    def match(self, resume_data: Dict, top_n: int = 5, filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """AI-powered matching using semantic similarity.
+
+        ``filters`` restricts the jobs that get scored, e.g.
+        ``{'remote': True, 'location': 'new york', 'source': 'LinkedIn', 'days': 7}``.
+        Invalid filters raise ValueError.
+        """
+        self.refresh_shared()
+        snapshot = self._snapshot
+        filters = snapshot.filter_index.normalize(filters)
         try:
             # Prepare resume text
             resume_text = self._prepare_resume_text(resume_data)
             
-            # AI semantic matching
-            resume_embedding = self.sbert_model.encode([resume_text])
+            # Results are only reusable against the same version of the catalog
+            result_key = (content_hash(resume_text), top_n, snapshot.version, json.dumps(filters, sort_keys=True))
+            cached = self.result_cache.get(result_key)
+            if cached is not None:
+                return cached.copy()
             
-            # Calculate cosine similarity
-            similarities = cosine_similarity(resume_embedding, self.job_embeddings)[0]
+            # AI semantic matching
+            resume_embedding = self._encode_resumes([resume_text])
             
-            # Add scores to dataframe
-            self.jobs_df['match_score'] = similarities
+            # Cosine similarity top-k from the index; nothing shared is written
+            scores, indices = self._search(snapshot, resume_embedding, [resume_text], top_n, filters)
+            found = indices[0] >= 0
             
-            # Get top matches
-            results = self.jobs_df.sort_values('match_score', ascending=False).head(top_n)
+            # Materialize only the top-k rows
+            results = snapshot.jobs_df.iloc[indices[0][found]][MATCH_COLUMNS]
+            results = results.assign(match_score=scores[0][found])
             
             logger.info(f"AI matching completed. Top score: {results['match_score'].max():.2f}")
-            return results[['title', 'company', 'location', 'link', 'match_score']]
+            self.result_cache.set(result_key, results)
+            return results.copy()
             
         except Exception as e:
             logger.error(f"Matching error: {str(e)}")
             return pd.DataFrame()
 
+    def match_many(self, resumes: List[Dict], top_n: int = 5, batch_size: int = 4096,
+                   as_records: bool = False, filters: Optional[Dict[str, Any]] = None,
+                   offset: int = 0) -> Union[Tuple[np.ndarray, np.ndarray], List[List[Dict[str, Any]]]]:
+        """Match many resumes at once.
+
+        Resumes are encoded ``batch_size`` at a time and scored against the
+        index in blocks. Returns ``(scores, indices)`` arrays of shape
+        ``(len(resumes), top_n)`` with row positions into ``jobs_df`` (-1
+        where fewer jobs exist), or per-resume lists of job dicts when
+        ``as_records`` is set. ``filters`` apply to every resume; ``offset``
+        skips that many best matches (for paging).
+        """
+        self.refresh_shared()
+        snapshot = self._snapshot
+        # Resolve the filters once for the whole run
+        rows = snapshot.filter_index.rows(filters)
+        k = min(top_n + offset, len(snapshot.jobs_df) if rows is None else len(rows))
+        scores = np.full((len(resumes), k), -np.inf, dtype=np.float32)
+        indices = np.full((len(resumes), k), -1, dtype=np.int64)
+        
+        for start in range(0, len(resumes), batch_size):
+            batch = resumes[start:start + batch_size]
+            texts = [self._prepare_resume_text(resume) for resume in batch]
+            batch_scores, batch_indices = self._search(snapshot, self._encode_resumes(texts), texts, k, rows=rows)
+            found = batch_scores.shape[1]
+            scores[start:start + len(batch), :found] = batch_scores
+            indices[start:start + len(batch), :found] = batch_indices
+        
+        logger.info(f"Batch matching completed for {len(resumes)} resumes")
+        scores, indices = scores[:, offset:], indices[:, offset:]
+        if as_records:
+            return self._records(snapshot, scores, indices)
+        return scores, indices
+
+    def _search(self, snapshot: CatalogSnapshot, vectors: np.ndarray, texts: List[str], k: int,
+                filters: Optional[Dict[str, Any]] = None,
+                rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (scores, indices) per query using the configured retrieval mode.
+
+        Filters (or pre-resolved ``rows``) narrow the catalog before scoring:
+        only the surviving rows are compared against the query.
+        """
+        if rows is None:
+            rows = snapshot.filter_index.rows(filters)
+        
+        if self.retrieval == 'dense' or snapshot.sparse_index is None:
+            if rows is None:
+                return snapshot.index.search(vectors, k)
+            return snapshot.index.subset_search(vectors, rows, k)
+        
+        k = min(k, len(snapshot.jobs_df) if rows is None else len(rows))
+        allowed = None
+        if rows is not None:
+            allowed = np.zeros(len(snapshot.jobs_df), dtype=bool)
+            allowed[rows] = True
+        scores = np.full((len(texts), k), -np.inf, dtype=np.float32)
+        indices = np.full((len(texts), k), -1, dtype=np.int64)
+        for row, (vector, text) in enumerate(zip(vectors, texts)):
+            found_scores, found = self._hybrid_search(snapshot, vector, text, k, rows, allowed)
+            scores[row, :len(found)] = found_scores
+            indices[row, :len(found)] = found
+        return scores, indices
+
+    def _hybrid_search(self, snapshot: CatalogSnapshot, vector: np.ndarray, text: str, k: int,
+                       rows: Optional[np.ndarray] = None,
+                       allowed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Keyword candidates from the inverted index, reranked by dense similarity"""
+        sparse_scores, candidates = snapshot.sparse_index.search(text, max(self.sparse_candidates, k))
+        if allowed is not None:
+            keep = allowed[candidates]
+            sparse_scores, candidates = sparse_scores[keep], candidates[keep]
+        
+        if len(candidates) < k:
+            # Too few keyword hits: top the pool up from the dense index
+            if rows is None:
+                _, dense_rows = snapshot.index.search(vector, k)
+            else:
+                _, dense_rows = snapshot.index.subset_search(vector, rows, k)
+            extra = np.setdiff1d(dense_rows[0][dense_rows[0] >= 0], candidates)
+            candidates = np.concatenate([candidates, extra])
+            sparse_scores = np.concatenate([sparse_scores, np.zeros(len(extra), dtype=np.float32)])
+        if not len(candidates):
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        
+        # Candidates are scored from the index's stored vectors, quantized or not
+        candidate_vectors = normalize_rows(snapshot.index.row_vectors(candidates))
+        dense_scores = candidate_vectors @ normalize_rows(vector[None, :])[0]
+        fused = self.fusion_weight * dense_scores + (1 - self.fusion_weight) * sparse_scores
+        best_scores, best = top_k(fused[None, :], k)
+        return best_scores[0], candidates[best[0]]
+
+    def _records(self, snapshot: CatalogSnapshot, scores: np.ndarray,
+                 indices: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """Turn top-k arrays into job dicts, gathering each column once"""
+        flat = indices.ravel()
+        valid = flat >= 0
+        gather = np.where(valid, flat, 0)
+        columns = {}
+        for col in MATCH_COLUMNS:
+            values = snapshot.jobs_df[col].iloc[gather]
+            # Missing values become None so the records serialize as valid JSON
+            columns[col] = values.astype(object).where(values.notna(), None).tolist()
+        flat_scores = scores.ravel().tolist()
+        
+        records, width = [], indices.shape[1]
+        for row in range(indices.shape[0]):
+            jobs = []
+            for pos in range(row * width, (row + 1) * width):
+                if not valid[pos]:
+                    break
+                job = {col: values[pos] for col, values in columns.items()}
+                job['match_score'] = flat_scores[pos]
+                jobs.append(job)
+            records.append(jobs)
+        return records
+
+    def add_jobs(self, jobs: pd.DataFrame) -> int:
+        """Append new postings, encoding only the added rows"""
+        self._check_writable()
+        jobs = self._validate_jobs(jobs)
+        new_ids = self._job_ids(jobs)
+        
+        with self._write_lock:
+            snapshot = self._snapshot
+            existing = [job_id for job_id in new_ids if job_id in snapshot.id_to_row]
+            if existing:
+                raise ValueError(f"{len(existing)} job ids already indexed, use update_jobs: {existing[:3]}")
+            if not new_ids:
+                return 0
+            
+            texts = self._prepare_job_texts(jobs)
+            vectors = self._encode_texts(texts)
+            
+            jobs_df = concat_jobs(snapshot.jobs_df, jobs)
+            new_hashes = [content_hash(text) for text in texts]
+            hashes = snapshot.hashes + new_hashes
+            if self.embedding_store is not None:
+                # Only the new rows are written; the store's mapping stays the backing array
+                embeddings = self.embedding_store.append(vectors, new_ids, new_hashes)
+            elif len(snapshot.hashes):
+                embeddings = np.vstack([self._job_vectors(snapshot), vectors])
+            else:
+                embeddings = vectors
+            self._publish(jobs_df, embeddings, hashes)
+        
+        logger.info(f"Added {len(new_ids)} jobs, index now holds {len(jobs_df)}")
+        return len(new_ids)
+
+    def update_jobs(self, jobs: pd.DataFrame) -> int:
+        """Overwrite existing postings, re-encoding only rows whose text changed"""
+        self._check_writable()
+        jobs = self._validate_jobs(jobs)
+        ids = self._job_ids(jobs)
+        
+        with self._write_lock:
+            snapshot = self._snapshot
+            unknown = [job_id for job_id in ids if job_id not in snapshot.id_to_row]
+            if unknown:
+                raise ValueError(f"{len(unknown)} job ids are not indexed, use add_jobs: {unknown[:3]}")
+            if not ids:
+                return 0
+            
+            rows = np.array([snapshot.id_to_row[job_id] for job_id in ids], dtype=np.int64)
+            texts = self._prepare_job_texts(jobs)
+            new_hashes = [content_hash(text) for text in texts]
+            changed = [i for i, h in enumerate(new_hashes) if h != snapshot.hashes[rows[i]]]
+            
+            # Copy-on-write: metadata is overwritten for every row, vectors only where the text changed
+            jobs_df = snapshot.jobs_df.copy()
+            for col in jobs.columns:
+                if col in jobs_df.columns and isinstance(jobs_df[col].dtype, pd.CategoricalDtype):
+                    new = pd.Index(jobs[col].dropna().unique()).difference(jobs_df[col].cat.categories)
+                    jobs_df[col] = jobs_df[col].cat.add_categories(new)
+                jobs_df.loc[rows, col] = jobs[col].to_numpy()
+            
+            embeddings, hashes = self._job_vectors(snapshot), snapshot.hashes
+            if changed:
+                vectors = self._encode_texts([texts[i] for i in changed])
+                hashes = list(hashes)
+                for i in changed:
+                    hashes[rows[i]] = new_hashes[i]
+                if self.embedding_store is not None:
+                    embeddings = self.embedding_store.patch(rows[changed], vectors,
+                                                            [new_hashes[i] for i in changed])
+                else:
+                    embeddings = np.array(embeddings)
+                    embeddings[rows[changed]] = vectors
+            self._publish(jobs_df, embeddings, hashes)
+        
+        logger.info(f"Updated {len(ids)} jobs ({len(changed)} re-encoded)")
+        return len(changed)
+
+    def remove_jobs(self, ids: Iterable[str]) -> int:
+        """Drop postings by job id, ignoring ids that are not indexed.
+
+        The last postings take the removed ones' rows, so row positions change.
+        """
+        self._check_writable()
+        ids = [str(job_id) for job_id in ids]
+        
+        with self._write_lock:
+            snapshot = self._snapshot
+            rows = sorted({snapshot.id_to_row[job_id] for job_id in ids if job_id in snapshot.id_to_row})
+            if not rows:
+                return 0
+            
+            # The last rows move into the removed slots, so the store moves len(rows) vectors
+            if self.embedding_store is not None:
+                embeddings, order = self.embedding_store.remove(rows)
+            else:
+                order = removal_order(len(snapshot.hashes), rows)
+                embeddings = np.asarray(self._job_vectors(snapshot))[order]
+            
+            jobs_df = snapshot.jobs_df.iloc[order].reset_index(drop=True)
+            hashes = [snapshot.hashes[row] for row in order.tolist()]
+            self._publish(jobs_df, embeddings, hashes)
+        
+        logger.info(f"Removed {len(rows)} jobs, index now holds {len(jobs_df)}")
+        return len(rows)
+
+    def _check_writable(self) -> None:
+        if self.shared_index is not None:
+            raise RuntimeError("JobMatcher is attached to a shared index; publish a new generation instead")
+
+    def _validate_jobs(self, jobs: pd.DataFrame) -> pd.DataFrame:
+        """Check an incoming batch has the columns and unique ids we need"""
+        missing = [col for col in ('title', 'company', 'location', self.id_column) if col not in jobs.columns]
+        if missing:
+            raise ValueError(f"Job batch is missing columns: {missing}")
+        
+        jobs = jobs[[col for col in self.serving_columns() if col in jobs.columns]].reset_index(drop=True)
+        if jobs[self.id_column].duplicated().any():
+            raise ValueError("Job batch contains duplicate job ids")
+        return encode_jobs(jobs)
+
+    def _publish(self, jobs_df: pd.DataFrame, embeddings: np.ndarray, hashes: List[str],
+                 train: bool = False, index_path: Optional[str] = None) -> None:
+        """Build a new snapshot (index included) and make it the one queries see.
+
+        Writers update the embedding store themselves before publishing.
+        """
+        job_ids = self._job_ids(jobs_df)
+        id_to_row = {job_id: row for row, job_id in enumerate(job_ids)}
+        if len(id_to_row) != len(job_ids):
+            logger.warning("Duplicate job ids in catalog; updates will target the last occurrence")
+        
+        previous = self._snapshot
+        index = self._build_index(embeddings, hashes, None if previous is None else previous.index, train,
+                                  index_path)
+        if getattr(index, 'precision', 'float32') != 'float32':
+            embeddings = self._mapped_embeddings(embeddings, hashes)
+        sparse_index = SparseIndex().build(jobs_df) if self.retrieval == 'hybrid' else None
+        filter_index = FilterIndex().build(jobs_df)
+        version = 0 if previous is None else previous.version + 1
+        self._snapshot = CatalogSnapshot(jobs_df, embeddings, index, sparse_index, filter_index,
+                                         hashes, id_to_row, version)
+
+    def _mapped_embeddings(self, embeddings: np.ndarray, hashes: List[str]) -> Optional[np.ndarray]:
+        """The float32 vectors to keep beside a quantized index: a memory map or nothing.
+
+        Queries are scored from the index's codes, so the full-precision
+        matrix would only be resident memory. The store's mapping is kept
+        for writers instead; without a store they widen the codes.
+        """
+        if isinstance(embeddings, np.memmap):
+            return embeddings
+        stored = None if self.embedding_store is None else self.embedding_store.load()
+        if stored is not None and stored[2] == hashes:
+            return stored[0]
+        return None
+
+    def _job_vectors(self, snapshot: CatalogSnapshot) -> np.ndarray:
+        """float32 vectors of every job in ``snapshot``, for writers and publishing"""
+        if snapshot.embeddings is not None:
+            return snapshot.embeddings
+        # Re-quantizing widened codes gives the same codes back, so updates don't drift
+        return normalize_rows(snapshot.index.row_vectors(np.arange(len(snapshot.hashes))))
+
+    def _build_index(self, embeddings: np.ndarray, hashes: List[str], previous=None, train: bool = True,
+                     index_path: Optional[str] = None):
+        """Build the search index, loading a saved one if it matches the catalog.
+
+        ``train=False`` keeps the quantizer of ``previous`` (an IVF index) and
+        only reassigns vectors, which is what incremental updates want.
+        ``index_path`` is a read-only location to try before ``self.index_path``.
+        """
+        fingerprint = self._index_fingerprint(hashes)
+        load_path = index_path or self.index_path
+        
+        if train and load_path and os.path.exists(os.path.join(load_path, 'index.json')):
+            try:
+                meta = read_meta(load_path)
+                if (meta.get('backend') == self.index_backend and meta.get('fingerprint') == fingerprint
+                        and meta.get('precision', 'float32') == self.index_params.get('precision', 'float32')):
+                    index = load_index(load_path, embeddings)
+                    # Query-time knobs may differ from the saved ones
+                    if 'n_probe' in self.index_params:
+                        index.n_probe = self.index_params['n_probe']
+                    logger.info(f"Loaded {self.index_backend} index from {load_path}")
+                    return index
+            except Exception as e:
+                logger.warning(f"Could not load index from {load_path}: {e}")
+        
+        if train or previous is None:
+            index = create_index(self.index_backend, **self.index_params)
+        else:
+            # Shallow copy: build() rebinds its arrays, so the live index is untouched
+            index = copy.copy(previous)
+        index.build(embeddings, train=train)
+        
+        if self.index_path:
+            index.save(self.index_path, fingerprint)
+        return index
+
+    def _index_fingerprint(self, hashes: List[str]) -> str:
+        """Identify the exact set of job vectors an index was built from"""
+        digest = hashlib.sha1(self.model_name.encode('utf-8'))
+        for job_hash in hashes:
+            digest.update(job_hash.encode('ascii'))
+        return digest.hexdigest()
+
     def _prepare_resume_text(self, resume_data: Dict) -> str:
         """Combine resume data for AI processing"""
         skills_text = " ".join(resume_data.get('skills', []))
         experience = resume_data.get('experience', '')
         education = resume_data.get('education', '')
         
-        return f"{skills_text} {experience} {education}".strip()
\ No newline at end of file
+        return f"{skills_text} {experience} {education}".strip()
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters of the query caches"""
+        return {'embeddings': self.embedding_cache.stats(), 'results': self.result_cache.stats()}
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Unit-length sentence embeddings of ``texts`` (cached), for reuse outside matching"""
+        return self._encode_resumes(texts)
+
+    def _encode_resumes(self, texts: List[str]) -> np.ndarray:
+        """Encode resume texts, running the model only for texts not in the cache"""
+        keys = [content_hash(text) for text in texts]
+        vectors = [self.embedding_cache.get(key) for key in keys]
+        
+        # One model call for all misses, each distinct text encoded once
+        missing = {keys[i]: i for i, vector in enumerate(vectors) if vector is None}
+        if missing:
+            encoded = dict(zip(missing, self._encode_texts([texts[i] for i in missing.values()])))
+            for key, vector in encoded.items():
+                vector.setflags(write=False)
+                self.embedding_cache.set(key, vector)
+            vectors = [encoded[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+        
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def _prepare_job_texts(self, jobs_df: pd.DataFrame) -> List[str]:
+        """Combine job fields into the text that gets embedded"""
+        fields = jobs_df[['title', 'company', 'location']].fillna('').astype(str)
+        return (fields['title'] + " " + fields['company'] + " " + fields['location']).tolist()
+
+    def _job_ids(self, jobs_df: pd.DataFrame) -> List[str]:
+        """Stable per-row job ids (the posting link by default)"""
+        return jobs_df[self.id_column].fillna('').astype(str).tolist()
+
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the sentence model as unit-length float32 vectors"""
+        return normalize_rows(self.sbert_model.encode(texts))
@@ -0,0 +1,179 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+import openai
+
+from src.rate_limit import TokenBucket, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+# Failures worth another attempt; anything else (bad request, auth) is raised at once
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError,
+                    openai.InternalServerError)
+
+
+class LLMUnavailable(Exception):
+    """The rate limit or concurrency cap could not admit the call in time"""
+
+
+class LLMClient:
+    """Chat-completion client with the limits a shared web backend needs.
+
+    - one pooled HTTP client (``max_connections``) with connect/read timeouts
+    - at most ``max_concurrency`` calls in flight per process
+    - a token bucket of ``rate_per_second`` calls (bursts up to ``burst``)
+    - retries of rate-limit, timeout, connection and 5xx errors with jittered
+      exponential backoff, honouring ``Retry-After``
+    - single-flight: identical requests made while one is in flight wait for
+      its result instead of calling the API again
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, max_connections: int = 16,
+                 max_concurrency: int = 8, rate_per_second: float = 5.0, burst: Optional[float] = None,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0, max_retries: int = 3,
+                 acquire_timeout: float = 30.0):
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+        # Retries are handled here so they share the rate limit and backoff
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client,
+                                    max_retries=0)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.acquire_timeout = acquire_timeout
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.counters = {'calls': 0, 'coalesced': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+
+    def complete(self, params: Dict[str, Any]) -> str:
+        """Content of a chat completion for ``params`` (model, messages, ...)"""
+        key = self._request_key(params)
+        future, leader = self._join_flight(key)
+        if not leader:
+            return future.result()
+        try:
+            response = self._call(params)
+            content = response.choices[0].message.content
+            future.set_result(content)
+            return content
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._leave_flight(key)
+
+    def stream(self, params: Dict[str, Any]) -> Iterator[str]:
+        """Yield the completion in chunks; a coalesced caller gets the leader's text in one chunk"""
+        key = self._request_key(params)
+        future, leader = self._join_flight(key)
+        if not leader:
+            yield future.result()
+            return
+        chunks, response = [], None
+        try:
+            response = self._call(params, stream=True)
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            future.set_result("".join(chunks))
+        except GeneratorExit:
+            # Consumer stopped early: followers must not wait forever
+            future.set_exception(LLMUnavailable("Leading request was abandoned"))
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if response is not None:
+                response.close()
+            self._leave_flight(key)
+
+    def _call(self, params: Dict[str, Any], stream: bool = False):
+        """One API call under the concurrency cap and rate limit, retried on transient errors"""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self._count('rejected')
+            raise LLMUnavailable(f"All {self.max_concurrency} LLM slots busy")
+        handed_off = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                if not self.bucket.acquire(timeout=self.acquire_timeout):
+                    self._count('rejected')
+                    raise LLMUnavailable("LLM rate limit exceeded")
+                self._count('calls')
+                try:
+                    # With stream=True the status is checked before returning,
+                    # so rate limits and 5xx on a stream are retried here too
+                    response = self.client.chat.completions.create(**params, stream=stream)
+                except RETRYABLE_ERRORS as e:
+                    if attempt == self.max_retries:
+                        self._count('failures')
+                        raise
+                    delay = max(backoff_delay(attempt), self._retry_after(e))
+                    self._count('retries')
+                    logger.warning(f"LLM call failed ({type(e).__name__}), retry {attempt + 1} in {delay:.2f}s")
+                    time.sleep(delay)
+                    continue
+                if not stream:
+                    return response
+                # The slot stays taken until the stream is consumed or closed
+                handed_off = True
+                return self._iterate(response)
+        finally:
+            if not handed_off:
+                self._slots.release()
+        raise AssertionError("unreachable")
+
+    def _iterate(self, response) -> Iterator:
+        """Yield stream chunks, releasing the concurrency slot when the stream ends"""
+        try:
+            yield from response
+        finally:
+            response.close()
+            self._slots.release()
+
+    def _join_flight(self, key: str):
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._count('coalesced')
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            return future, True
+
+    def _leave_flight(self, key: str) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    @staticmethod
+    def _request_key(params: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _retry_after(error: Exception) -> float:
+        response = getattr(error, 'response', None)
+        try:
+            return float(response.headers.get('retry-after', 0)) if response is not None else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _count(self, name: str) -> None:
+        with self.stats_lock:
+            self.counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            return dict(self.counters, in_flight=len(self._in_flight), max_concurrency=self.max_concurrency)
+
+    def close(self) -> None:
+        self.http_client.close()
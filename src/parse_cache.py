@@ -0,0 +1,184 @@
+import os
+import copy
+import json
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+from src.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+HASH_CHUNK_BYTES = 1 << 16
+
+# The disk tier is pruned (expired entries, then the oldest past the cap) every this many writes
+PRUNE_EVERY = 100
+
+
+def content_key(data: Union[bytes, BinaryIO], version: str) -> str:
+    """Cache key of a document: parser version plus the SHA-256 of its bytes.
+
+    A stream is hashed in chunks and rewound, ready to be parsed.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        digest = hashlib.sha256(data)
+    else:
+        digest = hashlib.sha256()
+        start = data.tell()
+        for chunk in iter(lambda: data.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+        data.seek(start)
+    return f"v{version}-{digest.hexdigest()}"
+
+
+class ParseCache:
+    """Parse results keyed by document content, in memory and optionally on disk.
+
+    The key is the SHA-256 of the uploaded bytes plus the parser version, so
+    re-uploads of the same file skip extraction entirely and a parser change
+    (bump ``PARSER_VERSION``) invalidates every old entry. The disk store keeps
+    one JSON file per key under ``disk_path`` and survives restarts; it is
+    shared by every worker pointed at the same directory.
+
+    Parse results are personal data (names, emails, phone numbers, work
+    history). A disk entry is kept for at most ``disk_ttl`` seconds after it
+    was written and the store holds at most ``disk_max_entries`` files, the
+    oldest going first; pruning runs on start-up and every ``PRUNE_EVERY``
+    writes. Deleting ``disk_path`` erases everything immediately.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = None, disk_path: Optional[str] = None,
+                 disk_max_entries: int = 10000, disk_ttl: Optional[float] = 7 * 24 * 3600):
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.disk_ttl = disk_ttl
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_pruned = 0
+        self._writes = 0
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+            self.prune()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for ``key`` (a copy, safe to modify) or None"""
+        result = self.memory.get(key)
+        if result is None and self.disk_path:
+            result = self._disk_get(key)
+            if result is not None:
+                self.memory.set(key, result)
+        return copy.deepcopy(result) if result is not None else None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a successful parse; error results are not cached"""
+        if 'error' in result:
+            return
+        result = copy.deepcopy(result)
+        self.memory.set(key, result)
+        if self.disk_path:
+            self._disk_set(key, result)
+
+    def _file(self, key: str) -> str:
+        digest = key.rsplit('-', 1)[-1]
+        return os.path.join(self.disk_path, digest[:2], f"{key}.json")
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._file(key)
+        try:
+            if self._expired(os.path.getmtime(path), time.time()):
+                self._remove(path)
+                raise FileNotFoundError(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (FileNotFoundError, ValueError):
+            result = None
+        with self._lock:
+            if result is None:
+                self.disk_misses += 1
+            else:
+                self.disk_hits += 1
+        return result
+
+    def _disk_set(self, key: str, result: Dict[str, Any]) -> None:
+        path = self._file(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write parse cache entry {key}: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            due = self._writes % PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete expired disk entries, then the oldest beyond ``disk_max_entries``; returns the count"""
+        if not self.disk_path or not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            now = time.time()
+            entries, removed = [], 0
+            for shard in os.scandir(self.disk_path):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if not entry.name.endswith('.json'):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+                    if self._expired(mtime, now):
+                        removed += self._remove(entry.path)
+                    else:
+                        entries.append((mtime, entry.path))
+            if len(entries) > self.disk_max_entries:
+                entries.sort()
+                for _, path in entries[:len(entries) - self.disk_max_entries]:
+                    removed += self._remove(path)
+        except OSError as e:
+            logger.warning(f"Could not prune parse cache {self.disk_path}: {e}")
+        finally:
+            self._prune_lock.release()
+        if removed:
+            logger.info(f"Pruned {removed} parse cache entries from {self.disk_path}")
+            with self._lock:
+                self.disk_pruned += removed
+        return removed
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.disk_ttl is not None and now - mtime > self.disk_ttl
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of both tiers for monitoring"""
+        stats = {'memory': self.memory.stats()}
+        if self.disk_path:
+            with self._lock:
+                lookups = self.disk_hits + self.disk_misses
+                stats['disk'] = {
+                    'path': self.disk_path,
+                    'hits': self.disk_hits,
+                    'misses': self.disk_misses,
+                    'hit_rate': self.disk_hits / lookups if lookups else 0.0,
+                    'pruned': self.disk_pruned,
+                }
+        return stats
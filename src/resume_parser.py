@@ -1,28 +1,150 @@
+import io
 import os
 import logging
-from typing import Dict, List, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Any, Optional, Union
 import re
 import pdfplumber
 import docx
+import shutil
 import tempfile
 
+from src.skill_extractor import get_skill_extractor
+
 logger = logging.getLogger(__name__)
 
+# Canonical section -> header spellings recognised at the start of a line
+SECTION_HEADERS = {
+    'summary': ['summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about me'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'internships'],
+    'education': ['education', 'academic background', 'academics', 'qualifications',
+                  'educational qualifications'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'competencies',
+               'technologies', 'tech stack', 'tools'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'licenses and certifications'],
+    'awards': ['awards', 'honors', 'honours', 'achievements', 'accomplishments'],
+    'publications': ['publications', 'research'],
+    'languages': ['languages'],
+    'interests': ['interests', 'hobbies'],
+    'references': ['references'],
+}
+_HEADER_TO_SECTION = {alias: section for section, aliases in SECTION_HEADERS.items() for alias in aliases}
+
+# A header line is a known heading, optionally decorated ("## Skills", "SKILLS:"), either
+# alone on its line or followed by ":", "-" or "|" and inline content ("Skills: Python, SQL").
+# Compiled once; applied to one line at a time with no backtracking across lines.
+SECTION_HEADER_RE = re.compile(
+    r'^[\s#*>•\-]*(' + '|'.join(sorted(map(re.escape, _HEADER_TO_SECTION), key=len, reverse=True)) +
+    r')[\s*]*(?:$|[:|\-\u2013\u2014][ \t]*(?P<inline>.*)$)',
+    re.IGNORECASE)
+
+# A resume given as a path, raw bytes, or a readable binary stream (e.g. a Werkzeug upload)
+ResumeSource = Union[str, os.PathLike, bytes, BinaryIO]
+
+# Bytes inspected to detect the document format
+SNIFF_BYTES = 1024
+
+# Bump whenever a change alters parse output, so cached results are not reused
+PARSER_VERSION = '4'
+
+# Extraction cutoffs: a resume past these is truncated rather than read in full
+DEFAULT_MAX_PAGES = 30
+DEFAULT_MAX_CHARS = 100_000
+
+# Pages per task when a large PDF is fanned out over the PDF process pool
+PDF_PAGES_PER_TASK = 4
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by every parser in this process, created on first use"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                _pdf_pool = ProcessPoolExecutor(max_workers=workers)
+    return _pdf_pool
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF; runs in the PDF pool workers"""
+    texts = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            texts.append(page.extract_text() or "")
+            # Drop the page's parsed layout objects as soon as its text is out
+            page.close()
+    return texts
+
+
+def _seekable(source: ResumeSource) -> ResumeSource:
+    """Paths as given; bytes and one-pass streams (e.g. a socket-backed upload) as a seekable stream"""
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if not source.seekable():
+        return io.BytesIO(source.read())
+    return source
+
+
+def detect_format(head: bytes) -> str:
+    """Document format from its leading bytes: 'pdf', 'docx' or 'text'"""
+    # PDF readers accept the header anywhere in the first 1024 bytes
+    if b'%PDF-' in head[:SNIFF_BYTES]:
+        return 'pdf'
+    # DOCX is a ZIP container
+    if head.startswith(b'PK\x03\x04'):
+        return 'docx'
+    return 'text'
+
+
 class UltimateResumeParser:
-    def __init__(self):
+    def __init__(self, skills_path: str = None, max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+                 max_chars: Optional[int] = DEFAULT_MAX_CHARS, pdf_workers: int = 0,
+                 parallel_min_pages: int = 12):
+        """
+        Args:
+            skills_path: skill taxonomy CSV (defaults to data/skills_taxonomy.csv)
+            max_pages: PDF pages read per document (None reads them all)
+            max_chars: characters of text kept per document (None keeps everything)
+            pdf_workers: size of the process pool PDF pages are extracted on (0 = in process)
+            parallel_min_pages: PDFs with at least this many pages use the pool
+        """
+        # Compiled once per process and shared by every parser instance
+        self.skill_extractor = get_skill_extractor(skills_path)
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.pdf_workers = pdf_workers
+        self.parallel_min_pages = parallel_min_pages
+        # Identifies parse output for caching: the code version, the skill taxonomy and the limits
+        self.version = f"{PARSER_VERSION}.{self.skill_extractor.fingerprint}.{max_pages}.{max_chars}"
         logger.info("Resume Parser initialized successfully")
 
-    def parse(self, file_path: str) -> Dict[str, Any]:
+    def parse(self, source: ResumeSource, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Parse a resume given as a path, bytes or binary stream.
+
+        The format comes from the content (magic bytes), not the file name, so
+        uploads can be parsed straight from memory without saving them first.
+        """
         try:
             # Extract text from file
-            text = self._extract_text_from_file(file_path)
+            text = self._extract_text(source)
             
             if not text or not text.strip():
                 return {"error": "Empty file or no text could be extracted"}
             
             # Parse the text
             result = self._parse_text(text)
-            result["file"] = os.path.basename(file_path)
+            if filename is None and isinstance(source, (str, os.PathLike)):
+                filename = os.path.basename(source)
+            result["file"] = filename or ""
             result["text_length"] = len(text)
             
             logger.info(f"Successfully parsed resume: {result.get('name', 'Unknown')}")
@@ -32,60 +154,136 @@ class UltimateResumeParser:
             logger.error(f"Parsing error: {str(e)}")
             return {"error": f"Failed to process resume: {str(e)}"}
 
-    def _extract_text_from_file(self, file_path: str) -> str:
-        """Extract text from PDF, DOCX, or TXT files"""
+    def _extract_text(self, source: ResumeSource) -> str:
+        """Extract text from PDF, DOCX, or TXT content"""
         text = ""
+        source = _seekable(source)
+        # A stream is read from where the caller left it, not from byte 0
+        start = None
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                file_format = detect_format(f.read(SNIFF_BYTES))
+        else:
+            start = source.tell()
+            file_format = detect_format(source.read(SNIFF_BYTES))
+            source.seek(start)
         
         try:
-            if file_path.lower().endswith('.pdf'):
-                text = self._extract_from_pdf(file_path)
-            elif file_path.lower().endswith('.docx'):
-                text = self._extract_from_docx(file_path)
+            if file_format == 'pdf':
+                text = self._extract_from_pdf(source)
+            elif file_format == 'docx':
+                text = self._extract_from_docx(source)
             else:
-                text = self._extract_from_text(file_path)
+                text = self._extract_from_text(source)
         except Exception as e:
             logger.error(f"Text extraction failed: {e}")
             # Fallback: try reading as text file
-            text = self._extract_from_text(file_path)
+            if start is not None:
+                source.seek(start)
+            text = self._extract_from_text(source)
         
         return text
 
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF using pdfplumber"""
-        text = ""
+    def _extract_from_pdf(self, source: ResumeSource) -> str:
+        """Extract text from PDF using pdfplumber, up to max_pages/max_chars"""
+        pages = []
+        remaining = self.max_chars
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            for page_text in self.iter_pdf_pages(source):
+                if remaining is not None:
+                    page_text = page_text[:remaining]
+                    remaining -= len(page_text)
+                pages.append(page_text)
+                if remaining is not None and remaining <= 0:
+                    break
         except Exception as e:
             logger.error(f"PDF extraction failed: {e}")
             raise
-        return text
+        return "".join(pages)
 
-    def _extract_from_docx(self, file_path: str) -> str:
+    def iter_pdf_pages(self, source: ResumeSource) -> Iterator[str]:
+        """Yield the text of each PDF page (newline-terminated) in order, one page at a time.
+
+        Pages beyond ``max_pages`` are never opened. When a process pool is
+        configured and the document is long enough, pages are extracted in
+        parallel and still yielded in order; closing the generator early
+        cancels the pages not yet started.
+        """
+        source = _seekable(source)
+        start = None if isinstance(source, (str, os.PathLike)) else source.tell()
+        with pdfplumber.open(source) as pdf:
+            n_pages = len(pdf.pages)
+            if self.max_pages is not None:
+                n_pages = min(n_pages, self.max_pages)
+            parallel = self.pdf_workers > 0 and n_pages >= self.parallel_min_pages
+            if not parallel:
+                for page in pdf.pages[:n_pages]:
+                    page_text = page.extract_text()
+                    page.close()
+                    if page_text:
+                        yield page_text + "\n"
+                return
+
+        # Pool workers open the PDF by path; only documents long enough to be
+        # fanned out are spilled to a temporary file when they came from memory
+        tmp_path = None
+        if isinstance(source, (str, os.PathLike)):
+            file_path = source
+        else:
+            source.seek(start)
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+                shutil.copyfileobj(source, f)
+                file_path = tmp_path = f.name
+        try:
+            pool = _get_pdf_pool(self.pdf_workers)
+            starts = range(0, n_pages, PDF_PAGES_PER_TASK)
+            stops = [min(start + PDF_PAGES_PER_TASK, n_pages) for start in starts]
+            for texts in pool.map(_extract_pdf_pages, [file_path] * len(starts), starts, stops):
+                for page_text in texts:
+                    if page_text:
+                        yield page_text + "\n"
+        finally:
+            if tmp_path:
+                os.unlink(tmp_path)
+
+    def _extract_from_docx(self, source: ResumeSource) -> str:
         """Extract text from DOCX using python-docx"""
         text = ""
         try:
-            doc = docx.Document(file_path)
+            doc = docx.Document(source)
             text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            if self.max_chars is not None:
+                text = text[:self.max_chars]
         except Exception as e:
             logger.error(f"DOCX extraction failed: {e}")
             raise
         return text
 
-    def _extract_from_text(self, file_path: str) -> str:
+    def _extract_from_text(self, source: ResumeSource) -> str:
         """Extract text from plain text file"""
+        size = -1 if self.max_chars is None else self.max_chars
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+            if not isinstance(source, (str, os.PathLike)):
+                # Wrap rather than read all bytes, so only max_chars are decoded;
+                # detach so the caller's stream is not closed with the wrapper
+                reader = io.TextIOWrapper(source, encoding='utf-8', errors='ignore')
+                try:
+                    return reader.read(size)
+                finally:
+                    reader.detach()
+            with open(source, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(size)
         except Exception as e:
             logger.error(f"Text file reading failed: {e}")
             return ""
 
     def _parse_text(self, text: str) -> Dict[str, Any]:
         """Parse resume text to extract information using advanced regex"""
+        # Skills and sections use the raw text: cleaning drops the "#" in "C#"
+        # and collapses the line breaks that delimit section headers
+        sections = self.segment_sections(text)
+        skills = self._extract_skills(text, sections.get('skills', ''))
+
         # Clean the text
         text = self._clean_text(text)
         
@@ -93,9 +291,10 @@ class UltimateResumeParser:
             "name": self._extract_name(text),
             "email": self._extract_email(text),
             "phone": self._extract_phone(text),
-            "skills": self._extract_skills(text),
-            "experience": self._extract_section(text, 'experience'),
-            "education": self._extract_section(text, 'education'),
+            "skills": skills,
+            "experience": sections.get('experience', ''),
+            "education": sections.get('education', ''),
+            "sections": sections,
             "raw_text": text[:500] + "..." if len(text) > 500 else text  # Store first 500 chars for debugging
         }
         
@@ -144,64 +343,38 @@ class UltimateResumeParser:
                 return match.group(0)
         return ""
 
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills from text"""
-        skills = set()
-        
-        # Common tech skills
-        tech_skills = [
-            'python', 'java', 'javascript', 'typescript', 'html', 'css', 
-            'react', 'angular', 'vue', 'node', 'express', 'django', 'flask',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'aws', 'azure', 'gcp',
-            'docker', 'kubernetes', 'machine learning', 'data analysis',
-            'tensorflow', 'pytorch', 'pandas', 'numpy', 'git', 'linux',
-            'c++', 'c#', 'php', 'ruby', 'swift', 'kotlin', 'go', 'rust',
-            'data science', 'ai', 'artificial intelligence', 'deep learning',
-            'big data', 'hadoop', 'spark', 'tableau', 'power bi', 'excel'
-        ]
-        
-        # Extract skills mentioned in the text
-        for skill in tech_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text.lower()):
-                skills.add(skill.title())
-        
-        # Extract from skills section
-        skills_section = self._extract_section_text(text, 'skills')
-        if skills_section:
-            for skill in tech_skills:
-                if skill in skills_section.lower():
-                    skills.add(skill.title())
-        
-        # Extract capitalized tech terms
-        capitalized_skills = re.findall(r'\b[A-Z][a-z]+\b', text)
-        for word in capitalized_skills:
-            if word.lower() in tech_skills:
-                skills.add(word)
-        
-        return sorted(list(skills))
-
-    def _extract_section(self, text: str, section_name: str) -> str:
-        """Extract content from a specific section"""
-        section_text = self._extract_section_text(text, section_name)
-        if section_text:
-            # Return first 200 characters of the section
-            return section_text[:200] + "..." if len(section_text) > 200 else section_text
-        return ""
+    def _extract_skills(self, text: str, skills_section: str = '') -> List[str]:
+        """Extract skills from text in one pass over the taxonomy trie.
 
-    def _extract_section_text(self, text: str, section_name: str) -> str:
-        """Extract text from a specific section using multiple patterns"""
-        patterns = [
-            rf'(?i){section_name}[:\s]*(.*?)(?=\n\s*\n|\n[A-Z]|\n\w+:|$)',
-            rf'(?i){section_name}[:\s]*(.*?)(?=\n[A-Z][a-z]+\s*:|$)',
-            rf'(?i){section_name}\s*\\n(.*?)(?=\\n\\n|\\n[A-Z]|$)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        The skills section is a list by definition, so ambiguous names
+        ("R", "Go") found there need no other context.
+        """
+        skills = set(self.skill_extractor.extract(text))
+        skills.update(self.skill_extractor.extract(skills_section, listed=True))
+        return sorted(skills)
+
+    def segment_sections(self, text: str) -> Dict[str, str]:
+        """Split raw resume text into {section: full text} in a single pass over its lines"""
+        sections = {}
+        current, lines = None, []
+
+        def close():
+            if current is not None:
+                body = "\n".join(line for line in lines if line)
+                # A heading that repeats (two "Experience" blocks) appends to the section
+                sections[current] = f"{sections[current]}\n{body}".strip() if current in sections else body
+
+        for line in text.splitlines():
+            line = line.strip()
+            match = SECTION_HEADER_RE.match(line) if line else None
             if match:
-                return match.group(1).strip()
-        
-        return ""
+                close()
+                current = _HEADER_TO_SECTION[match.group(1).lower()]
+                lines = [match.group('inline').strip()] if match.group('inline') else []
+            elif current is not None:
+                lines.append(line)
+        close()
+        return sections
 
 # Test function
 def test_parser():
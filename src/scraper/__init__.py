@@ -0,0 +1,7 @@
+"""Job board scraping: pooled, rate-limited crawling over pluggable source adapters."""
+from src.scraper.crawler import Crawler
+from src.scraper.http import PoliteSession
+from src.scraper.sources import SOURCES, LinkedInSource, RemoteOKSource, SourceAdapter, clean_jobs
+
+__all__ = ['Crawler', 'PoliteSession', 'SOURCES', 'LinkedInSource', 'RemoteOKSource', 'SourceAdapter',
+           'clean_jobs']
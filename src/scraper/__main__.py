@@ -0,0 +1,107 @@
+"""Refresh the job catalog from the job boards.
+
+Usage:
+    python -m src.scraper --query python --query "data analyst" --location "United States" --pages 10
+    python -m src.scraper --source remoteok --query python --remoteok-url http://127.0.0.1:8002
+    python -m src.scraper --daily-at 08:00
+
+Each crawl is upserted into the --catalog database (keyed by normalized posting
+URL), postings unseen for --expire-days are expired, and the live catalog is
+exported to --clean-out for the matcher, keeping one posting per cluster of
+near-duplicates (--dedupe-threshold). --out keeps the raw rows of the latest crawl.
+"""
+import os
+import time
+import logging
+import argparse
+from datetime import datetime, timedelta
+
+from src.catalog import JobCatalog, save_jobs
+from src.dedup import dedupe_jobs
+from src.scraper.crawler import Crawler
+from src.scraper.http import PoliteSession
+from src.scraper.sources import JOB_COLUMNS, SOURCES, clean_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def run(args) -> int:
+    overrides = {'linkedin': args.linkedin_url, 'remoteok': args.remoteok_url}
+    sources = [SOURCES[name](base_url=overrides.get(name)) for name in args.source]
+    session = PoliteSession(pool_size=args.workers * 2, per_host=args.per_host,
+                            rate_per_host=args.rate, record_dir=args.record_dir)
+    try:
+        crawler = Crawler(sources, session, max_workers=args.workers, max_pages=args.pages)
+        jobs_df = crawler.crawl(args.query, args.location)
+    finally:
+        session.close()
+
+    if jobs_df.empty:
+        # Also skips expiry, so an outage does not empty the catalog
+        logger.warning("No jobs retrieved; keeping the existing catalog")
+        return 0
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    jobs_df[JOB_COLUMNS].to_csv(args.out, index=False)
+
+    catalog = JobCatalog(args.catalog)
+    try:
+        counts = catalog.upsert(clean_jobs(jobs_df))
+        counts['expired'] = catalog.expire(args.expire_days) if args.expire_days > 0 else 0
+        live_df = catalog.live_jobs()
+        export_df = dedupe_jobs(live_df, args.dedupe_threshold) if args.dedupe_threshold > 0 else live_df
+        save_jobs(export_df[JOB_COLUMNS + ['is_remote']], args.clean_out)
+        version = catalog.version
+    finally:
+        catalog.close()
+    print(f"Crawled {len(jobs_df)} jobs ({crawler.stats}); catalog v{version} holds {len(live_df)} "
+          f"live postings ({counts}), exported {len(export_df)} to {args.clean_out}")
+    return len(jobs_df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', action='append', choices=sorted(SOURCES),
+                        help="sources to crawl (default: all)")
+    parser.add_argument('--query', action='append', help="search keywords, repeatable (default: python)")
+    parser.add_argument('--location', action='append', help="search location, repeatable (default: United States)")
+    parser.add_argument('--pages', type=int, default=10, help="result pages per search")
+    parser.add_argument('--workers', type=int, default=16, help="crawler threads")
+    parser.add_argument('--per-host', type=int, default=4, help="concurrent requests per host")
+    parser.add_argument('--rate', type=float, default=2.0, help="requests per second per host")
+    parser.add_argument('--out', default='data/jobs.csv', help="raw rows of this crawl")
+    parser.add_argument('--clean-out', default='data/jobs_clean.csv', help="export of the live catalog (.csv, .parquet or .arrow)")
+    parser.add_argument('--catalog', default='data/jobs.db', help="SQLite job catalog to upsert into")
+    parser.add_argument('--expire-days', type=float, default=14,
+                        help="expire postings not seen for this many days (0 keeps them)")
+    parser.add_argument('--dedupe-threshold', type=float, default=0.75,
+                        help="MinHash similarity at which postings count as duplicates in the export (0 keeps all)")
+    parser.add_argument('--linkedin-url', help="override the LinkedIn base URL (e.g. a local stub)")
+    parser.add_argument('--remoteok-url', help="override the RemoteOK base URL (e.g. a local stub)")
+    parser.add_argument('--record-dir', help="save every response body here for replay")
+    parser.add_argument('--daily-at', metavar='HH:MM', help="keep running and scrape every day at this time")
+    args = parser.parse_args()
+    args.source = args.source or sorted(SOURCES)
+    args.query = args.query or ['python']
+    args.location = args.location or ['United States']
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.daily_at:
+        run(args)
+        return
+
+    hour, minute = map(int, args.daily_at.split(':'))
+    while True:
+        now = datetime.now()
+        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        logger.info(f"Next scrape at {next_run:%Y-%m-%d %H:%M}")
+        time.sleep((next_run - now).total_seconds())
+        try:
+            run(args)
+        except Exception as e:
+            logger.error(f"Scheduled scrape failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import time
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.scraper.http import PoliteSession
+from src.scraper.sources import JOB_COLUMNS, SourceAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class Crawler:
+    """Thread-pool crawler over every (source, query, location) search.
+
+    Page 0 of every search is fetched at once; each further page is queued
+    as soon as the previous one comes back full, so searches page in
+    parallel while the session keeps each host within its limits. Jobs are
+    de-duplicated by link.
+    """
+
+    def __init__(self, sources: Iterable[SourceAdapter], session: Optional[PoliteSession] = None,
+                 max_workers: int = 16, max_pages: int = 10):
+        self.sources = list(sources)
+        self.session = session or PoliteSession()
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.stats = {'pages': 0, 'failed_pages': 0, 'jobs': 0}
+        self._stats_lock = threading.Lock()
+
+    def crawl(self, queries: List[str], locations: List[str]) -> pd.DataFrame:
+        start = time.perf_counter()
+        today = pd.Timestamp.now().strftime('%Y-%m-%d')
+        jobs: Dict[str, Dict] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scrape') as pool:
+            pending = {}
+            for source in self.sources:
+                # Location-less sources are searched once per query
+                for query in queries:
+                    for location in (locations if source.paginated() else ['']):
+                        task = (source, query, location, 0)
+                        pending[pool.submit(self._fetch, *task)] = task
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, query, location, page = pending.pop(future)
+                    page_jobs = future.result()
+                    for job in page_jobs:
+                        job.update(source=source.name, date_scraped=today)
+                        jobs.setdefault(job['link'], job)
+                    if (source.paginated() and len(page_jobs) >= source.page_size
+                            and page + 1 < self.max_pages):
+                        task = (source, query, location, page + 1)
+                        pending[pool.submit(self._fetch, *task)] = task
+
+        self.stats['jobs'] = len(jobs)
+        logger.info(f"Crawled {self.stats['pages']} pages, {len(jobs)} unique jobs "
+                    f"in {time.perf_counter() - start:.1f}s")
+        return pd.DataFrame(list(jobs.values()), columns=JOB_COLUMNS)
+
+    def _fetch(self, source: SourceAdapter, query: str, location: str, page: int) -> List[Dict]:
+        url, params = source.request(query, location, page)
+        try:
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            jobs = source.parse(response.content)
+            self._count('pages')
+            return jobs
+        except Exception as e:
+            self._count('failed_pages')
+            logger.warning(f"{source.name} page {page} for {query!r} in {location!r} failed: {e}")
+            return []
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
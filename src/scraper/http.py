@@ -0,0 +1,143 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.rate_limit import TokenBucket, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                  'Chrome/124.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Responses worth another try: throttling and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Longest Retry-After honoured; a host asking for more fails the page instead of stalling the crawl
+MAX_RETRY_AFTER = 120.0
+
+
+def recorded_name(path_url: str) -> str:
+    """File name a response is recorded under: a hash of its path and query string"""
+    return hashlib.sha1(path_url.encode('utf-8')).hexdigest()[:20]
+
+
+class PoliteSession:
+    """Pooled HTTP session that is polite per host.
+
+    One ``requests.Session`` with a connection pool of ``pool_size`` is
+    shared by all crawler threads. Each host gets at most ``per_host``
+    requests in flight and a token bucket of ``rate_per_host`` requests per
+    second. 429/5xx responses and connection errors are retried up to
+    ``retries`` times with exponential backoff; every attempt goes through
+    the host's slots and bucket again, and a ``Retry-After`` pauses the
+    whole host, not just the thread that got it. With ``record_dir`` every response body is also saved
+    (see scripts/scraper_stub_server.py to replay them).
+    """
+
+    def __init__(self, pool_size: int = 32, per_host: int = 4, rate_per_host: float = 2.0,
+                 timeout: float = 15.0, retries: int = 3, record_dir: Optional[str] = None):
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        # Retries happen in get(), under the per-host limits, not inside the adapter
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.per_host = per_host
+        self.rate_per_host = rate_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.record_dir = record_dir
+        self._hosts_lock = threading.Lock()
+        self._host_slots = {}
+        self._host_buckets = {}
+        self._host_paused_until = {}
+        self.requests_by_host = defaultdict(int)
+        self.retries_by_host = defaultdict(int)
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+
+    def _limits(self, host: str):
+        with self._hosts_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+                self._host_buckets[host] = TokenBucket(self.rate_per_host, capacity=max(self.per_host, 1))
+            return self._host_slots[host], self._host_buckets[host]
+
+    def _pause(self, host: str, seconds: float) -> None:
+        """Hold every request to ``host`` for ``seconds``"""
+        with self._hosts_lock:
+            until = time.monotonic() + seconds
+            self._host_paused_until[host] = max(until, self._host_paused_until.get(host, 0.0))
+
+    def _wait_for_host(self, host: str) -> None:
+        with self._hosts_lock:
+            wait = self._host_paused_until.get(host, 0.0) - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        host = urlsplit(url).netloc
+        slots, bucket = self._limits(host)
+        for attempt in range(self.retries + 1):
+            self._wait_for_host(host)
+            with slots:
+                bucket.acquire()
+                with self._hosts_lock:
+                    self.requests_by_host[host] += 1
+                try:
+                    response = self.session.get(url, params=params, timeout=self.timeout, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt == self.retries:
+                        raise
+                    delay, reason = backoff_delay(attempt), type(e).__name__
+                else:
+                    if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                        break
+                    retry_after = self._retry_after(response)
+                    if retry_after > MAX_RETRY_AFTER:
+                        break
+                    delay, reason = max(backoff_delay(attempt), retry_after), response.status_code
+                    response.close()
+            with self._hosts_lock:
+                self.retries_by_host[host] += 1
+            logger.warning(f"GET {url} failed ({reason}), retry {attempt + 1} in {delay:.2f}s")
+            self._pause(host, delay)
+        if self.record_dir:
+            self._record(response)
+        return response
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        """Seconds the ``Retry-After`` header asks for (delay or HTTP date), 0 if absent"""
+        value = response.headers.get('retry-after')
+        if not value:
+            return 0.0
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _record(self, response: requests.Response) -> None:
+        path_url = requests.utils.urlparse(response.url)
+        path_url = path_url.path + (f"?{path_url.query}" if path_url.query else '')
+        with open(os.path.join(self.record_dir, recorded_name(path_url)), 'wb') as f:
+            f.write(response.content)
+
+    def close(self) -> None:
+        self.session.close()
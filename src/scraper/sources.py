@@ -0,0 +1,117 @@
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+JOB_COLUMNS = ['title', 'company', 'location', 'link', 'source', 'date_scraped']
+
+
+class SourceAdapter(ABC):
+    """One job board: how to request a result page and how to read jobs from it.
+
+    ``base_url`` is overridable so adapters can be pointed at a local stub.
+    A page that yields fewer than ``page_size`` jobs is the last one.
+    """
+
+    name = ''
+    base_url = ''
+    page_size = 25
+    remote_only = False   # every job on the board is remote, whatever its location says
+
+    def __init__(self, base_url: Optional[str] = None):
+        if base_url:
+            self.base_url = base_url.rstrip('/')
+
+    @abstractmethod
+    def request(self, query: str, location: str, page: int) -> Tuple[str, Dict[str, Any]]:
+        """(url, params) of result page ``page`` (0-based)"""
+
+    @abstractmethod
+    def parse(self, body: bytes) -> List[Dict[str, Any]]:
+        """Job dicts with title, company, location and link"""
+
+    def paginated(self) -> bool:
+        return True
+
+
+class LinkedInSource(SourceAdapter):
+    """LinkedIn's public job search listing, paged with ``start`` in steps of 25 cards"""
+
+    name = 'LinkedIn'
+    base_url = 'https://www.linkedin.com'
+    page_size = 25
+
+    def request(self, query: str, location: str, page: int) -> Tuple[str, Dict[str, Any]]:
+        return (f"{self.base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search",
+                {'keywords': query, 'location': location, 'start': page * self.page_size})
+
+    def parse(self, body: bytes) -> List[Dict[str, Any]]:
+        soup = BeautifulSoup(body, 'html.parser')
+        # LinkedIn changes its markup often; try the known card layouts in turn
+        cards = (soup.find_all('div', class_='base-card')
+                 or soup.find_all('li', class_='jobs-search-results__list-item')
+                 or soup.select('div.job-search-card'))
+        jobs = []
+        for card in cards:
+            title = card.find('h3', class_='base-search-card__title') or card.find('h3', class_='job-card-search__title')
+            company = card.find('h4', class_='base-search-card__subtitle') or card.find('a', class_='hidden-nested-link')
+            location = (card.find('span', class_='job-search-card__location')
+                        or card.find('span', class_='job-card-search__location'))
+            link = card.find('a', class_='base-card__full-link') or card.find('a', class_='job-card-search__link-wrapper')
+            if not link or not link.get('href'):
+                continue
+            jobs.append({
+                'title': title.text.strip() if title else "N/A",
+                'company': company.text.strip() if company else "N/A",
+                'location': location.text.strip() if location else "Remote",
+                'link': link['href'].split('?')[0],
+            })
+        return jobs
+
+
+class RemoteOKSource(SourceAdapter):
+    """RemoteOK's JSON API: one response per tag, every job remote"""
+
+    name = 'RemoteOK'
+    base_url = 'https://remoteok.com'
+    remote_only = True
+
+    def request(self, query: str, location: str, page: int) -> Tuple[str, Dict[str, Any]]:
+        return f"{self.base_url}/api", {'tags': query.lower().replace(' ', '-')}
+
+    def paginated(self) -> bool:
+        return False
+
+    def parse(self, body: bytes) -> List[Dict[str, Any]]:
+        jobs = json.loads(body or b'[]')
+        if not isinstance(jobs, list):
+            return []
+        # The first element is a legal notice, not a job
+        return [{
+            'title': job.get('position', 'N/A'),
+            'company': job.get('company', 'N/A'),
+            'location': job.get('location') or 'Remote',
+            'link': job.get('url', '#'),
+        } for job in jobs if isinstance(job, dict) and job.get('position')]
+
+
+SOURCES = {
+    'linkedin': LinkedInSource,
+    'remoteok': RemoteOKSource,
+}
+
+
+def clean_jobs(jobs_df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize scraped jobs the way the matcher expects (jobs_clean.csv)"""
+    jobs_df = jobs_df.copy()
+    for col in ('title', 'company', 'location'):
+        jobs_df[col] = jobs_df[col].astype(str).str.lower().str.strip()
+    remote_sources = [source.name for source in SOURCES.values() if source.remote_only]
+    is_remote = jobs_df['location'].str.contains('remote', case=False) | jobs_df['source'].isin(remote_sources)
+    jobs_df['is_remote'] = is_remote.astype(int)
+    return jobs_df
@@ -0,0 +1,191 @@
+import os
+import json
+import shutil
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: only needed to publish or attach a shared index
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = 'CURRENT'
+GENERATION_PREFIX = 'gen-'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Shared job indexes need pyarrow (pip install pyarrow)")
+
+
+class SharedIndex:
+    """Generation-numbered job index that worker processes map zero-copy.
+
+    A loader process publishes each catalog build as ``<root>/gen-NNNNNN/``:
+
+    - ``embeddings.npy``: the float32 job matrix
+    - ``jobs.arrow``: job metadata as an uncompressed Arrow IPC file
+    - ``meta.json``: generation, model and per-row content hashes
+    - ``index/``: an optional saved search index
+
+    ``CURRENT`` names the live generation. It is replaced atomically once
+    a generation is complete. Workers memory-map the files, so every worker
+    shares one copy through the OS page cache, and they switch over by
+    re-reading ``CURRENT``.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.current_path = os.path.join(root, CURRENT_FILE)
+
+    def current_generation(self) -> int:
+        """Generation named by CURRENT, or 0 if nothing has been published"""
+        try:
+            with open(self.current_path, 'r', encoding='utf-8') as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def generation_path(self, generation: int) -> str:
+        return os.path.join(self.root, f"{GENERATION_PREFIX}{generation:06d}")
+
+    def publish(self, jobs_df: pd.DataFrame, embeddings: np.ndarray, hashes: List[str],
+                model_name: str, index=None, fingerprint: str = '', keep: int = 3) -> int:
+        """Write a new generation and make it current; returns its number"""
+        _require_pyarrow()
+        generation = max(self.current_generation(), self._latest_on_disk()) + 1
+        final_path = self.generation_path(generation)
+        tmp_path = f"{final_path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+
+        with open(os.path.join(tmp_path, 'embeddings.npy'), 'wb') as f:
+            np.save(f, np.ascontiguousarray(embeddings, dtype=np.float32))
+
+        table = pa.Table.from_pandas(jobs_df.reset_index(drop=True), preserve_index=False)
+        with pa.OSFile(os.path.join(tmp_path, 'jobs.arrow'), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        if index is not None:
+            index.save(os.path.join(tmp_path, 'index'), fingerprint)
+
+        with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'generation': generation, 'model': model_name, 'size': len(jobs_df),
+                       'hashes': list(hashes)}, f)
+
+        # The directory becomes visible complete, then CURRENT flips to it
+        os.replace(tmp_path, final_path)
+        tmp_current = f"{self.current_path}.{os.getpid()}.tmp"
+        with open(tmp_current, 'w', encoding='utf-8') as f:
+            f.write(str(generation))
+        os.replace(tmp_current, self.current_path)
+
+        self._prune(keep)
+        logger.info(f"Published shared index generation {generation} ({len(jobs_df)} jobs)")
+        return generation
+
+    def attach(self, generation: Optional[int] = None) -> Tuple[int, pd.DataFrame, np.ndarray, Dict]:
+        """Map a generation (default: current) as (generation, jobs_df, embeddings, meta)"""
+        _require_pyarrow()
+        generation = generation or self.current_generation()
+        if not generation:
+            raise FileNotFoundError(f"No shared index has been published under {self.root}")
+        path = self.generation_path(generation)
+
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        embeddings = np.load(os.path.join(path, 'embeddings.npy'), mmap_mode='r')
+        table = pa.ipc.open_file(pa.memory_map(os.path.join(path, 'jobs.arrow'))).read_all()
+        # ArrowDtype columns wrap the mapped buffers instead of copying them into objects;
+        # dictionary columns come back as categoricals (only their codes are copied)
+        jobs_df = table.to_pandas(types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t))
+
+        meta['index_path'] = os.path.join(path, 'index')
+        logger.info(f"Attached shared index generation {generation} ({len(jobs_df)} jobs)")
+        return generation, jobs_df, embeddings, meta
+
+    def _latest_on_disk(self) -> int:
+        generations = self._generations()
+        return generations[-1] if generations else 0
+
+    def _generations(self) -> List[int]:
+        if not os.path.isdir(self.root):
+            return []
+        generations = []
+        for name in os.listdir(self.root):
+            suffix = name[len(GENERATION_PREFIX):]
+            if name.startswith(GENERATION_PREFIX) and suffix.isdigit():
+                generations.append(int(suffix))
+        return sorted(generations)
+
+    def _prune(self, keep: int) -> None:
+        """Delete old generations; workers still mapping them keep their pages until they switch"""
+        current = self.current_generation()
+        for generation in self._generations()[:-keep]:
+            if generation != current:
+                shutil.rmtree(self.generation_path(generation), ignore_errors=True)
+
+
+def main():
+    """Loader entry point: build the catalog once and publish it for the workers.
+
+    With --catalog the jobs come from a JobCatalog database; adding --poll N
+    keeps the loader running and publishes a new generation built from only
+    the catalog changes every N seconds. Full builds keep one posting per
+    cluster of near-duplicates (--dedupe-threshold); delta syncs apply
+    changes as they are.
+    """
+    import time
+    import argparse
+    from src.catalog import JobCatalog, load_jobs, sync_matcher
+    from src.dedup import dedupe_jobs
+    from src.job_matcher import JobMatcher
+
+    parser = argparse.ArgumentParser(description="Publish a shared job index generation")
+    parser.add_argument('--jobs', default='data/jobs_clean.csv', help="catalog CSV, Parquet or Arrow file to index")
+    parser.add_argument('--catalog', help="SQLite job catalog to index instead of --jobs")
+    parser.add_argument('--poll', type=float, default=0, help="with --catalog, seconds between delta syncs")
+    parser.add_argument('--dedupe-threshold', type=float, default=0.75,
+                        help="MinHash similarity at which postings count as duplicates (0 keeps all)")
+    parser.add_argument('--root', default='data/shared_index', help="shared index directory")
+    parser.add_argument('--embeddings', default='data/job_embeddings', help="embedding store prefix")
+    parser.add_argument('--backend', default='exact', help="index backend (exact or ivf)")
+    parser.add_argument('--keep', type=int, default=3, help="generations to keep on disk")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    catalog = JobCatalog(args.catalog) if args.catalog else None
+    synced = catalog.version if catalog else 0
+
+    def build():
+        jobs_df = catalog.live_jobs() if catalog else load_jobs(args.jobs)
+        if args.dedupe_threshold > 0:
+            jobs_df = dedupe_jobs(jobs_df, args.dedupe_threshold)
+        return JobMatcher(jobs_df, embeddings_path=args.embeddings, index_backend=args.backend)
+
+    matcher = build()
+    generation = matcher.publish_shared(args.root, keep=args.keep)
+    print(f"Published generation {generation} to {args.root}")
+
+    while catalog is not None and args.poll > 0:
+        time.sleep(args.poll)
+        previous, rebuilt = matcher.version, False
+        try:
+            synced = sync_matcher(matcher, catalog, synced)
+        except ValueError as e:
+            logger.warning(f"Delta sync failed ({e}); rebuilding from the full catalog")
+            synced = catalog.version
+            matcher = build()
+            rebuilt = True
+        if rebuilt or matcher.version != previous:
+            generation = matcher.publish_shared(args.root, keep=args.keep)
+            print(f"Published generation {generation} at catalog v{synced}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import os
+import csv
+import re
+import json
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skills_taxonomy.csv')
+
+# A token is a run of letters/digits that may carry "+" or "#" ("c++", "c#") and
+# inner dots ("node.js", "asp.net"), optionally led by a dot (".net"). Anything
+# else ("-", "/", spaces, trailing full stops) separates tokens, so "scikit-learn"
+# and "scikit learn" both become ["scikit", "learn"].
+TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9][a-z0-9+#]*)*")
+
+# Same tokens found in the original text, so a match can be checked against its casing and surroundings
+_TOKEN_SPAN_RE = re.compile(TOKEN_RE.pattern, re.IGNORECASE)
+
+ALIAS_SEPARATOR = '|'
+
+# Skill names that are also ordinary words ("Go", "Swift", "Excel") and single letters
+# ("C", "R") need context: a list item, or written in their own casing and joined by
+# "and"/"or"/a comma to a skill that counts ("Python and Go"). Casing alone is not
+# enough, since "Go" and "Swift" open sentences and "R" opens "R&D".
+# A listed skill sits between these (ignoring spaces): "Languages: Python, R; Go"
+LIST_OPENERS = ',;|/\u2022\u00b7:*-\n\r'
+LIST_CLOSERS = ',;|/\u2022\u00b7\n\r'
+
+# Text allowed between two coordinated skills: "Python, Go", "Python and Go", "C/C++ or Rust"
+COORDINATION_RE = re.compile(r"\s*(?:[,;/|&+]\s*)*(?:(?:and|or)\s+)?", re.IGNORECASE)
+
+# Used when the taxonomy file is missing so parsing still works
+FALLBACK_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'HTML', 'CSS', 'React', 'Angular', 'Vue.js',
+    'Node.js', 'Express.js', 'Django', 'Flask', 'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'AWS',
+    'Azure', 'GCP', 'Docker', 'Kubernetes', 'Machine Learning', 'Data Analysis', 'TensorFlow',
+    'PyTorch', 'Pandas', 'NumPy', 'Git', 'Linux', 'C++', 'C#', 'PHP', 'Ruby', 'Swift', 'Kotlin',
+    'Go', 'Rust', 'Data Science', 'AI', 'Artificial Intelligence', 'Deep Learning', 'Big Data',
+    'Hadoop', 'Spark', 'Tableau', 'Power BI', 'Excel',
+]
+FALLBACK_AMBIGUOUS = {'Flask', 'Ruby', 'Swift', 'Go', 'Rust', 'Spark', 'Excel'}
+
+_END = object()  # trie key marking the canonical skill a phrase ends on
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def load_taxonomy(path: str) -> List[Tuple[str, List[str], bool]]:
+    """Read ``skill,aliases,ambiguous`` rows (aliases separated by ``|``) as (skill, aliases, ambiguous).
+
+    Other columns are ignored. Rows naming a skill already read (same
+    tokens, e.g. "scikit-learn" and "Scikit Learn") are merged into the
+    first one, so a large, machine-assembled file may repeat itself.
+    """
+    taxonomy, rows_by_name, merged = [], {}, 0
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            skill = (row.get('skill') or '').strip()
+            key = tuple(tokenize(skill))
+            if not key:
+                continue
+            aliases = [a.strip() for a in (row.get('aliases') or '').split(ALIAS_SEPARATOR) if a.strip()]
+            ambiguous = (row.get('ambiguous') or '').strip().lower() in ('1', 'true', 'yes')
+            if key in rows_by_name:
+                _, known, _ = taxonomy[rows_by_name[key]]
+                known.extend(alias for alias in aliases if alias not in known)
+                merged += 1
+                continue
+            rows_by_name[key] = len(taxonomy)
+            taxonomy.append((skill, aliases, ambiguous))
+    if merged:
+        logger.warning(f"Merged {merged} repeated skills in {path}")
+    return taxonomy
+
+
+def _is_listed(text: str, start: int, end: int) -> bool:
+    """Whether ``text[start:end]`` is an item of a list or alone on its line"""
+    before = start - 1
+    while before >= 0 and text[before] in ' \t':
+        before -= 1
+    after = end
+    while after < len(text) and text[after] in ' \t':
+        after += 1
+    return ((before < 0 or text[before] in LIST_OPENERS)
+            and (after == len(text) or text[after] in LIST_CLOSERS))
+
+
+class SkillExtractor:
+    """Alias-aware skill matcher compiled once into a token trie.
+
+    Every skill name and alias is tokenized the same way as the resume and
+    inserted into a trie of tokens. Extraction tokenizes the text once and
+    walks the trie from each position, keeping the longest phrase that ends
+    on a skill, so the cost depends on the resume length (times the longest
+    phrase) and not on how many skills the taxonomy holds.
+
+    Aliases should be unambiguous. A skill whose own name is an ordinary
+    word is flagged ``ambiguous``; its name, like a single-letter one, then
+    only matches with context: as a list item, or in its own casing next to
+    another skill that matched ("Python and Go", "C, R or SQL"). Those
+    mentions are settled after the walk, once their neighbours are known.
+    """
+
+    def __init__(self, taxonomy: Iterable[Tuple[str, Iterable[str], bool]]):
+        self.trie: Dict = {}
+        self.max_phrase = 0
+        self.size = 0
+        self.shadowed = 0  # phrases already claimed by an earlier skill
+        # Identifies the loaded taxonomy, so output cached under another one is not reused
+        digest = hashlib.sha1()
+        for skill, aliases, ambiguous in taxonomy:
+            aliases = list(aliases)
+            digest.update(json.dumps([skill, aliases, bool(ambiguous)]).encode('utf-8'))
+            self.size += 1
+            self._add(skill, skill, ambiguous or len(skill) == 1)
+            for phrase in aliases:
+                self._add(phrase, skill)
+        self.fingerprint = digest.hexdigest()[:12]
+        if self.shadowed:
+            logger.debug(f"{self.shadowed} skill phrases are claimed by more than one skill; the first one keeps them")
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH) -> 'SkillExtractor':
+        return cls(load_taxonomy(path))
+
+    def _add(self, phrase: str, skill: str, needs_context: bool = False) -> None:
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # First skill to claim a phrase keeps it, so canonical names win over aliases listed later
+        if _END in node:
+            self.shadowed += node[_END][0] != skill
+        else:
+            node[_END] = (skill, needs_context)
+        self.max_phrase = max(self.max_phrase, len(tokens))
+
+    def extract(self, text: str, listed: bool = False) -> List[str]:
+        """Canonical names of the skills mentioned in ``text``, sorted.
+
+        ``listed`` says all of ``text`` is a list of skills (a resume's
+        skills section), so ambiguous names need no further context.
+        """
+        spans = [m.span() for m in _TOKEN_SPAN_RE.finditer(text)]
+        tokens = [text[start:end].lower() for start, end in spans]
+        # [start, end, skill, counts]; a mention that does not count yet waits for its neighbours
+        mentions = []
+        i, n = 0, len(tokens)
+        while i < n:
+            node, match, pending = self.trie, None, None
+            j = i
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END not in node:
+                    continue
+                skill, needs_context = node[_END]
+                start, end = spans[i][0], spans[j - 1][1]
+                if listed or not needs_context or _is_listed(text, start, end):
+                    match = [start, end, skill, True]
+                elif text[start:end] == skill:
+                    pending = [start, end, skill, False]
+            match = match or pending
+            if match is None:
+                i += 1
+            else:
+                mentions.append(match)
+                while i < n and spans[i][0] < match[1]:
+                    i += 1
+        _settle(text, mentions)
+        return sorted({skill for _, _, skill, counts in mentions if counts})
+
+
+def _settle(text: str, mentions: List[list]) -> None:
+    """Let mentions coordinated with a counted neighbour count too, until nothing changes"""
+    changed = True
+    while changed:
+        changed = False
+        for left, right in zip(mentions, mentions[1:]):
+            if left[3] != right[3] and COORDINATION_RE.fullmatch(text, left[1], right[0]):
+                left[3] = right[3] = changed = True
+
+
+@lru_cache(maxsize=8)
+def get_skill_extractor(path: Optional[str] = None) -> SkillExtractor:
+    """Compile the taxonomy at ``path`` once per process and share it"""
+    path = path or DEFAULT_TAXONOMY_PATH
+    try:
+        extractor = SkillExtractor.from_file(path)
+        logger.info(f"Loaded {extractor.size} skills from {path}")
+    except FileNotFoundError:
+        logger.warning(f"Skill taxonomy {path} not found, using the built-in skill list")
+        extractor = SkillExtractor((skill, [], skill in FALLBACK_AMBIGUOUS) for skill in FALLBACK_SKILLS)
+    return extractor
@@ -0,0 +1,64 @@
+import logging
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+# Job fields that feed the keyword index (description is used when scraped)
+SPARSE_FIELDS = ['title', 'company', 'location', 'description']
+
+
+class SparseIndex:
+    """TF-IDF inverted index over job text for cheap keyword candidate selection.
+
+    Postings are stored term-major (one CSR row per term), so scoring a query
+    only touches the postings of the terms it contains.
+    """
+
+    def __init__(self, min_df: int = 1, max_features: int = None):
+        self.vectorizer = TfidfVectorizer(
+            sublinear_tf=True, min_df=min_df, max_features=max_features,
+            # Keep tokens such as "c++", "c#", "node.js" and single letters like "r"
+            token_pattern=r"(?u)\b\w[\w.+#-]*[\w+#]|\b\w\b")
+        self.postings = None
+        self.size = 0
+
+    def build(self, jobs_df: pd.DataFrame) -> 'SparseIndex':
+        """Fit the vocabulary on the catalog and build the term -> job postings"""
+        texts = self._job_texts(jobs_df)
+        self.size = len(texts)
+        if not any(text.strip() for text in texts):
+            self.postings = None
+            return self
+        doc_term = self.vectorizer.fit_transform(texts)
+        self.postings = doc_term.T.tocsr()
+        return self
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (scores, indices) of up to ``k`` jobs sharing terms with ``query``"""
+        if self.postings is None or not query.strip():
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+        query_vector = self.vectorizer.transform([query])
+        scores = (query_vector @ self.postings).tocsr()
+        if not scores.nnz:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+        rows, values = scores.indices, scores.data.astype(np.float32)
+        if len(values) > k:
+            keep = np.argpartition(-values, k - 1)[:k]
+            rows, values = rows[keep], values[keep]
+        order = np.argsort(-values, kind='stable')
+        return values[order], rows[order].astype(np.int64)
+
+    def _job_texts(self, jobs_df: pd.DataFrame) -> List[str]:
+        fields = [col for col in SPARSE_FIELDS if col in jobs_df.columns]
+        if not fields:
+            return [''] * len(jobs_df)
+        text = jobs_df[fields[0]].fillna('').astype(str)
+        for col in fields[1:]:
+            text = text + " " + jobs_df[col].fillna('').astype(str)
+        return text.tolist()
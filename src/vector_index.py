@@ -0,0 +1,399 @@
+import os
+import json
+import time
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matrix multiply, keeps the score buffer at BLOCK_ROWS x N floats
+BLOCK_ROWS = 1024
+
+# Upper bound on the query x catalog score buffer (floats) for one block
+SCORE_BLOCK_ELEMENTS = 1 << 24
+
+# Storage precisions for job vectors; int8 keeps one float32 scale per row
+PRECISIONS = ('float32', 'float16', 'int8')
+
+# Quantized rows upcast to float32 at a time while scoring
+DEQUANT_CHUNK_ROWS = 16384
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return an L2-normalized float32 copy of ``matrix`` (zero rows stay zero)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def quantize(vectors: np.ndarray, precision: str = 'float32') -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Normalize ``vectors`` and store them at ``precision``, returning (codes, scales)"""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}', expected one of {PRECISIONS}")
+    normalized = normalize_rows(vectors)
+    if precision == 'float32':
+        return normalized, None
+    if precision == 'float16':
+        return normalized.astype(np.float16), None
+
+    # Symmetric per-row int8: the largest component of each row maps to +-127
+    scales = np.abs(normalized).max(axis=1) / 127.0 if len(normalized) else np.empty(0, dtype=np.float32)
+    scales[scales == 0] = 1.0
+    codes = np.round(normalized / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantized_scores(queries: np.ndarray, codes: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """Dot products of float32 ``queries`` with quantized rows.
+
+    Codes are upcast a chunk at a time and per-row scales are applied to the
+    scores, not the codes, so no dequantized copy of the matrix is ever built.
+    """
+    if codes.dtype == np.float32:
+        return queries @ codes.T
+    scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+    for start in range(0, len(codes), DEQUANT_CHUNK_ROWS):
+        stop = start + DEQUANT_CHUNK_ROWS
+        scores[:, start:stop] = queries @ codes[start:stop].astype(np.float32).T
+        if scales is not None:
+            scores[:, start:stop] *= scales[start:stop]
+    return scores
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Highest ``k`` scores per row, best first, without a full sort"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return np.take_along_axis(part_scores, order, axis=1), np.take_along_axis(part, order, axis=1)
+
+
+def subset_search(vectors: np.ndarray, queries: np.ndarray, rows: np.ndarray,
+                  k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact cosine top-k restricted to ``rows``; returned indices refer to ``vectors``"""
+    queries = normalize_rows(np.atleast_2d(queries))
+    rows = np.asarray(rows, dtype=np.int64)
+    if not len(rows):
+        empty = np.empty((len(queries), 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    # Gather candidate vectors in chunks and keep a running top-k, so a
+    # large subset never needs a full copy of its vectors
+    chunk = max(k, SCORE_BLOCK_ELEMENTS // max(len(queries), 1) // 4)
+    best_scores, best_rows = None, None
+    for start in range(0, len(rows), chunk):
+        chunk_rows = rows[start:start + chunk]
+        scores, positions = top_k(queries @ normalize_rows(vectors[chunk_rows]).T, k)
+        found_rows = chunk_rows[positions]
+        if best_scores is not None:
+            scores = np.hstack([best_scores, scores])
+            found_rows = np.hstack([best_rows, found_rows])
+            scores, positions = top_k(scores, k)
+            found_rows = np.take_along_axis(found_rows, positions, axis=1)
+        best_scores, best_rows = scores, found_rows
+    return best_scores, best_rows
+
+
+class BruteForceIndex:
+    """Exact cosine search against every vector.
+
+    With ``precision`` float16 or int8 the index keeps its own quantized copy
+    of the vectors and scores it directly (full, subset and reranking
+    searches alike); float32 scores the given matrix.
+    """
+
+    backend = 'exact'
+
+    def __init__(self, precision: str = 'float32'):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}', expected one of {PRECISIONS}")
+        self.precision = precision
+        self.vectors = None
+        self.inv_norms = None
+        self.codes = None
+        self.scales = None
+
+    def build(self, vectors: np.ndarray, train: bool = True) -> 'BruteForceIndex':
+        if self.precision != 'float32':
+            self.vectors, self.inv_norms = None, None
+            self.codes, self.scales = quantize(vectors, self.precision)
+            return self
+
+        # Keep a reference rather than a normalized copy so a memory-mapped
+        # matrix stays shared between processes; only the norms are stored,
+        # and not even those when the vectors are already unit length
+        self.vectors = vectors
+        norms = np.linalg.norm(np.asarray(vectors, dtype=np.float32), axis=1) if len(vectors) else np.empty(0)
+        norms[norms == 0] = 1.0
+        self.inv_norms = None if np.allclose(norms, 1.0, atol=1e-4) else (1.0 / norms).astype(np.float32)
+        return self
+
+    def __len__(self) -> int:
+        matrix = self.vectors if self.codes is None else self.codes
+        return 0 if matrix is None else len(matrix)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of vector data the index scores against"""
+        if self.codes is None:
+            return 0 if self.vectors is None else int(self.vectors.nbytes)
+        return int(self.codes.nbytes) + (0 if self.scales is None else int(self.scales.nbytes))
+
+    def row_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Stored vectors of ``rows``, at the index precision"""
+        return (self.vectors if self.codes is None else self.codes)[rows]
+
+    def subset_search(self, queries: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k restricted to ``rows``, scored from the stored vectors"""
+        return subset_search(self.vectors if self.codes is None else self.codes, queries, rows, k)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (scores, indices) of the ``k`` most similar vectors per query"""
+        queries = normalize_rows(np.atleast_2d(queries))
+        # Large catalogs get fewer query rows per block so memory stays capped
+        rows = max(1, min(BLOCK_ROWS, SCORE_BLOCK_ELEMENTS // max(len(self), 1)))
+        all_scores, all_indices = [], []
+        for start in range(0, len(queries), rows):
+            if self.codes is not None:
+                block = quantized_scores(queries[start:start + rows], self.codes, self.scales)
+            else:
+                block = queries[start:start + rows] @ np.asarray(self.vectors, dtype=np.float32).T
+            if self.inv_norms is not None:
+                block *= self.inv_norms
+            scores, indices = top_k(block, k)
+            all_scores.append(scores)
+            all_indices.append(indices)
+        return np.vstack(all_scores), np.vstack(all_indices)
+
+    def save(self, path: str, fingerprint: str = '') -> None:
+        """Nothing to persist beyond the vectors themselves; record the metadata only"""
+        _write_meta(path, {'backend': self.backend, 'size': len(self), 'fingerprint': fingerprint,
+                           'precision': self.precision})
+
+    @classmethod
+    def load(cls, path: str, vectors: np.ndarray) -> 'BruteForceIndex':
+        return cls(precision=read_meta(path).get('precision', 'float32')).build(vectors)
+
+
+class IVFIndex:
+    """Inverted-file index: spherical k-means lists, probe the closest ``n_probe``.
+
+    ``n_lists`` trades build time and memory for query latency; ``n_probe``
+    trades latency for recall (probing every list is exact search).
+    """
+
+    backend = 'ivf'
+
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 8,
+                 n_iter: int = 10, train_size: int = 100000, seed: int = 0,
+                 precision: str = 'float32'):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}', expected one of {PRECISIONS}")
+        self.precision = precision
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.train_size = train_size
+        self.seed = seed
+        self.centroids = None
+        self.vectors = None    # normalized vectors at ``precision``, grouped by list
+        self.scales = None     # per-row scales for int8 vectors
+        self.ids = None        # original row of each grouped vector
+        self.positions = None  # grouped position of each original row, the inverse of ids
+        self.offsets = None    # list i spans vectors[offsets[i]:offsets[i + 1]]
+
+    def build(self, vectors: np.ndarray, train: bool = True) -> 'IVFIndex':
+        """Assign ``vectors`` to lists, training new centroids unless ``train`` is False"""
+        normalized = normalize_rows(vectors)
+        if not len(normalized):
+            self.centroids = np.zeros((1, normalized.shape[1]), dtype=np.float32)
+            self.vectors, self.scales = quantize(normalized, self.precision)
+            self.ids = np.empty(0, dtype=np.int64)
+            self.positions = np.empty(0, dtype=np.int64)
+            self.offsets = np.zeros(2, dtype=np.int64)
+            return self
+        if train or self.centroids is None:
+            self.centroids = self._train(normalized)
+
+        assignments = self._assign(normalized)
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=len(self.centroids))
+
+        self.vectors, self.scales = quantize(normalized[order], self.precision)
+        self.ids = order.astype(np.int64)
+        self.positions = _inverse_permutation(self.ids)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return self
+
+    def __len__(self) -> int:
+        return 0 if self.ids is None else len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of vector data held in the inverted lists"""
+        if self.vectors is None:
+            return 0
+        return int(self.vectors.nbytes) + (0 if self.scales is None else int(self.scales.nbytes))
+
+    def row_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Stored vectors of original ``rows``, at the index precision"""
+        return self.vectors[self.positions[rows]]
+
+    def subset_search(self, queries: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k restricted to original ``rows``, scored from the inverted lists' vectors"""
+        scores, found = subset_search(self.vectors, queries, self.positions[np.asarray(rows, dtype=np.int64)], k)
+        return scores, self.ids[found]
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (scores, indices) of approximately the ``k`` best vectors per query"""
+        queries = normalize_rows(np.atleast_2d(queries))
+        n_probe = min(self.n_probe, len(self.centroids))
+        k = min(k, len(self))
+        scores_out = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        indices_out = np.full((len(queries), k), -1, dtype=np.int64)
+
+        _, probes = top_k(queries @ self.centroids.T, n_probe)
+        for row, (query, lists) in enumerate(zip(queries, probes)):
+            candidates = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists])
+            if not len(candidates):
+                continue
+            scales = None if self.scales is None else self.scales[candidates]
+            scores, best = top_k(quantized_scores(query[None, :], self.vectors[candidates], scales), k)
+            found = scores.shape[1]
+            scores_out[row, :found] = scores[0]
+            indices_out[row, :found] = self.ids[candidates[best[0]]]
+        return scores_out, indices_out
+
+    def save(self, path: str, fingerprint: str = '') -> None:
+        """Write centroids and inverted lists as .npy files next to a JSON header"""
+        os.makedirs(path, exist_ok=True)
+        for name in self._arrays():
+            # Replace rather than truncate: other processes may have the old file mapped
+            target = os.path.join(path, f"{name}.npy")
+            with open(f"{target}.{os.getpid()}.tmp", 'wb') as f:
+                np.save(f, np.asarray(getattr(self, name)))
+            os.replace(f"{target}.{os.getpid()}.tmp", target)
+        _write_meta(path, {'backend': self.backend, 'size': len(self), 'fingerprint': fingerprint,
+                           'n_lists': len(self.centroids), 'n_probe': self.n_probe,
+                           'precision': self.precision})
+
+    @classmethod
+    def load(cls, path: str, vectors: Optional[np.ndarray] = None) -> 'IVFIndex':
+        meta = read_meta(path)
+        index = cls(n_lists=meta['n_lists'], n_probe=meta['n_probe'],
+                    precision=meta.get('precision', 'float32'))
+        for name in index._arrays():
+            setattr(index, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r'))
+        index.positions = _inverse_permutation(index.ids)
+        return index
+
+    def _arrays(self) -> Tuple[str, ...]:
+        """Names of the arrays that make up a saved index"""
+        names = ('centroids', 'vectors', 'ids', 'offsets')
+        return names + ('scales',) if self.precision == 'int8' else names
+
+    def _train(self, normalized: np.ndarray) -> np.ndarray:
+        """Spherical k-means on a sample of the vectors"""
+        rng = np.random.default_rng(self.seed)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(normalized))))
+        n_lists = max(1, min(n_lists, len(normalized)))
+
+        sample = normalized
+        if len(normalized) > self.train_size:
+            sample = normalized[rng.choice(len(normalized), self.train_size, replace=False)]
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assignments = self._assign(sample, centroids)
+            order = np.argsort(assignments, kind='stable')
+            counts = np.bincount(assignments, minlength=n_lists)
+            empty = counts == 0
+            sums = np.zeros_like(centroids)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            sums[~empty] = np.add.reduceat(sample[order], starts[~empty], axis=0)
+            # Re-seed empty lists from random points so every list stays usable
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize_rows(sums)
+        return centroids
+
+    def _assign(self, normalized: np.ndarray, centroids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Nearest centroid per vector, computed in row blocks"""
+        centroids = self.centroids if centroids is None else centroids
+        return np.concatenate([
+            np.argmax(normalized[start:start + BLOCK_ROWS] @ centroids.T, axis=1)
+            for start in range(0, len(normalized), BLOCK_ROWS)
+        ])
+
+
+INDEX_BACKENDS = {
+    BruteForceIndex.backend: BruteForceIndex,
+    IVFIndex.backend: IVFIndex,
+}
+
+
+def create_index(backend: str = 'exact', **params):
+    """Instantiate an index backend by name"""
+    if backend not in INDEX_BACKENDS:
+        raise ValueError(f"Unknown index backend '{backend}', expected one of {sorted(INDEX_BACKENDS)}")
+    return INDEX_BACKENDS[backend](**params)
+
+
+def load_index(path: str, vectors: np.ndarray):
+    """Load a saved index; the exact backend is rebuilt from ``vectors``"""
+    meta = read_meta(path)
+    return INDEX_BACKENDS[meta['backend']].load(path, vectors)
+
+
+def _inverse_permutation(order: np.ndarray) -> np.ndarray:
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.arange(len(order), dtype=np.int64)
+    return inverse
+
+
+def read_meta(path: str) -> Dict:
+    """Read the JSON header of a saved index"""
+    with open(os.path.join(path, 'index.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_meta(path: str, meta: Dict) -> None:
+    os.makedirs(path, exist_ok=True)
+    target = os.path.join(path, 'index.json')
+    with open(f"{target}.{os.getpid()}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(f"{target}.{os.getpid()}.tmp", target)
+
+
+def recall_at_k(approx_indices: np.ndarray, exact_indices: np.ndarray) -> float:
+    """Mean fraction of the exact top-k that the approximate search returned"""
+    if not exact_indices.size:
+        return 1.0
+    hits = [len(set(a.tolist()) & set(e.tolist())) for a, e in zip(approx_indices, exact_indices)]
+    return float(np.sum(hits)) / exact_indices.size
+
+
+def recall_report(index, vectors: np.ndarray, queries: np.ndarray,
+                  ks: Iterable[int] = (1, 5, 10, 50)) -> Dict[str, float]:
+    """Recall@k and mean query latency of ``index`` against exact search"""
+    ks = sorted(ks)
+    exact = BruteForceIndex().build(vectors)
+    _, exact_indices = exact.search(queries, ks[-1])
+
+    start = time.perf_counter()
+    approx_indices = np.vstack([index.search(query, ks[-1])[1] for query in queries])
+    latency_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+
+    report = {f"recall@{k}": recall_at_k(approx_indices[:, :k], exact_indices[:, :k]) for k in ks}
+    report['latency_ms'] = latency_ms
+    return report
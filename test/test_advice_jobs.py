@@ -0,0 +1,67 @@
+import multiprocessing
+import threading
+
+from src.advice_jobs import AdviceJob, AdviceJobs, AdviceJobStore
+
+
+class SlowAdvisor:
+    """Streams three chunks, each released by the test"""
+
+    def __init__(self):
+        self.release = threading.Semaphore(0)
+
+    def stream_career_suggestions(self, resume_data):
+        for word in ('Learn ', 'more ', 'SQL.'):
+            self.release.acquire()
+            yield word
+
+
+def test_job_is_readable_from_another_worker(tmp_path):
+    advisor = SlowAdvisor()
+    store = str(tmp_path / 'advice.db')
+    # Two AdviceJobs sharing a store stand in for two gunicorn workers
+    owner = AdviceJobs(lambda: advisor, max_workers=1, store_path=store)
+    other = AdviceJobs(lambda: advisor, max_workers=1, store_path=store)
+
+    job_id = owner.submit({'skills': ['python']})
+    job = other.get(job_id)
+    assert job is not None and not job.done
+
+    advisor.release.release()
+    chunks, done = job.wait_for_chunks(0, timeout=5)
+    assert chunks == ['Learn '] and not done
+
+    advisor.release.release()
+    advisor.release.release()
+    received = list(chunks)
+    while not done:
+        chunks, done = job.wait_for_chunks(len(received), timeout=5)
+        received += chunks
+    assert ''.join(received) == 'Learn more SQL.'
+    assert other.get(job_id).to_dict() == {'id': job_id, 'status': 'done', 'done': True,
+                                           'advice': 'Learn more SQL.', 'error': None}
+
+
+def test_unknown_job_without_store():
+    jobs = AdviceJobs(lambda: SlowAdvisor(), max_workers=1)
+    assert jobs.get('missing') is None
+
+
+def test_forked_worker_opens_its_own_connection(tmp_path):
+    store = AdviceJobStore(str(tmp_path / 'advice.db'))
+    parent_conn = store._conn()
+    job = AdviceJob('forked')
+    store.create(job)
+
+    def child():
+        assert store._conn() is not parent_conn
+        store.append(job.id, 0, 'Learn SQL.')
+        store.finish(job.id, 'done', None)
+
+    process = multiprocessing.get_context('fork').Process(target=child)
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+    assert store._conn() is parent_conn
+    assert store.state(job.id) == ('done', None)
+    assert store.chunks(job.id) == ['Learn SQL.']
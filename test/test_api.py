@@ -0,0 +1,97 @@
+import pytest
+
+import app as webapp
+
+
+class FakeMatcher:
+    version = 7
+
+    def __init__(self):
+        self.calls = []
+
+    def match_many(self, resumes, top_n, filters, offset, as_records):
+        self.calls.append({'top_n': top_n, 'offset': offset, 'filters': filters})
+        return [[] for _ in resumes]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    matcher = FakeMatcher()
+    monkeypatch.setattr(webapp, 'get_job_matcher', lambda: matcher)
+    with webapp.app.test_client() as client:
+        client.matcher = matcher
+        yield client
+
+
+RESUME = {'skills': ['python', 'sql']}
+
+
+@pytest.mark.parametrize('filters', [{'remote': 'false'}, {'remote': False}, {'remote': 0}])
+def test_json_filters_parse_remote_strings(client, filters):
+    response = client.post('/api/v1/match', json={'resume': RESUME, 'filters': filters})
+    assert response.status_code == 200
+    assert response.get_json()['filters'] == {'remote': False}
+
+
+def test_query_string_filters_match_json(client):
+    response = client.post('/api/v1/match?remote=false', json={'resume': RESUME})
+    assert response.get_json()['filters'] == {'remote': False}
+
+
+def test_invalid_remote_is_rejected(client):
+    response = client.post('/api/v1/match', json={'resume': RESUME, 'filters': {'remote': 'sometimes'}})
+    assert response.status_code == 400
+    assert client.matcher.calls == []
+
+
+def test_offset_is_capped(client):
+    response = client.post('/api/v1/match/batch',
+                           json={'resumes': [RESUME] * 3, 'offset': webapp.API_MAX_OFFSET + 1})
+    assert response.status_code == 400
+    assert client.matcher.calls == []
+
+    response = client.post('/api/v1/match', json={'resume': RESUME, 'offset': webapp.API_MAX_OFFSET})
+    assert response.status_code == 200
+    assert client.matcher.calls[-1]['offset'] == webapp.API_MAX_OFFSET
+
+
+def test_readyz_waits_for_the_index(monkeypatch):
+    started = []
+    monkeypatch.setattr(webapp, 'warm_up', lambda background=False: started.append(background))
+    monkeypatch.setattr(webapp, '_warmup_mode', 'lazy')
+    monkeypatch.setattr(webapp, '_warmup_error', None)
+    monkeypatch.setattr(webapp, '_job_matcher', None)
+    with webapp.app.test_client() as client:
+        # Not loaded yet: not ready, and a lazy process starts loading
+        response = client.get('/readyz')
+        assert response.status_code == 503
+        assert response.get_json()['status'] == 'loading'
+        assert started == [True]
+
+        monkeypatch.setattr(webapp, '_job_matcher', type('Loaded', (), {'jobs_df': [1, 2], 'version': 3})())
+        response = client.get('/readyz')
+        assert response.status_code == 200
+        assert response.get_json() == {'status': 'ready', 'jobs': 2, 'index_version': 3}
+
+        monkeypatch.setattr(webapp, '_warmup_error', 'no model')
+        response = client.get('/readyz')
+        assert response.status_code == 503
+        assert response.get_json() == {'status': 'error', 'error': 'no model'}
+
+
+@pytest.mark.parametrize('skills', [[1, 2], [{'a': 1}], {'python': True}, 5])
+def test_malformed_skills_are_rejected(client, skills):
+    response = client.post('/api/v1/match', json={'resume': {'skills': skills}})
+    assert response.status_code == 400
+    assert 'skills' in response.get_json()['error']
+    assert client.matcher.calls == []
+
+
+def test_oversized_api_upload_gets_json(client, monkeypatch):
+    monkeypatch.setitem(webapp.app.config, 'MAX_CONTENT_LENGTH', 10)
+    response = client.post('/api/v1/match', json={'resume': RESUME})
+    assert response.status_code == 413
+    assert 'error' in response.get_json()
+
+    # Browser form posts keep the flash-and-redirect behaviour
+    assert client.post('/', data={'resume': 'x' * 100}).status_code == 302
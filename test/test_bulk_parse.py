@@ -0,0 +1,23 @@
+import os
+import time
+
+import pytest
+
+from src import bulk_parse
+from src.resume_parser import UltimateResumeParser
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static',
+                          'sample_resume.pdf')
+
+
+@pytest.mark.skipif(not hasattr(bulk_parse.signal, 'setitimer'), reason="needs SIGALRM")
+def test_timeout_is_an_error_row_not_a_fallback_parse(monkeypatch):
+    def slow_pdf(self, *args, **kwargs):
+        time.sleep(5)
+
+    monkeypatch.setattr(UltimateResumeParser, '_extract_from_pdf', slow_pdf)
+    bulk_parse._init_worker({})
+    started = time.monotonic()
+    result = bulk_parse._parse_one(SAMPLE_PDF, SAMPLE_PDF, None, timeout=0.5)
+    assert time.monotonic() - started < 3
+    assert result == {'error': 'Timed out after 0.5s', 'source': SAMPLE_PDF}
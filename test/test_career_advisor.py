@@ -0,0 +1,23 @@
+from src.career_advisor import PROMPT_SECTION_WORDS, CareerAdvisor
+
+
+def test_prompt_and_profile_carry_an_excerpt_of_long_sections():
+    advisor = CareerAdvisor()
+    experience = " ".join(f"task{i}" for i in range(20000))
+    resume = {'skills': ['Python'], 'experience': experience, 'education': 'BSc Computer Science',
+              'sections': {'experience': experience}}
+
+    prompt = advisor._build_prompt(resume)
+    profile = advisor._profile_text(resume)
+    for text in (prompt, profile):
+        assert f"task{PROMPT_SECTION_WORDS - 1} ..." in text
+        assert f"task{PROMPT_SECTION_WORDS} " not in text
+        assert len(text.split()) < PROMPT_SECTION_WORDS + 100
+    assert "Education: BSc Computer Science" in prompt
+    assert resume['sections']['experience'] == experience
+
+
+def test_missing_sections_are_not_specified():
+    prompt = CareerAdvisor()._build_prompt({'skills': [], 'experience': ''})
+    assert "Experience: Not specified" in prompt
+    assert "Education: Not specified" in prompt
@@ -0,0 +1,93 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from src.catalog import CATEGORICAL_COLUMNS, JobCatalog, load_jobs, save_jobs
+
+
+def posting(title='data analyst', link='https://www.example.com/jobs/1?utm_source=feed'):
+    return pd.DataFrame([{'title': title, 'company': 'acme', 'location': 'remote', 'link': link,
+                          'source': 'LinkedIn', 'is_remote': 1}])
+
+
+def test_date_scraped_is_first_seen(tmp_path):
+    catalog = JobCatalog(str(tmp_path / 'jobs.db'))
+    catalog.upsert(posting(), seen_at='2026-09-01T08:00:00+00:00')
+    catalog.upsert(posting(), seen_at='2026-10-16T08:00:00+00:00')
+    live = catalog.live_jobs()
+    assert live['date_scraped'].tolist() == ['2026-09-01']
+    assert live['last_seen'].tolist() == ['2026-10-16T08:00:00+00:00']
+
+
+def test_change_feed_nets_changes_per_id(tmp_path):
+    catalog = JobCatalog(str(tmp_path / 'jobs.db'))
+    catalog.upsert(posting(), seen_at='2026-10-01T00:00:00+00:00')
+    since = catalog.version
+    catalog.upsert(pd.concat([posting('senior data analyst'), posting(link='https://example.com/jobs/2')]),
+                   seen_at='2026-10-10T00:00:00+00:00')
+    catalog.upsert(posting(link='https://example.com/jobs/3'), seen_at='2026-10-10T00:00:00+00:00')
+    assert catalog.expire(3, now='2026-10-11T00:00:00+00:00') == 0
+    catalog.upsert(posting(link='https://example.com/jobs/2'), seen_at='2026-10-20T00:00:00+00:00')
+    assert catalog.expire(3, now='2026-10-21T00:00:00+00:00') == 2
+
+    delta = catalog.changes_since(since)
+    assert delta.inserted == ['https://example.com/jobs/2']
+    assert delta.updated == []
+    assert delta.deleted == ['https://example.com/jobs/1']
+
+
+def test_remote_flag_spellings(tmp_path):
+    catalog = JobCatalog(str(tmp_path / 'jobs.db'))
+    jobs = pd.concat([posting(link=f'https://example.com/jobs/{i}') for i in range(5)], ignore_index=True)
+    jobs['is_remote'] = ['True', 'False', 'yes', None, 1.0]
+    catalog.upsert(jobs)
+    live = catalog.live_jobs().sort_values('link')
+    assert live['is_remote'].tolist() == [1, 0, 1, 0, 1]
+
+
+def test_concurrent_writers_get_distinct_versions(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    JobCatalog(path)
+    errors = []
+
+    def write(worker):
+        # Separate catalogs have separate connections, like separate processes
+        catalog = JobCatalog(path)
+        try:
+            for i in range(5):
+                catalog.upsert(posting(link=f'https://example.com/jobs/{worker}-{i}'))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    catalog = JobCatalog(path)
+    assert errors == []
+    assert catalog.version == 30
+    versions = [row[0] for row in catalog._conn.execute('SELECT version FROM changes')]
+    assert sorted(versions) == list(range(1, 31))
+    assert len(catalog.changes_since(0).inserted) == 30
+
+
+@pytest.mark.parametrize('name', ['jobs.csv', 'jobs.parquet', 'jobs.arrow'])
+def test_load_jobs_reads_only_the_wanted_columns(tmp_path, name):
+    path = str(tmp_path / name)
+    jobs = pd.concat([posting(link=f'https://example.com/jobs/{i}') for i in range(4)], ignore_index=True)
+    jobs['location'] = ['berlin', 'remote', 'berlin', None]
+    jobs['date_scraped'] = '2026-10-01'
+    jobs['description'] = 'long text nobody asked for'
+    save_jobs(jobs, path)
+
+    loaded = load_jobs(path, ['title', 'company', 'location', 'link', 'source', 'is_remote', 'date_scraped',
+                              'not_a_column'])
+    assert list(loaded.columns) == ['title', 'company', 'location', 'link', 'source', 'is_remote', 'date_scraped']
+    for col in CATEGORICAL_COLUMNS:
+        assert isinstance(loaded[col].dtype, pd.CategoricalDtype), col
+    assert loaded['location'].tolist() == ['berlin', 'remote', 'berlin', '']
+    assert loaded['is_remote'].dtype == 'int8'
+    assert loaded['link'].tolist() == jobs['link'].tolist()
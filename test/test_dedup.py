@@ -0,0 +1,38 @@
+import pandas as pd
+
+from src.dedup import MinHashDeduplicator, dedupe_jobs
+
+
+def jobs(*titles, company='acme corp', location='new york, ny'):
+    return pd.DataFrame({'title': list(titles), 'company': company, 'location': location,
+                         'link': [f"https://jobs.example/{n}" for n in range(len(titles))],
+                         'date_scraped': '2026-10-01'})
+
+
+def test_distinct_roles_at_one_office_survive():
+    titles = ['backend engineer', 'frontend engineer', 'software engineer ii', 'software engineer iii',
+              'software engineer, payments', 'software engineer, search', 'data analyst',
+              'associate data analyst']
+    assert dedupe_jobs(jobs(*titles))['title'].tolist() == titles
+
+
+def test_reposts_collapse_to_the_newest():
+    df = jobs('Data Analyst', 'data analyst', 'Data-Analyst!', 'data scientist')
+    df.loc[2, 'date_scraped'] = '2026-10-05'
+    deduped = dedupe_jobs(df)
+    assert deduped['link'].tolist() == ['https://jobs.example/2', 'https://jobs.example/3']
+
+
+def test_same_title_elsewhere_is_not_a_duplicate():
+    df = pd.concat([jobs('data analyst', location='boston, ma'),
+                    jobs('data analyst', location='san francisco, ca')], ignore_index=True)
+    assert len(dedupe_jobs(df)) == 2
+
+
+def test_later_bucket_members_are_compared_with_each_other():
+    # Three postings in one LSH bucket; only the 2nd and 3rd are duplicates, so
+    # pairing everything with the bucket's first row would miss them
+    texts = ['software engineer | acme corp | new york, ny'] * 3
+    reject_first = lambda left, right: (left != 0) & (right != 0)
+    labels = MinHashDeduplicator().clusters(texts, reject_first)
+    assert labels.tolist() == [0, 1, 1]
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from src.filters import FilterIndex
+
+
+@pytest.mark.parametrize('value, expected', [
+    (True, True), (False, False), (1, True), (0, False),
+    ('true', True), ('False', False), ('1', True), ('0', False), ('yes', True), ('off', False),
+])
+def test_remote_accepts_booleans_and_their_spellings(value, expected):
+    assert FilterIndex().normalize({'remote': value}) == {'remote': expected}
+
+
+@pytest.mark.parametrize('value', ['maybe', 2, [True], {'x': 1}])
+def test_remote_rejects_anything_else(value):
+    with pytest.raises(ValueError):
+        FilterIndex().normalize({'remote': value})
+
+
+def test_remote_column_spellings_are_parsed():
+    jobs = pd.DataFrame({'is_remote': ['True', 'False', 'yes', None, 'unknown']})
+    index = FilterIndex().build(jobs)
+    assert index.rows({'remote': True}).tolist() == [0, 2]
@@ -0,0 +1,118 @@
+import importlib.util
+import os
+import threading
+
+import pytest
+
+import src.llm_client as llm_client
+from src.career_advisor import CareerAdvisor
+from src.llm_client import LLMClient, LLMUnavailable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_stub():
+    spec = importlib.util.spec_from_file_location('llm_stub_server', os.path.join(ROOT, 'scripts', 'llm_stub_server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+stub = _load_stub()
+
+
+@pytest.fixture
+def start_stub():
+    servers = []
+
+    def start(delay=0.0, fail_every=0):
+        server = stub.serve(port=0, delay=delay, fail_every=fail_every)
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/v1"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _params(skills):
+    return {'model': 'stub', 'messages': [{'role': 'user', 'content': f"Skills: {skills}"}]}
+
+
+def test_rate_limited_calls_are_retried(start_stub, monkeypatch):
+    monkeypatch.setattr(llm_client, 'backoff_delay', lambda attempt: 0.0)
+    client = LLMClient('stub', base_url=start_stub(fail_every=2), rate_per_second=100, max_retries=2)
+    try:
+        results = [client.complete(_params(f"skill{i}")) for i in range(4)]
+    finally:
+        client.close()
+
+    assert all(f"skill{i}" in result for i, result in enumerate(results))
+    stats = client.stats()
+    assert stats['retries'] >= 1
+    assert stats['calls'] == 4 + stats['retries']
+    assert stats['failures'] == 0
+
+
+def test_identical_requests_in_flight_are_coalesced(start_stub):
+    client = LLMClient('stub', base_url=start_stub(delay=0.3), rate_per_second=100)
+    barrier = threading.Barrier(8)
+    results = [None] * 8
+
+    def call(i):
+        barrier.wait()
+        results[i] = client.complete(_params('python'))
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        client.close()
+
+    assert len(set(results)) == 1 and 'python' in results[0]
+    assert client.stats()['calls'] == 1
+    assert client.stats()['coalesced'] == 7
+
+
+def test_calls_beyond_the_concurrency_cap_are_rejected(start_stub):
+    client = LLMClient('stub', base_url=start_stub(delay=0.5), rate_per_second=100,
+                       max_concurrency=1, acquire_timeout=0.1)
+    started = threading.Event()
+    result = {}
+
+    def leader():
+        started.set()
+        result['advice'] = client.complete(_params('python'))
+
+    thread = threading.Thread(target=leader)
+    try:
+        thread.start()
+        started.wait()
+        # Give the leader time to take the only slot
+        threading.Event().wait(0.1)
+        with pytest.raises(LLMUnavailable):
+            client.complete(_params('java'))
+        thread.join()
+    finally:
+        client.close()
+
+    assert 'python' in result['advice']
+    assert client.stats()['rejected'] == 1
+
+
+def test_batch_advice_keeps_input_order(start_stub):
+    advisor = CareerAdvisor('stub', base_url=start_stub(delay=0.05),
+                            llm_options={'rate_per_second': 100, 'max_concurrency': 4})
+    skills = [['Python'], ['Java'], ['Python'], ['Go'], ['Rust'], ['Java']]
+    try:
+        advice = advisor.get_career_suggestions_many([{'skills': s} for s in skills])
+    finally:
+        advisor.llm.close()
+
+    assert [a.split('build on ')[1].split('\n')[0] for a in advice] == [s[0] for s in skills]
+    # Repeated profiles are asked once
+    assert advisor.llm.stats()['calls'] == 4
@@ -1,38 +1,436 @@
-from job_matcher import JobMatcher
 import os
+import re
+import threading
+import zlib
 
-def main():
-    # Sample resume data - modify with your actual data
-    resume_data = {
-        'skills': ['Python', 'Data Analysis', 'SQL'],
-        'experience': ['2 years as Data Analyst'],
-        'education': 'BSc in Computer Science'
-    }
-    
-    # Initialize matcher with absolute path
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    jobs_csv_path = os.path.join(current_dir, "data", "jobs.csv")
-    
-    try:
-        print("Initializing JobMatcher...")
-        matcher = JobMatcher(jobs_csv_path)
-        
-        print("\nFinding best matches...")
-        matches = matcher.match(resume_data, top_n=5)
-        
-        if matches.empty:
-            print("No matches found or error occurred")
-        else:
-            print("\n=== TOP 5 JOB MATCHES ===")
-            print(matches[['title', 'company', 'match_score']].to_string(index=False))
-            
-            # Save full results
-            output_path = os.path.join(current_dir, "result", "job_matches.csv")
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            matcher.save_matches(matches, output_path)
-            
-    except Exception as e:
-        print(f"Error in main execution: {e}")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.embedding_store as embedding_store
+from src.catalog import save_jobs
+from src.embedding_store import EmbeddingStore
+from src.job_matcher import JobMatcher
+
+
+class FakeModel:
+    """Deterministic bag-of-words encoder standing in for the sentence model"""
+
+    dim = 512
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in re.findall(r'\w+', text.lower()):
+                vectors[row, zlib.crc32(token.encode('utf-8')) % self.dim] += 1.0
+        return vectors
+
+
+JOBS = [
+    ('python backend engineer', 'acme', 'remote', 'LinkedIn', True, '2026-10-10'),
+    ('java developer', 'globex', 'new york', 'LinkedIn', False, '2026-10-01'),
+    ('kubernetes platform engineer', 'initech', 'berlin', 'RemoteOK', True, '2026-09-20'),
+    ('data analyst sql', 'umbrella', 'london', 'LinkedIn', False, '2026-10-12'),
+    ('react frontend developer', 'hooli', 'remote', 'RemoteOK', True, '2026-10-14'),
+    ('python data engineer', 'stark', 'new york', 'LinkedIn', False, '2026-10-13'),
+]
+
+
+def make_jobs(rows=JOBS, start=0):
+    return pd.DataFrame({
+        'title': [row[0] for row in rows],
+        'company': [row[1] for row in rows],
+        'location': [row[2] for row in rows],
+        'link': [f"https://jobs.example/{start + i}" for i in range(len(rows))],
+        'source': [row[3] for row in rows],
+        'is_remote': [row[4] for row in rows],
+        'date_scraped': [row[5] for row in rows],
+    })
+
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+
+@pytest.fixture
+def jobs():
+    return make_jobs()
+
+
+def matcher_for(jobs, model, **kwargs):
+    kwargs.setdefault('embeddings_path', None)
+    return JobMatcher(jobs, model=model, **kwargs)
+
+
+def links(results):
+    return results['link'].tolist()
+
+
+# Embedding store (user-001)
+
+def test_reload_skips_reencoding(tmp_path, jobs, model):
+    store = str(tmp_path / 'job_embeddings')
+    first = matcher_for(jobs, model, embeddings_path=store)
+    assert len(model.encoded) == len(jobs)
+
+    model.encoded.clear()
+    second = matcher_for(jobs, model, embeddings_path=store)
+    assert model.encoded == []
+    assert isinstance(second.job_embeddings, np.memmap)
+    assert np.allclose(second.job_embeddings, first.job_embeddings)
+
+
+def test_reload_reencodes_only_changed_rows(tmp_path, jobs, model):
+    store = str(tmp_path / 'job_embeddings')
+    matcher_for(jobs, model, embeddings_path=store)
+
+    jobs.loc[2, 'title'] = 'golang platform engineer'
+    model.encoded.clear()
+    matcher = matcher_for(jobs, model, embeddings_path=store)
+    assert model.encoded == ['golang platform engineer initech berlin']
+    assert links(matcher.match({'skills': ['golang']}, top_n=1)) == [jobs.loc[2, 'link']]
+
+
+# Incremental updates (user-002)
+
+def test_update_changes_only_that_row(tmp_path, jobs, model):
+    matcher = matcher_for(jobs, model, embeddings_path=str(tmp_path / 'job_embeddings'))
+    before = np.array(matcher.job_embeddings)
+
+    changed = jobs.iloc[[1, 3]].copy()
+    changed.loc[changed.index[0], 'title'] = 'golang developer'
+    model.encoded.clear()
+    assert matcher.update_jobs(changed) == 1
+    assert model.encoded == ['golang developer globex new york']
+
+    after = np.array(matcher.job_embeddings)
+    untouched = [row for row in range(len(jobs)) if row != 1]
+    assert np.array_equal(after[untouched], before[untouched])
+    assert not np.allclose(after[1], before[1])
+    assert links(matcher.match({'skills': ['golang']}, top_n=1)) == [jobs.loc[1, 'link']]
+
+
+def test_removed_job_never_appears(tmp_path, jobs, model):
+    matcher = matcher_for(jobs, model, embeddings_path=str(tmp_path / 'job_embeddings'))
+    removed = jobs.loc[0, 'link']
+    assert matcher.remove_jobs([removed, 'https://jobs.example/unknown']) == 1
+
+    assert removed not in links(matcher.match({'skills': ['python', 'backend']}, top_n=len(jobs)))
+    records = matcher.match_many([{'skills': ['python']}, {'skills': ['remote']}], top_n=len(jobs), as_records=True)
+    assert all(job['link'] != removed for jobs_found in records for job in jobs_found)
+    assert sorted(matcher.jobs_df['link']) == sorted(jobs['link'][1:])
+
+
+def test_added_jobs_are_encoded_alone_and_served(tmp_path, jobs, model):
+    matcher = matcher_for(jobs, model, embeddings_path=str(tmp_path / 'job_embeddings'))
+    model.encoded.clear()
+    assert matcher.add_jobs(make_jobs([('rust systems engineer', 'wayne', 'remote', 'LinkedIn', True,
+                                        '2026-10-15')], start=100)) == 1
+    assert model.encoded == ['rust systems engineer wayne remote']
+    assert links(matcher.match({'skills': ['rust']}, top_n=1)) == ['https://jobs.example/100']
+    with pytest.raises(ValueError):
+        matcher.add_jobs(make_jobs(JOBS[:1]))
+
+
+def test_store_is_updated_in_place(tmp_path, jobs, model):
+    store = str(tmp_path / 'job_embeddings')
+    matcher = matcher_for(jobs, model, embeddings_path=store)
+    inode = os.stat(f"{store}.npy").st_ino
+
+    matcher.add_jobs(make_jobs([('rust systems engineer', 'wayne', 'remote', 'LinkedIn', True,
+                                 '2026-10-15')], start=100))
+    changed = jobs.iloc[[2]].copy()
+    changed['title'] = 'golang platform engineer'
+    matcher.update_jobs(changed)
+    matcher.remove_jobs([jobs.loc[0, 'link'], jobs.loc[4, 'link']])
+
+    # Every change wrote into the same mapped file rather than replacing it
+    assert os.stat(f"{store}.npy").st_ino == inode
+    assert isinstance(matcher.job_embeddings, np.memmap)
+
+    model.encoded.clear()
+    reloaded = matcher_for(matcher.jobs_df, model, embeddings_path=store)
+    assert model.encoded == []
+    assert np.allclose(reloaded.job_embeddings, matcher.job_embeddings)
+
+
+def test_store_journal_compacts_and_rejects_unfinished_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_store, 'COMPACT_AFTER_OPS', 2)
+    store = EmbeddingStore(str(tmp_path / 'vectors'), 'fake')
+    store.save(np.eye(4, dtype=np.float32), list('abcd'), list('ABCD'))
+
+    store.patch([1], np.full((1, 4), 2, dtype=np.float32), ['B2'])
+    matrix, order = store.remove([0])
+    assert order.tolist() == [3, 1, 2]
+    assert not os.path.exists(store.log_path)
+    assert store.load()[1:] == (list('dbc'), ['D', 'B2', 'C'])
+    assert np.array_equal(store.load()[0][1], [2, 2, 2, 2])
+
+    # A change that was logged but never finished makes the store untrustworthy
+    store._log({'op': 'append', 'ids': ['e'], 'hashes': ['E']})
+    assert store.load() is None
+
+
+# Vector index backends (user-003)
+
+RESUMES = [{'skills': ['python', 'backend']}, {'skills': ['react', 'frontend']}, {'skills': ['sql', 'analyst']},
+           {'skills': ['kubernetes']}, {'skills': ['java']}]
+
+
+def test_ivf_probing_every_list_matches_exact_search(jobs, model):
+    exact = matcher_for(jobs, model)
+    ivf = matcher_for(jobs, model, index_backend='ivf', index_params={'n_lists': 3, 'n_probe': 3})
+    assert ivf.index.backend == 'ivf'
+    exact_scores, exact_rows = exact.match_many(RESUMES, top_n=3)
+    ivf_scores, ivf_rows = ivf.match_many(RESUMES, top_n=3)
+    # Ties below the best match may come back in either order
+    assert np.allclose(ivf_scores, exact_scores, atol=1e-6)
+    assert np.array_equal(ivf_rows[:, 0], exact_rows[:, 0])
+
+
+def test_saved_index_is_reused_when_the_catalog_matches(tmp_path, jobs, model, monkeypatch):
+    index_path = str(tmp_path / 'index')
+    params = {'n_lists': 2, 'n_probe': 2}
+    matcher_for(jobs, model, index_backend='ivf', index_params=params, index_path=index_path)
+
+    import src.job_matcher as job_matcher
+    monkeypatch.setattr(job_matcher, 'create_index', lambda *args, **kwargs: pytest.fail("index rebuilt"))
+    reloaded = matcher_for(jobs, model, index_backend='ivf', index_params=params, index_path=index_path)
+    assert links(reloaded.match({'skills': ['react']}, top_n=1)) == [jobs.loc[4, 'link']]
+
+
+# Batched matching (user-004)
+
+def test_match_many_agrees_with_match(jobs, model):
+    matcher = matcher_for(jobs, model)
+    scores, rows = matcher.match_many(RESUMES, top_n=2, batch_size=2)
+    assert scores.shape == rows.shape == (len(RESUMES), 2)
+    for resume, resume_scores, resume_rows in zip(RESUMES, scores, rows):
+        single = matcher.match(resume, top_n=2)
+        assert np.allclose(single['match_score'], resume_scores, atol=1e-6)
+        assert links(single)[0] == matcher.jobs_df['link'].iloc[resume_rows[0]]
+
+    records = matcher.match_many(RESUMES, top_n=2, as_records=True)
+    assert [[job['link'] for job in found] for found in records] == \
+        [matcher.jobs_df['link'].iloc[resume_rows].tolist() for resume_rows in rows]
+
+
+def test_match_many_offset_pages_and_caps_at_catalog_size(jobs, model):
+    matcher = matcher_for(jobs, model)
+    _, everything = matcher.match_many(RESUMES[:1], top_n=4)
+    _, page = matcher.match_many(RESUMES[:1], top_n=2, offset=2)
+    assert page.tolist() == everything[:, 2:].tolist()
+
+    scores, rows = matcher.match_many(RESUMES[:1], top_n=10)
+    assert rows.shape == (1, len(jobs))
+    assert sorted(rows[0].tolist()) == list(range(len(jobs)))
+    assert np.all(np.diff(scores[0]) <= 1e-6)
+
+
+# Concurrent reads and writes (user-005)
+
+def test_matching_while_the_catalog_changes(jobs, model):
+    original = jobs.copy()
+    matcher = matcher_for(jobs, model, result_cache_size=0)
+    known = set(jobs['link'])
+    extra = make_jobs([('golang backend engineer', f'co{i}', 'remote', 'LinkedIn', True, '2026-10-15')
+                       for i in range(20)], start=100)
+    known |= set(extra['link'])
+    errors, stop = [], threading.Event()
+
+    def read():
+        while not stop.is_set():
+            try:
+                results = matcher.match({'skills': ['python', 'backend']}, top_n=3)
+                assert len(results) == 3 and set(links(results)) <= known
+                _, rows = matcher.match_many(RESUMES, top_n=2)
+                assert rows.min() >= 0
+            except Exception as e:
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for start in range(0, len(extra), 5):
+        matcher.add_jobs(extra.iloc[start:start + 5])
+        matcher.remove_jobs(extra['link'].iloc[start:start + 2])
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert len(matcher.jobs_df) == len(jobs) + 12
+    # The caller's frame is never written to
+    pd.testing.assert_frame_equal(jobs, original)
+
+
+# Query caches (user-006)
+
+def test_repeat_queries_skip_the_model_and_the_index(jobs, model):
+    matcher = matcher_for(jobs, model)
+    resume = {'skills': ['python', 'backend']}
+    first = matcher.match(resume, top_n=2)
+    model.encoded.clear()
+
+    # Returned frames are copies, so callers cannot poison the cache
+    first.loc[first.index[0], 'title'] = 'edited'
+    second = matcher.match(resume, top_n=2)
+    assert model.encoded == []
+    assert 'edited' not in second['title'].tolist()
+    assert matcher.cache_stats()['results']['hits'] == 1
+
+    # A different page size misses the result cache but reuses the vector
+    matcher.match(resume, top_n=3)
+    matcher.match_many([resume, resume, {'skills': ['java']}], top_n=2)
+    assert model.encoded == ['java']
+
+
+def test_results_are_recomputed_after_the_catalog_changes(jobs, model):
+    matcher = matcher_for(jobs, model)
+    resume = {'skills': ['rust']}
+    assert 'https://jobs.example/100' not in links(matcher.match(resume, top_n=1))
+
+    matcher.add_jobs(make_jobs([('rust systems engineer', 'wayne', 'remote', 'LinkedIn', True,
+                                 '2026-10-15')], start=100))
+    model.encoded.clear()
+    assert links(matcher.match(resume, top_n=1)) == ['https://jobs.example/100']
+    assert model.encoded == []
+
+
+# Hybrid retrieval (user-007)
+
+def test_hybrid_ranks_by_keywords_found_only_in_descriptions(tmp_path, jobs, model):
+    jobs['description'] = ['apis and services', 'spring services', 'we run terraform and helm',
+                           'dashboards', 'design systems', 'pipelines']
+    path = tmp_path / 'jobs.csv'
+    jobs.to_csv(path, index=False)
+    resume = {'skills': ['terraform']}
+
+    # Dense text leaves descriptions out, so the keyword carries no signal there
+    dense = matcher_for(str(path), model)
+    assert 'description' not in dense.jobs_df.columns
+    assert dense.match(resume, top_n=1)['match_score'].iloc[0] == pytest.approx(0.0)
+
+    hybrid = matcher_for(str(path), model, retrieval='hybrid')
+    assert 'description' in hybrid.jobs_df.columns
+    assert links(hybrid.match(resume, top_n=1)) == [jobs.loc[2, 'link']]
+
+
+# Filtering (user-008)
+
+def test_filters_apply_before_scoring(jobs, model):
+    matcher = matcher_for(jobs, model)
+    resume = {'skills': ['python', 'engineer']}
+
+    remote = matcher.match(resume, top_n=len(jobs), filters={'remote': 'true'})
+    assert links(remote) == [jobs.loc[0, 'link'], jobs.loc[2, 'link'], jobs.loc[4, 'link']]
+
+    # Fewer matching jobs than top_n: only those come back
+    found = matcher.match(resume, top_n=5, filters={'location': 'new york', 'since': '2026-10-05'})
+    assert links(found) == [jobs.loc[5, 'link']]
+
+    records = matcher.match_many([resume], top_n=5, as_records=True,
+                                 filters={'source': ['remoteok'], 'remote': True})
+    assert [job['link'] for job in records[0]] == [jobs.loc[2, 'link'], jobs.loc[4, 'link']]
+    assert matcher.match(resume, filters={'source': 'indeed'}).empty
+
+
+def test_invalid_filters_raise(jobs, model):
+    matcher = matcher_for(jobs, model)
+    with pytest.raises(ValueError):
+        matcher.match({'skills': ['python']}, filters={'salary': 100})
+    with pytest.raises(ValueError):
+        matcher.match_many([{'skills': ['python']}], filters={'remote': 'maybe'})
+
+
+# Quantized vectors (user-009)
+
+@pytest.mark.parametrize('precision', ['float16', 'int8'])
+def test_quantized_index_matches_float32_and_stays_off_the_heap(tmp_path, jobs, model, precision):
+    exact = matcher_for(jobs, model)
+    quantized = matcher_for(jobs, model, index_params={'precision': precision})
+    assert quantized._snapshot.embeddings is None
+    assert np.array_equal(quantized.match_many(RESUMES, top_n=1)[1], exact.match_many(RESUMES, top_n=1)[1])
+
+    # With a store the float32 rows stay memory-mapped, and writers keep working
+    stored = matcher_for(jobs, model, embeddings_path=str(tmp_path / 'job_embeddings'),
+                         index_params={'precision': precision})
+    assert isinstance(stored._snapshot.embeddings, np.memmap)
+    changed = jobs.iloc[[1]].copy()
+    changed['title'] = 'golang developer'
+    stored.update_jobs(changed)
+    stored.remove_jobs([jobs.loc[0, 'link']])
+    assert links(stored.match({'skills': ['golang']}, top_n=1)) == [jobs.loc[1, 'link']]
+    assert links(stored.match({'skills': ['react']}, top_n=1)) == [jobs.loc[4, 'link']]
+
+
+# Shared index (user-010)
+
+def test_workers_attach_to_the_published_index(tmp_path, jobs, model):
+    root = str(tmp_path / 'shared')
+    loader = matcher_for(jobs, model)
+    assert loader.publish_shared(root) == 1
+
+    model.encoded.clear()
+    worker = matcher_for(None, model, shared_index_path=root, refresh_interval=3600)
+    # Jobs are not re-encoded and the vectors stay memory-mapped
+    assert model.encoded == []
+    assert isinstance(worker.job_embeddings, np.memmap)
+    assert links(worker.match({'skills': ['kubernetes']}, top_n=1)) == [jobs.loc[2, 'link']]
+    with pytest.raises(RuntimeError):
+        worker.add_jobs(make_jobs(JOBS[:1], start=100))
+    with pytest.raises(RuntimeError):
+        worker.remove_jobs([jobs.loc[0, 'link']])
+
+    loader.add_jobs(make_jobs([('rust systems engineer', 'wayne', 'remote', 'LinkedIn', True,
+                                '2026-10-15')], start=100))
+    loader.remove_jobs([jobs.loc[2, 'link']])
+    assert loader.publish_shared(root) == 2
+
+    # Polling waits for refresh_interval unless forced
+    assert not worker.refresh_shared()
+    assert worker.refresh_shared(force=True)
+    assert not worker.refresh_shared(force=True)
+    assert links(worker.match({'skills': ['rust']}, top_n=1)) == ['https://jobs.example/100']
+    assert jobs.loc[2, 'link'] not in links(worker.match({'skills': ['kubernetes']}, top_n=len(jobs)))
+
+
+def test_attaching_needs_the_same_model(tmp_path, jobs, model):
+    root = str(tmp_path / 'shared')
+    with pytest.raises(ValueError):
+        matcher_for(None, model, shared_index_path=root)
+    matcher_for(jobs, model).publish_shared(root)
+    with pytest.raises(ValueError):
+        matcher_for(None, model, shared_index_path=root, model_name='other-model')
+
+
+# Columnar catalogs (user-024)
+
+@pytest.mark.parametrize('name', ['jobs.parquet', 'jobs.csv'])
+def test_matcher_serves_categorical_catalogs(tmp_path, jobs, model, name):
+    path = str(tmp_path / name)
+    jobs['description'] = 'not needed for dense matching'
+    save_jobs(jobs, path)
+
+    matcher = matcher_for(path, model)
+    assert 'description' not in matcher.jobs_df.columns
+    assert isinstance(matcher.jobs_df['location'].dtype, pd.CategoricalDtype)
+    assert isinstance(matcher.jobs_df['source'].dtype, pd.CategoricalDtype)
+
+    resume = {'skills': ['python', 'engineer']}
+    assert links(matcher.match(resume, top_n=1)) == [jobs.loc[0, 'link']]
+    found = matcher.match(resume, top_n=5, filters={'location': 'new york', 'source': 'linkedin'})
+    assert links(found) == [jobs.loc[5, 'link'], jobs.loc[1, 'link']]
+
+    # New categories arrive with added jobs and are filterable straight away
+    matcher.add_jobs(make_jobs([('python engineer', 'wayne', 'gotham', 'Indeed', False, '2026-10-15')],
+                               start=100))
+    assert isinstance(matcher.jobs_df['location'].dtype, pd.CategoricalDtype)
+    assert links(matcher.match(resume, filters={'location': 'gotham'})) == ['https://jobs.example/100']
+    assert links(matcher.match(resume, filters={'source': 'indeed'})) == ['https://jobs.example/100']
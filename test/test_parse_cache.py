@@ -0,0 +1,34 @@
+import os
+import time
+
+from src.parse_cache import ParseCache
+
+
+def _age(cache, key, seconds):
+    path = cache._file(key)
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_disk_entries_expire(tmp_path):
+    cache = ParseCache(disk_path=str(tmp_path), disk_ttl=60)
+    cache.set('v1-aa01', {'name': 'Jane Roe'})
+    _age(cache, 'v1-aa01', 120)
+
+    fresh = ParseCache(disk_path=str(tmp_path), disk_ttl=3600)
+    assert fresh.get('v1-aa01') == {'name': 'Jane Roe'}
+    assert ParseCache(disk_path=str(tmp_path), disk_ttl=60).get('v1-aa01') is None
+    assert not os.path.exists(cache._file('v1-aa01'))
+
+
+def test_prune_keeps_newest_entries(tmp_path):
+    cache = ParseCache(disk_path=str(tmp_path), disk_max_entries=3, disk_ttl=None)
+    keys = [f"v1-{i:02x}{i:02x}" for i in range(6)]
+    for age, key in zip(range(60, 0, -10), keys):
+        cache.set(key, {'key': key})
+        _age(cache, key, age)
+
+    assert cache.prune() == 3
+    survivors = ParseCache(disk_path=str(tmp_path), disk_max_entries=3)
+    assert [key for key in keys if survivors._disk_get(key)] == keys[3:]
+    assert cache.stats()['disk']['pruned'] == 3
@@ -0,0 +1,144 @@
+import io
+import os
+import shutil
+import tempfile
+
+import pytest
+
+import src.resume_parser as resume_parser
+from src.resume_parser import UltimateResumeParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_PDF = os.path.join(ROOT, 'static', 'sample_resume.pdf')
+
+TEXT_RESUME = b"Jane Roe\njane@example.com\nSkills\nPython, SQL\n"
+
+
+class OnePassStream(io.RawIOBase):
+    """Readable once, front to back, like a socket-backed upload"""
+
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._data.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+@pytest.fixture(scope='module')
+def parser():
+    return UltimateResumeParser()
+
+
+def sample_bytes():
+    with open(SAMPLE_PDF, 'rb') as f:
+        return f.read()
+
+
+# Parsing from memory (user-017)
+
+def test_pdf_bytes_parse_like_the_file(parser):
+    from_path = parser.parse(SAMPLE_PDF)
+    from_bytes = parser.parse(sample_bytes(), filename='upload.pdf')
+    assert from_bytes['skills'] == from_path['skills'] == ['Machine Learning', 'Python', 'SQL']
+    assert from_bytes['email'] == 'john.doe@example.com'
+    assert from_bytes['file'] == 'upload.pdf'
+
+
+def test_format_comes_from_content_not_extension(parser, tmp_path):
+    pdf_as_txt = tmp_path / 'resume.txt'
+    shutil.copy(SAMPLE_PDF, pdf_as_txt)
+    assert parser.parse(str(pdf_as_txt))['email'] == 'john.doe@example.com'
+
+    text_as_pdf = tmp_path / 'resume.pdf'
+    text_as_pdf.write_bytes(TEXT_RESUME)
+    assert parser.parse(str(text_as_pdf))['skills'] == ['Python', 'SQL']
+
+
+def test_non_seekable_stream(parser):
+    assert parser.parse(OnePassStream(sample_bytes()))['email'] == 'john.doe@example.com'
+    assert parser.parse(OnePassStream(TEXT_RESUME))['skills'] == ['Python', 'SQL']
+
+
+def test_stream_is_read_from_its_current_position(parser):
+    stream = io.BytesIO(b"IGNORED PREFIX\n" + TEXT_RESUME)
+    stream.seek(len(b"IGNORED PREFIX\n"))
+    result = parser.parse(stream)
+    assert result['skills'] == ['Python', 'SQL']
+    assert 'IGNORED' not in result['raw_text']
+
+    # Looks like a PDF but is not one: the text fallback rereads from the same position
+    stream = io.BytesIO(b"IGNORED PREFIX\n%PDF-1.4 truncated\n" + TEXT_RESUME)
+    stream.seek(len(b"IGNORED PREFIX\n"))
+    result = parser.parse(stream)
+    assert result['skills'] == ['Python', 'SQL']
+    assert 'IGNORED' not in result['raw_text']
+
+
+# Extraction limits and the PDF process pool (user-014)
+
+def make_pdf(pages):
+    """Minimal PDF with one line of Helvetica text per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode('latin1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+PAGES = [f"Page {n} Python" for n in range(10)]
+
+
+def test_max_chars_truncates_the_sample(parser):
+    limited = UltimateResumeParser(max_chars=40)
+    assert limited._extract_text(SAMPLE_PDF) == parser._extract_text(SAMPLE_PDF)[:40]
+
+    # The skills line lies past the cutoff
+    full, short = parser.parse(SAMPLE_PDF), limited.parse(SAMPLE_PDF)
+    assert short['text_length'] == 40 < full['text_length']
+    assert full['skills'] and short['skills'] == []
+
+
+def test_max_pages_stops_reading(parser):
+    data = make_pdf(PAGES)
+    assert list(parser.iter_pdf_pages(data)) == [f"{text}\n" for text in PAGES]
+    assert list(UltimateResumeParser(max_pages=3).iter_pdf_pages(data)) == [f"{text}\n" for text in PAGES[:3]]
+    assert UltimateResumeParser(max_pages=3).parse(data)['text_length'] == sum(len(t) + 1 for t in PAGES[:3])
+
+
+def test_pool_extracts_pages_in_order(tmp_path, monkeypatch):
+    data = make_pdf(PAGES)
+    path = tmp_path / 'long.pdf'
+    path.write_bytes(data)
+    spill = tmp_path / 'spill'
+    spill.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(spill))
+
+    pooled = UltimateResumeParser(pdf_workers=2, parallel_min_pages=4, max_pages=9)
+    expected = [f"{text}\n" for text in PAGES[:9]]
+    # From a path, and from memory (spilled to a temporary file for the workers)
+    assert list(pooled.iter_pdf_pages(str(path))) == expected
+    assert resume_parser._pdf_pool is not None
+    assert list(pooled.iter_pdf_pages(data)) == expected
+    assert pooled.parse(io.BytesIO(data))['text_length'] == sum(map(len, expected))
+    assert list(spill.iterdir()) == []
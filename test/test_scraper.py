@@ -0,0 +1,124 @@
+import importlib.util
+import json
+import os
+import time
+
+import pytest
+import requests
+
+from src.scraper.crawler import Crawler
+from src.scraper.http import PoliteSession, recorded_name
+from src.scraper.sources import LinkedInSource, RemoteOKSource, SourceAdapter, clean_jobs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_stub():
+    spec = importlib.util.spec_from_file_location(
+        'scraper_stub_server', os.path.join(ROOT, 'scripts', 'scraper_stub_server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+stub = _load_stub()
+
+
+def _cards(numbers, location='Berlin', trk='stub'):
+    return "\n".join(stub.LINKEDIN_CARD.format(slug='python', n=n, title=f"Python Engineer {n}",
+                                               company=n % 5, location=location)
+                     .replace('?trk=stub', f"?trk={trk}") for n in numbers).encode('utf-8')
+
+
+def _record(pages_dir, source, query, location, page, body):
+    url, params = source.request(query, location, page)
+    path_url = requests.Request('GET', url, params=params).prepare().path_url
+    with open(os.path.join(pages_dir, recorded_name(path_url)), 'wb') as f:
+        f.write(body)
+
+
+@pytest.fixture
+def recorded_board(tmp_path):
+    """Recorded LinkedIn and RemoteOK responses served by the stub"""
+    server = stub.serve(port=0, pages_dir=str(tmp_path))
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    linkedin, remoteok = LinkedInSource(base_url), RemoteOKSource(base_url)
+
+    # Page 0 is full, page 1 is short (and repeats two page-0 postings), so
+    # page 2 must never be requested even though it is recorded
+    _record(tmp_path, linkedin, 'python', 'Berlin', 0, _cards(range(25)))
+    _record(tmp_path, linkedin, 'python', 'Berlin', 1,
+            _cards([3, 7], trk='again') + b"\n" + _cards(range(25, 30), location='Remote'))
+    _record(tmp_path, linkedin, 'python', 'Berlin', 2, _cards(range(30, 55)))
+    _record(tmp_path, remoteok, 'python', '', 0, json.dumps([
+        {'legal': 'API terms'},
+        {'position': 'Python Developer', 'company': 'Remote Co', 'location': 'Worldwide',
+         'url': 'https://remoteok.com/remote-jobs/1'},
+        {'position': 'Django Developer', 'company': 'Remote Co', 'location': 'Berlin',
+         'url': 'https://remoteok.com/remote-jobs/2'},
+    ]).encode('utf-8'))
+    yield [linkedin, remoteok]
+    server.shutdown()
+    server.server_close()
+
+
+def test_crawl_against_recorded_pages(recorded_board):
+    session = PoliteSession(rate_per_host=100, retries=0)
+    try:
+        crawler = Crawler(recorded_board, session, max_workers=4, max_pages=10)
+        jobs = crawler.crawl(['python'], ['Berlin'])
+    finally:
+        session.close()
+
+    # Pagination stopped after the short page: LinkedIn pages 0 and 1, RemoteOK once
+    assert crawler.stats['pages'] == 3
+    assert crawler.stats['failed_pages'] == 0
+
+    linkedin = jobs[jobs['source'] == 'LinkedIn']
+    assert len(linkedin) == 30
+    assert linkedin['link'].is_unique
+    assert not linkedin['link'].str.contains(r'\?').any()
+
+    cleaned = clean_jobs(jobs).set_index('link')
+    remoteok = cleaned[cleaned['source'] == 'RemoteOK']
+    assert len(remoteok) == 2
+    assert (remoteok['is_remote'] == 1).all()
+    assert cleaned.loc['https://www.linkedin.com/jobs/view/python-0', 'is_remote'] == 0
+    assert cleaned.loc['https://www.linkedin.com/jobs/view/python-27', 'is_remote'] == 1
+
+
+def test_throttled_requests_are_retried_through_the_host_limits():
+    server = stub.serve(port=0, synthetic=30, throttle_every=2, retry_after=0.3)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    host = f"127.0.0.1:{server.server_port}"
+    session = PoliteSession(rate_per_host=100, retries=2)
+    try:
+        assert session.get(f"{base_url}/api", params={'tags': 'python'}).status_code == 200
+        started = time.monotonic()
+        response = session.get(f"{base_url}/api", params={'tags': 'python'})
+        # The 429 was retried after its Retry-After, and the retry was counted against the host
+        assert response.status_code == 200
+        assert time.monotonic() - started >= 0.3
+        assert session.requests_by_host[host] == 3
+        assert session.retries_by_host[host] == 1
+
+        # One worker, so every page is throttled at most once
+        crawler = Crawler([LinkedInSource(base_url), RemoteOKSource(base_url)], session, max_workers=1)
+        jobs = crawler.crawl(['python'], ['Berlin'])
+        assert crawler.stats['failed_pages'] == 0
+        assert len(jobs) == 60
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_source_adapters_must_implement_request_and_parse():
+    class RequestOnly(SourceAdapter):
+        def request(self, query, location, page):
+            return '', {}
+
+    with pytest.raises(TypeError):
+        SourceAdapter()
+    with pytest.raises(TypeError):
+        RequestOnly()
@@ -0,0 +1,64 @@
+import pytest
+
+from src.resume_parser import UltimateResumeParser
+from src.skill_extractor import get_skill_extractor
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    return get_skill_extractor()
+
+
+@pytest.mark.parametrize('text', [
+    "Led the R&D team and reported to the C-suite",
+    "I love to go hiking in spring",
+    "Took the express train, waited at the node, lit a torch",
+    "I excel at swift delivery",
+    "Go ahead and Rust-proof the pipes",
+    "Swift turnaround on every ticket",
+])
+def test_ordinary_text_has_no_skills(extractor, text):
+    assert extractor.extract(text) == []
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("Languages: Python, R, C, Go", ['C', 'Go', 'Python', 'R']),
+    ("Python/R/SQL", ['Python', 'R', 'SQL']),
+    ("- R\n- C\n", ['C', 'R']),
+    ("Wrote services in Go and Rust on Spring Boot", ['Spring Boot']),
+    ("Wrote services in Python, Go and Rust", ['Go', 'Python', 'Rust']),
+    ("Shipped Swift and Kotlin apps", ['Kotlin', 'Swift']),
+    ("Python and go to meetings", ['Python']),
+    ("Node.js, Express.js and PyTorch", ['Express.js', 'Node.js', 'PyTorch']),
+    ("C++ and C# developer", ['C#', 'C++']),
+])
+def test_ambiguous_names_need_a_list_or_a_skill_beside_them(extractor, text, expected):
+    assert extractor.extract(text) == expected
+
+
+def test_skills_section_is_a_list():
+    parser = UltimateResumeParser()
+    text = "Jane Roe\nSkills\nr\ngo\nSQL\nExperience\nLed the R&D team, reporting to the C-suite"
+    assert parser._parse_text(text)['skills'] == ['Go', 'R', 'SQL']
+
+
+def test_parser_version_follows_the_taxonomy(tmp_path):
+    path = tmp_path / 'skills.csv'
+    path.write_text("skill,aliases,ambiguous\nPython,py,0\n", encoding='utf-8')
+    first = UltimateResumeParser(skills_path=str(path)).version
+    assert UltimateResumeParser(skills_path=str(path)).version == first
+
+    edited = tmp_path / 'edited.csv'
+    edited.write_text("skill,aliases,ambiguous\nPython,py|python3,0\n", encoding='utf-8')
+    assert UltimateResumeParser(skills_path=str(edited)).version != first
+    assert UltimateResumeParser(skills_path=str(path), max_pages=2).version != first
+
+
+def test_large_taxonomy_with_repeated_rows(tmp_path):
+    path = tmp_path / 'skills.csv'
+    rows = [f"Skill {n},skill-{n},0" for n in range(20000)]
+    path.write_text("\ufeffskill,aliases,ambiguous,category\n" + "\n".join(rows)
+                    + "\nPython,py,0,languages\npython,python3,,languages\n", encoding='utf-8')
+    extractor = get_skill_extractor(str(path))
+    assert extractor.size == 20001
+    assert extractor.extract("Used skill-19999, python3 and Skill 7") == ['Python', 'Skill 19999', 'Skill 7']
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from src.vector_index import BruteForceIndex, IVFIndex, normalize_rows, recall_at_k, subset_search
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).standard_normal((500, 32)).astype(np.float32)
+
+
+@pytest.mark.parametrize('index', [
+    BruteForceIndex('float16'), BruteForceIndex('int8'),
+    IVFIndex(n_lists=8, precision='float16'), IVFIndex(n_lists=8, precision='int8'),
+], ids=['exact-float16', 'exact-int8', 'ivf-float16', 'ivf-int8'])
+def test_quantized_subset_search_matches_float32(index, vectors):
+    index.build(vectors)
+    queries = np.random.default_rng(1).standard_normal((4, 32)).astype(np.float32)
+    rows = np.arange(0, 500, 3)
+
+    expected_scores, expected_rows = subset_search(vectors, queries, rows, 10)
+    scores, found = index.subset_search(queries, rows, 10)
+    assert np.isin(found, rows).all()
+    assert recall_at_k(found, expected_rows) >= 0.8
+    assert np.allclose(scores, expected_scores, atol=0.02)
+
+    stored = normalize_rows(index.row_vectors(rows))
+    assert np.allclose(stored, normalize_rows(vectors[rows]), atol=0.02)
+
+
+def test_quantized_exact_index_keeps_no_float32_copy(vectors):
+    index = BruteForceIndex('int8').build(vectors)
+    assert index.vectors is None
+    assert index.row_vectors(np.arange(3)).dtype == np.int8